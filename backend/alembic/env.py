@@ -14,8 +14,8 @@ from app.models import User, Card, PreferenceVote, Period, Proposal, CreditBalan
 # this is the Alembic Config object
 config = context.config
 
-# Set the database URL dynamically
-config.set_main_option("sqlalchemy.url", DATABASE_URL)
+# Set the database URL dynamically, unless the caller (e.g. the test suite) set one
+config.set_main_option("sqlalchemy.url", config.get_main_option("sqlalchemy.url") or DATABASE_URL)
 
 # Interpret the config file for Python logging.
 if config.config_file_name is not None:
@@ -62,8 +62,8 @@ def run_migrations_online() -> None:
     else:
         connect_args = {}
 
-    configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = DATABASE_URL
+    configuration = config.get_section(config.config_ini_section, {})
+    configuration["sqlalchemy.url"] = config.get_main_option("sqlalchemy.url")
 
     # Add pool class if specified
     if "poolclass" in engine_args:
@@ -22,15 +22,15 @@ def upgrade() -> None:
     # Add partner_id for self-referential relationship
     op.add_column('users', sa.Column('partner_id', sa.Integer(), nullable=True))
 
-    # Add foreign key constraint
-    op.create_foreign_key(
-        'fk_users_partner_id',
-        'users',
-        'users',
-        ['partner_id'],
-        ['id'],
-        ondelete='SET NULL'
-    )
+    # Add foreign key constraint (batch mode so SQLite can rebuild the table)
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.create_foreign_key(
+            'fk_users_partner_id',
+            'users',
+            ['partner_id'],
+            ['id'],
+            ondelete='SET NULL'
+        )
 
     # Set up the initial partner relationships (assuming users 1 and 2 are partners)
     # This is done in a transaction-safe way
@@ -46,6 +46,7 @@ def upgrade() -> None:
 
 
 def downgrade() -> None:
-    op.drop_constraint('fk_users_partner_id', 'users', type_='foreignkey')
-    op.drop_column('users', 'partner_id')
-    op.drop_column('users', 'nickname')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_constraint('fk_users_partner_id', type_='foreignkey')
+        batch_op.drop_column('partner_id')
+        batch_op.drop_column('nickname')
@@ -18,14 +18,16 @@ depends_on = None
 def upgrade() -> None:
     # Add created_by_user_id column - nullable for existing cards
     op.add_column('cards', sa.Column('created_by_user_id', sa.Integer(), nullable=True))
-    op.create_foreign_key(
-        'fk_cards_created_by_user',
-        'cards', 'users',
-        ['created_by_user_id'], ['id'],
-        ondelete='SET NULL'
-    )
+    with op.batch_alter_table('cards') as batch_op:
+        batch_op.create_foreign_key(
+            'fk_cards_created_by_user',
+            'users',
+            ['created_by_user_id'], ['id'],
+            ondelete='SET NULL'
+        )
 
 
 def downgrade() -> None:
-    op.drop_constraint('fk_cards_created_by_user', 'cards', type_='foreignkey')
-    op.drop_column('cards', 'created_by_user_id')
+    with op.batch_alter_table('cards') as batch_op:
+        batch_op.drop_constraint('fk_cards_created_by_user', type_='foreignkey')
+        batch_op.drop_column('created_by_user_id')
@@ -0,0 +1,53 @@
+"""Add proposal refund ledger type and proposal expiry index
+
+Revision ID: 018
+Revises: 017
+Create Date: 2025-12-25 00:00:01.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    if dialect == "mysql":
+        op.execute(
+            "ALTER TABLE credit_ledger MODIFY COLUMN type "
+            "ENUM('WEEKLY_BASE_GRANT', 'PROPOSAL_COST', 'COMPLETION_REWARD', "
+            "'ADMIN_ADJUSTMENT', 'INITIAL_GRANT', 'PROPOSAL_REFUND') NOT NULL"
+        )
+    # SQLite: No action needed - enums are stored as strings
+
+    # Supports the expiry sweeper: WHERE status IN (...) AND period_id IN (...)
+    op.create_index(
+        "ix_proposals_period_status", "proposals", ["period_id", "status"]
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+
+    op.drop_index("ix_proposals_period_status", table_name="proposals")
+
+    if dialect == "mysql":
+        op.execute(
+            "UPDATE credit_ledger SET type = 'ADMIN_ADJUSTMENT' "
+            "WHERE type = 'PROPOSAL_REFUND'"
+        )
+        op.execute(
+            "ALTER TABLE credit_ledger MODIFY COLUMN type "
+            "ENUM('WEEKLY_BASE_GRANT', 'PROPOSAL_COST', 'COMPLETION_REWARD', "
+            "'ADMIN_ADJUSTMENT', 'INITIAL_GRANT') NOT NULL"
+        )
@@ -0,0 +1,44 @@
+"""Add composite indexes for the hot list and lookup queries
+
+Revision ID: 021
+Revises: 020
+Create Date: 2025-12-25 00:00:04.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "021"
+down_revision: Union[str, None] = "020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    # Proposal inbox / outbox: WHERE user = ? [AND status = ?] ORDER BY created_at DESC
+    ("ix_proposals_to_user_status_created", "proposals",
+     ["proposed_to_user_id", "status", "created_at"]),
+    ("ix_proposals_by_user_status_created", "proposals",
+     ["proposed_by_user_id", "status", "created_at"]),
+    # Ledger: WHERE user_id = ? ORDER BY created_at DESC
+    ("ix_credit_ledger_user_created", "credit_ledger", ["user_id", "created_at"]),
+    # Card listing: WHERE status = ? AND is_enabled ORDER BY created_at DESC
+    ("ix_cards_status_enabled_created", "cards", ["status", "is_enabled", "created_at"]),
+    # Votes on a card and partner lookups: WHERE card_id [IN (...)] AND user_id = ?
+    ("ix_preference_votes_card_user", "preference_votes", ["card_id", "user_id"]),
+    # Active period lookup
+    ("ix_periods_status", "periods", ["status"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,38 @@
+"""Scope idempotency keys per user
+
+Revision ID: 022
+Revises: 021
+Create Date: 2025-12-25 00:00:05.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 0 = not made on behalf of a user; existing rows expire within the key TTL anyway
+    with op.batch_alter_table("idempotency_keys") as batch_op:
+        batch_op.add_column(
+            sa.Column("user_id", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.drop_constraint("uq_idempotency_keys_key", type_="unique")
+        batch_op.create_unique_constraint(
+            "uq_idempotency_keys_user_key", ["user_id", "key"]
+        )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM idempotency_keys")
+    with op.batch_alter_table("idempotency_keys") as batch_op:
+        batch_op.drop_constraint("uq_idempotency_keys_user_key", type_="unique")
+        batch_op.create_unique_constraint("uq_idempotency_keys_key", ["key"])
+        batch_op.drop_column("user_id")
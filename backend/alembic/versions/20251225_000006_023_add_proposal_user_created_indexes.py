@@ -0,0 +1,35 @@
+"""Add user/created_at indexes for the unfiltered proposal lists
+
+Revision ID: 023
+Revises: 022
+Create Date: 2025-12-25 00:00:06.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "023"
+down_revision: Union[str, None] = "022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    # Proposal inbox / outbox without a status filter: WHERE user = ? ORDER BY created_at DESC
+    # (the user/status/created_at indexes from 021 can't serve the sort here)
+    ("ix_proposals_to_user_created", "proposals", ["proposed_to_user_id", "created_at"]),
+    ("ix_proposals_by_user_created", "proposals", ["proposed_by_user_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -11,6 +11,8 @@ from app.api.routes_admin import router as admin_router
 from app.api.routes_backoffice import router as backoffice_router
 from app.api.routes_tags import router as tags_router
 from app.api.routes_groupings import router as groupings_router
+from app.api.routes_events import router as events_router
+from app.api.routes_dashboard import router as dashboard_router
 
 api_router = APIRouter()
 
@@ -23,3 +25,5 @@ api_router.include_router(periods_router, prefix="/periods", tags=["periods"])
 api_router.include_router(credits_router, prefix="/credits", tags=["credits"])
 api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
 api_router.include_router(backoffice_router, prefix="/backoffice", tags=["backoffice"])
+api_router.include_router(events_router, prefix="/events", tags=["events"])
+api_router.include_router(dashboard_router, prefix="/dashboard", tags=["dashboard"])
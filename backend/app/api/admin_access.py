@@ -1,25 +1,65 @@
 """Admin access helpers for user/admin or backoffice credentials."""
 
-from fastapi import HTTPException
+from fastapi import Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.models.user import User
+from app.api.backoffice_dependencies import get_backoffice_user_optional
+from app.api.session_dependencies import get_session_claims
+from app.context_cache import context_cache
+from app.database import get_db
 from app.models.backoffice_user import BackofficeUser
+from app.session_tokens import ROLE_BACKOFFICE, SessionClaims
 
 
 def require_admin_access(
     db: Session,
     user_id: int | None,
     backoffice_user: BackofficeUser | None,
+    claims: SessionClaims | None = None,
 ) -> None:
     if backoffice_user:
         return
 
+    if claims:
+        if not claims.is_admin or not _account_is_admin(db, claims):
+            raise HTTPException(status_code=403, detail="Solo administradores pueden acceder")
+        return
+
     if user_id is None:
         raise HTTPException(status_code=401, detail="Credenciales requeridas")
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = context_cache.get_user(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
     if not user.is_admin:
         raise HTTPException(status_code=403, detail="Solo administradores pueden acceder")
+
+
+def require_admin(
+    user_id: int | None = Query(None, description="Admin user ID"),
+    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
+    claims: SessionClaims | None = Depends(get_session_claims),
+    db: Session = Depends(get_db),
+) -> int | None:
+    """
+    Dependency for admin-only routes. Returns the acting user's ID
+    (None for backoffice accounts).
+    """
+    require_admin_access(db, user_id, backoffice_user, claims)
+    if backoffice_user:
+        return None
+    return claims.user_id if claims else user_id
+
+
+def _account_is_admin(db: Session, claims: SessionClaims) -> bool:
+    """
+    Whether the token's account still has admin rights. Tokens outlive
+    role changes, so this is checked against the account (users through
+    context_cache, so a revocation applies within its TTL).
+    """
+    if claims.role == ROLE_BACKOFFICE:
+        return db.query(BackofficeUser.id).filter(
+            BackofficeUser.username == claims.username
+        ).first() is not None
+    user = context_cache.get_user(db, claims.user_id) if claims.user_id else None
+    return bool(user and user.is_admin)
@@ -0,0 +1,48 @@
+"""Conditional GET (ETag / If-None-Match) for catalog endpoints."""
+
+from fastapi import HTTPException, Request, Response
+
+from app.catalog_version import catalog_version
+from app.config import config
+
+# Tags, groupings and cards: shared by every client, fresh for a short while
+CATALOG_CACHE_CONTROL = f"public, max-age={config.CATALOG_MAX_AGE_SECONDS}"
+# The login user list: only the browser keeps it, and revalidates every time
+USERS_CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Compare weakly, as If-None-Match requires
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def catalog_headers(request: Request, cache_control: str) -> dict[str, str]:
+    """
+    ETag and Cache-Control for a catalog response.
+    Raises a 304 HTTPException when the client's copy is current.
+    """
+    etag = catalog_version.etag()
+    if etag is None:
+        return {"Cache-Control": "no-cache"}
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    return headers
+
+
+def catalog_cache(cache_control: str):
+    """
+    Route dependency for catalog GETs: adds the headers, or answers 304.
+    List it in the route's `dependencies` so it runs before the DB session
+    dependency.
+    """
+
+    def dependency(request: Request, response: Response) -> None:
+        response.headers.update(catalog_headers(request, cache_control))
+
+    return dependency
@@ -0,0 +1,67 @@
+"""Response builders shared by several routers."""
+
+from app.schemas.card import CardResponse
+from app.schemas.period import PeriodResponse
+from app.schemas.proposal import ProposalResponse
+from app.schemas.user import UserResponse
+from app.services.period_service import PeriodService
+
+
+def enrich_period(period) -> PeriodResponse:
+    """Add computed fields to period response."""
+    current_week = PeriodService.get_current_week(period)
+    total_weeks = PeriodService.PERIOD_DURATIONS[period.period_type]
+    return PeriodResponse(
+        id=period.id,
+        period_type=period.period_type,
+        status=period.status,
+        start_date=period.start_date,
+        end_date=period.end_date,
+        weekly_base_credits=period.weekly_base_credits,
+        cards_to_play_per_week=period.cards_to_play_per_week,
+        created_at=period.created_at,
+        current_week=current_week,
+        total_weeks=total_weeks,
+    )
+
+
+def enrich_proposal(proposal, db) -> ProposalResponse:
+    """Add card and user info to proposal response."""
+    # Get display title/description from card or custom fields
+    display_title = proposal.custom_title
+    display_description = proposal.custom_description
+    if proposal.card:
+        display_title = proposal.card.title
+        display_description = proposal.card.description
+
+    return ProposalResponse(
+        id=proposal.id,
+        period_id=proposal.period_id,
+        week_index=proposal.week_index,
+        proposed_by_user_id=proposal.proposed_by_user_id,
+        proposed_to_user_id=proposal.proposed_to_user_id,
+        card_id=proposal.card_id,
+        challenge_type=proposal.challenge_type,
+        custom_title=proposal.custom_title,
+        custom_description=proposal.custom_description,
+        # Guided challenge fields
+        why_proposing=proposal.why_proposing,
+        boundary=proposal.boundary,
+        # Custom challenge fields
+        location=proposal.location,
+        duration=proposal.duration,
+        boundaries_json=proposal.boundaries_json,
+        reward_type=proposal.reward_type,
+        reward_details=proposal.reward_details,
+        credit_cost=proposal.credit_cost,
+        status=proposal.status,
+        created_at=proposal.created_at,
+        responded_at=proposal.responded_at,
+        completed_requested_at=proposal.completed_requested_at,
+        completed_confirmed_at=proposal.completed_confirmed_at,
+        card=CardResponse.model_validate(proposal.card) if proposal.card else None,
+        proposed_by=UserResponse.model_validate(proposal.proposed_by) if proposal.proposed_by else None,
+        proposed_to=UserResponse.model_validate(proposal.proposed_to) if proposal.proposed_to else None,
+        display_title=display_title,
+        display_description=display_description,
+    )
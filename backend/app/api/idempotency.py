@@ -0,0 +1,101 @@
+"""Idempotency-Key support for mutating endpoints."""
+
+import hashlib
+import json
+
+from fastapi import Depends, Header, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.database import get_db
+from app.services.idempotency_service import (
+    IdempotencyService,
+    IdempotencyError,
+    IdempotencyConflictError,
+)
+
+
+class Idempotency:
+    """
+    Per-request handle for an Idempotency-Key.
+    `replay` holds the stored response when the request was already handled.
+    """
+
+    def __init__(self, db: Session, user_id: int, key: str | None):
+        self.db = db
+        self.user_id = user_id
+        self.key = key
+        self.replay: JSONResponse | None = None
+        self._completed = False
+
+    def save(self, result, status_code: int = 200):
+        """Store the endpoint result for the key and return it unchanged."""
+        if self.key:
+            body = json.dumps(jsonable_encoder(result))
+            IdempotencyService.complete(self.db, self.user_id, self.key, status_code, body)
+            self._completed = True
+        return result
+
+    def release(self) -> None:
+        if self.key and not self._completed and self.replay is None:
+            IdempotencyService.release(self.db, self.user_id, self.key)
+
+
+async def request_fingerprint(request: Request) -> str:
+    """SHA-256 of the method, path, query string and body."""
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.url.path.encode())
+    digest.update(request.url.query.encode())
+    digest.update(await request.body())
+    return digest.hexdigest()
+
+
+def get_idempotency(
+    user_id: int | None = Query(None, description="Current user ID"),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+    fingerprint: str = Depends(request_fingerprint),
+    db: Session = Depends(get_db),
+):
+    """
+    Dependency for endpoints that accept an Idempotency-Key header. Keys are
+    scoped to the request's `user_id`.
+    The endpoint returns `idempotency.replay` when set, and passes its result
+    through `idempotency.save`. If it fails, the key is released.
+    """
+    idempotency = Idempotency(
+        db, user_id if user_id is not None else IdempotencyService.NO_USER, idempotency_key
+    )
+    if idempotency_key is not None:
+        if not idempotency_key or len(idempotency_key) > IdempotencyService.MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Idempotency-Key debe tener entre 1 y {IdempotencyService.MAX_KEY_LENGTH} caracteres",
+            )
+        try:
+            stored = IdempotencyService.reserve(
+                db,
+                idempotency.user_id,
+                idempotency_key,
+                fingerprint,
+                config.IDEMPOTENCY_KEY_TTL_HOURS,
+                config.IDEMPOTENCY_LEASE_SECONDS,
+            )
+        except IdempotencyConflictError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        except IdempotencyError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if stored is not None:
+            idempotency.replay = JSONResponse(
+                content=json.loads(stored.response_body),
+                status_code=stored.status_code,
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+    try:
+        yield idempotency
+    except Exception:
+        idempotency.release()
+        raise
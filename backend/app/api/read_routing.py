@@ -0,0 +1,68 @@
+"""Read-replica routing for GET endpoints with read-your-writes stickiness.
+
+After a client's successful write, ReadYourWritesMiddleware sets a short-lived
+cookie. While it is valid, get_read_db / get_async_read_db send that client's
+reads to the primary, so replica lag never hides the client's own changes.
+"""
+
+import time
+
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import ReadSessionLocal, get_async_read_sessionmaker
+
+STICKY_COOKIE = "db_primary_until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def wants_primary(request: Request) -> bool:
+    """True while the client's read-your-writes window is open."""
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+def get_read_db(request: Request):
+    """Dependency to get a DB session that reads from the replica when possible."""
+    db = ReadSessionLocal()
+    db.use_primary = db.use_primary or wants_primary(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """Async variant of get_read_db."""
+    async with get_async_read_sessionmaker()() as db:
+        db.sync_session.use_primary = db.sync_session.use_primary or wants_primary(request)
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client's reads to the primary for `sticky_seconds` after it writes."""
+
+    def __init__(self, app: ASGIApp, sticky_seconds: float):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                cookie = (
+                    f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(self.sticky_seconds) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
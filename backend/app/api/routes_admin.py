@@ -1,15 +1,15 @@
 """Admin routes - System administration endpoints."""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.database import get_db
+from app.feed_cache import feed_cache
 from app.models.card import PreferenceVote
 from app.models.proposal import Proposal
-from app.api.admin_access import require_admin_access
-from app.api.backoffice_dependencies import get_backoffice_user_optional
-from app.models.backoffice_user import BackofficeUser
+from app.api.admin_access import require_admin
+from app.services.proposal_service import ProposalService
 
 router = APIRouter()
 
@@ -20,15 +20,18 @@ class ResetResponse(BaseModel):
     proposals_deleted: int
 
 
-@router.post("/reset", response_model=ResetResponse)
+class ExpireProposalsResponse(BaseModel):
+    periods: int
+    expired: int
+    refunded: int
+    refunded_credits: int
+
+
+@router.post("/reset", response_model=ResetResponse, dependencies=[Depends(require_admin)])
 def reset_all_data(
-    user_id: int | None = Query(None, description="Admin user ID"),
     db: Session = Depends(get_db),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
 ):
     """Reset all votes and proposals. Admin only."""
-    require_admin_access(db, user_id, backoffice_user)
-
     # Delete all preference votes
     votes_count = db.query(PreferenceVote).count()
     db.query(PreferenceVote).delete()
@@ -38,9 +41,24 @@ def reset_all_data(
     db.query(Proposal).delete()
 
     db.commit()
+    # Bulk delete bypasses the ORM events that invalidate cached decks
+    feed_cache.clear()
 
     return ResetResponse(
         message="Datos reseteados exitosamente",
         votes_deleted=votes_count,
         proposals_deleted=proposals_count,
     )
+
+
+@router.post(
+    "/expire-proposals",
+    response_model=ExpireProposalsResponse,
+    dependencies=[Depends(require_admin)],
+)
+def expire_stale_proposals(
+    db: Session = Depends(get_db),
+):
+    """Run the proposal expiry sweeper now and report what it did. Admin only."""
+    report = ProposalService.expire_stale_proposals(db)
+    return ExpireProposalsResponse(**report)
@@ -1,33 +1,107 @@
 """Auth routes - Login endpoint."""
 
-from fastapi import APIRouter, Depends, HTTPException
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from app.api.conditional import USERS_CACHE_CONTROL, catalog_cache
+from app.config import config
 from app.database import get_db
 from app.models.user import User
+from app.rate_limit import TokenBucketLimiter
 from app.schemas.user import LoginRequest, LoginResponse, UserResponse
-from app.auth import verify_pin
+from app.auth import PinVerifierBusy, hash_pin_async, needs_rehash, verify_pin_async
+from app.session_tokens import ROLE_ADMIN, ROLE_USER, create_session_token
 
 router = APIRouter()
 
+user_login_limiter = TokenBucketLimiter(
+    config.LOGIN_USER_BURST, config.LOGIN_USER_PER_MINUTE / 60
+)
+ip_login_limiter = TokenBucketLimiter(
+    config.LOGIN_IP_BURST, config.LOGIN_IP_PER_MINUTE / 60
+)
 
-@router.post("/login", response_model=LoginResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
-    """Login with user ID and PIN."""
-    user = db.query(User).filter(User.id == request.user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
-    if not verify_pin(request.pin, user.pin_hash):
-        raise HTTPException(status_code=401, detail="PIN incorrecto")
+def _client_ip(http_request: Request) -> str:
+    if config.TRUST_PROXY_HEADERS:
+        # Earlier entries come from the client; the last one is nginx's $remote_addr
+        forwarded = http_request.headers.get("x-forwarded-for", "").rsplit(",", 1)[-1].strip()
+        if forwarded:
+            return forwarded
+    return http_request.client.host if http_request.client else "unknown"
+
+
+def _check_login_rate(user_id: int, client_ip: str) -> None:
+    # The account's bucket is only charged once the IP is allowed, so a
+    # client blocked by IP can't use up (and lock out) someone's account
+    wait = ip_login_limiter.acquire(client_ip) or user_login_limiter.acquire(user_id)
+    if wait:
+        raise HTTPException(
+            status_code=429,
+            detail="Demasiados intentos, espera un momento",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+def _get_user(db: Session, user_id: int) -> User | None:
+    return db.query(User).filter(User.id == user_id).first()
+
 
+def _login_response(db: Session, user: User, new_pin_hash: str | None) -> LoginResponse:
+    if new_pin_hash:
+        user.pin_hash = new_pin_hash
+        db.commit()
     return LoginResponse(
         user=UserResponse.model_validate(user),
+        token=create_session_token(
+            ROLE_ADMIN if user.is_admin else ROLE_USER,
+            user_id=user.id,
+            partner_id=user.partner_id,
+        ),
         message="Login exitoso",
     )
 
 
-@router.get("/users", response_model=list[UserResponse])
+@router.post("/login", response_model=LoginResponse)
+async def login(
+    request: LoginRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Login with user ID and PIN.
+    Attempts are rate limited per user and per client IP. The bcrypt check
+    runs on a small dedicated pool; when it's saturated the login gets a 503.
+    """
+    _check_login_rate(request.user_id, _client_ip(http_request))
+
+    user = await run_in_threadpool(_get_user, db, request.user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+
+    try:
+        if not await verify_pin_async(request.pin, user.pin_hash):
+            raise HTTPException(status_code=401, detail="PIN incorrecto")
+        # Upgrade hashes made with an older cost factor while we have the PIN
+        new_pin_hash = await hash_pin_async(request.pin) if needs_rehash(user.pin_hash) else None
+    except PinVerifierBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Servidor ocupado, intenta de nuevo",
+            headers={"Retry-After": "1"},
+        )
+
+    return await run_in_threadpool(_login_response, db, user, new_pin_hash)
+
+
+@router.get(
+    "/users",
+    response_model=list[UserResponse],
+    dependencies=[Depends(catalog_cache(USERS_CACHE_CONTROL))],
+)
 def get_users(db: Session = Depends(get_db)):
     """Get all users (for login selection)."""
     users = db.query(User).all()
@@ -1,12 +1,16 @@
-"""Backoffice auth routes."""
+"""Backoffice auth and profiling routes."""
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
+from app import profiling
+from app.api.session_dependencies import get_session_claims
 from app.backoffice_auth import verify_password
 from app.database import get_db
 from app.models.backoffice_user import BackofficeUser
 from app.schemas.backoffice import BackofficeLoginRequest, BackofficeLoginResponse
+from app.session_tokens import ROLE_BACKOFFICE, SessionClaims, create_session_token
 
 router = APIRouter()
 
@@ -25,5 +29,28 @@ def login_backoffice(
 
     return BackofficeLoginResponse(
         username=user.username,
+        token=create_session_token(ROLE_BACKOFFICE, username=user.username),
         message="Login exitoso",
     )
+
+
+def _require_backoffice(claims: SessionClaims | None) -> None:
+    if not claims or claims.role != ROLE_BACKOFFICE:
+        raise HTTPException(status_code=403, detail="Requiere sesion de backoffice")
+
+
+@router.get("/profiles", response_model=list[str])
+def get_profiles(claims: SessionClaims | None = Depends(get_session_claims)):
+    """Saved profiles (collapsed stacks), newest first."""
+    _require_backoffice(claims)
+    return profiling.list_profiles()
+
+
+@router.get("/profiles/{filename}")
+def download_profile(filename: str, claims: SessionClaims | None = Depends(get_session_claims)):
+    """Download a profile; open it in speedscope or flamegraph.pl."""
+    _require_backoffice(claims)
+    path = profiling.profile_path(filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    return FileResponse(path, media_type="text/plain", filename=filename)
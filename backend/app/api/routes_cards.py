@@ -1,9 +1,11 @@
 """Card routes - CRUD and voting."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models.card import CardCategory
 from app.schemas.card import (
     CardCreate,
@@ -19,34 +21,56 @@ from app.schemas.card import (
     CardUpdateAdmin,
     CardCreateAdmin,
 )
-from app.services.card_service import CardService
+from app.services.card_service import CARD_FIELDS, CardService
 from app.services.card_csv_service import CardCsvService
 from app.schemas.card_csv import CardCsvPreviewResponse, CardCsvApplyResponse
-from app.api.admin_access import require_admin_access
-from app.api.backoffice_dependencies import get_backoffice_user_optional
-from app.models.backoffice_user import BackofficeUser
+from app.api.admin_access import require_admin
+from app.api.conditional import CATALOG_CACHE_CONTROL, catalog_headers
+from app.api.read_routing import get_async_read_db, get_read_db
 
 router = APIRouter()
 
+# List endpoints return CardService dicts straight through orjson: they already
+# have exactly CardResponse's fields, and validating hundreds of them again
+# costs more than building them. `response_model` still documents the shape.
 
-@router.get("", response_model=CardListResponse)
-def get_cards(
-    category: CardCategory | None = None,
-    grouping_slug: str | None = Query(None, description="Grouping slug to include"),
-    grouping_id: int | None = Query(None, description="Grouping ID to include"),
-    user_id: int | None = Query(None, description="Current user ID for preferences"),
-    partner_id: int | None = Query(None, description="Partner ID for preferences"),
-    is_challenge: bool | None = Query(None, description="Filter by challenge cards"),
-    tags: str | None = Query(None, description="Comma-separated tag slugs to include (OR logic)"),
-    exclude_tags: str | None = Query(None, description="Comma-separated tag slugs to exclude"),
-    unvoted_only: bool = Query(False, description="Only return cards user hasn't voted on"),
-    voted_only: bool = Query(False, description="Only return cards user has voted on"),
-    locale: str | None = Query(None, description="Locale for translations (e.g., 'es', 'en')"),
-    limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-):
-    """Get cards with optional filtering and preferences."""
+FIELDS_DESCRIPTION = (
+    "Comma-separated card fields to return (e.g. 'id,title,user_preference'); "
+    "`id` is always included. Default: all fields"
+)
+
+
+def _parse_fields(fields: str | None) -> frozenset[str] | None:
+    """Validate a `fields=` sparse fieldset; None means every field."""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested.difference(CARD_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Campos desconocidos: {', '.join(unknown)}"
+        )
+    return frozenset(requested | {"id"})
+
+
+def _list_cards(
+    db: Session,
+    category: CardCategory | None,
+    grouping_slug: str | None,
+    grouping_id: int | None,
+    user_id: int | None,
+    partner_id: int | None,
+    is_challenge: bool | None,
+    tags: str | None,
+    exclude_tags: str | None,
+    unvoted_only: bool,
+    voted_only: bool,
+    locale: str | None,
+    limit: int,
+    offset: int,
+    fields: frozenset[str] | None,
+    seed: int | None,
+) -> dict:
     # Parse comma-separated tags
     tags_list = [t.strip() for t in tags.split(",")] if tags else None
     exclude_tags_list = [t.strip() for t in exclude_tags.split(",")] if exclude_tags else None
@@ -58,25 +82,54 @@ def get_cards(
             grouping_slug=grouping_slug, grouping_id=grouping_id,
             tags=tags_list, exclude_tags=exclude_tags_list, is_challenge=is_challenge,
             limit=limit, offset=offset, unvoted_only=unvoted_only,
-            voted_only=voted_only, locale=locale
+            voted_only=voted_only, locale=locale, fields=fields, seed=seed
         )
-        cards = [CardResponse(**c) for c in cards_data]
     else:
         # Return plain cards (without tag filtering for now)
         cards_orm, total = CardService.get_cards(
             db, category=category, grouping_slug=grouping_slug, grouping_id=grouping_id,
             limit=limit, offset=offset, is_challenge=is_challenge
         )
-        cards = [
-            CardResponse(
-                **CardService._build_card_dict(
-                    db, card, locale=locale, include_tags_list=True, include_groupings_list=True
-                )
+        cards_data = [
+            CardService._build_card_dict(
+                db, card, locale=locale, include_tags_list=True, include_groupings_list=True,
+                fields=fields,
             )
             for card in cards_orm
         ]
 
-    return CardListResponse(cards=cards, total=total)
+    return {"cards": cards_data, "total": total}
+
+
+@router.get("", response_model=CardListResponse)
+async def get_cards(
+    request: Request,
+    category: CardCategory | None = None,
+    grouping_slug: str | None = Query(None, description="Grouping slug to include"),
+    grouping_id: int | None = Query(None, description="Grouping ID to include"),
+    user_id: int | None = Query(None, description="Current user ID for preferences"),
+    partner_id: int | None = Query(None, description="Partner ID for preferences"),
+    is_challenge: bool | None = Query(None, description="Filter by challenge cards"),
+    tags: str | None = Query(None, description="Comma-separated tag slugs to include (OR logic)"),
+    exclude_tags: str | None = Query(None, description="Comma-separated tag slugs to exclude"),
+    unvoted_only: bool = Query(False, description="Only return cards user hasn't voted on"),
+    voted_only: bool = Query(False, description="Only return cards user has voted on"),
+    locale: str | None = Query(None, description="Locale for translations (e.g., 'es', 'en')"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    seed: int | None = Query(None, description="Shuffle seed, for a repeatable card order"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Get cards with optional filtering and preferences."""
+    field_set = _parse_fields(fields)
+    # Without a couple the listing is catalog data: conditional GET applies
+    headers = None if user_id and partner_id else catalog_headers(request, CATALOG_CACHE_CONTROL)
+    return ORJSONResponse(await db.run_sync(
+        _list_cards,
+        category, grouping_slug, grouping_id, user_id, partner_id, is_challenge,
+        tags, exclude_tags, unvoted_only, voted_only, locale, limit, offset, field_set, seed,
+    ), headers=headers)
 
 
 # Specific routes BEFORE /{card_id} to avoid route conflicts
@@ -85,26 +138,15 @@ def get_partner_votes_grouped(
     user_id: int = Query(..., description="Current user ID"),
     partner_id: int = Query(..., description="Partner user ID"),
     locale: str | None = Query(None, description="Locale for translations (e.g., 'es', 'en')"),
-    db: Session = Depends(get_db),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
 ):
     """Get partner's votes on mutual cards, grouped by preference type."""
-    result = CardService.get_partner_votes_grouped(db, user_id, partner_id, locale=locale)
-
-    # Convert dicts to CardResponse objects
-    like_cards = [CardResponse(**c) for c in result["like"]]
-    maybe_cards = [CardResponse(**c) for c in result["maybe"]]
-    dislike_cards = [CardResponse(**c) for c in result["dislike"]]
-    neutral_cards = [CardResponse(**c) for c in result["neutral"]]
-
-    total_mutual = len(like_cards) + len(maybe_cards) + len(dislike_cards) + len(neutral_cards)
-
-    return PartnerVotesResponse(
-        like=like_cards,
-        maybe=maybe_cards,
-        dislike=dislike_cards,
-        neutral=neutral_cards,
-        total_mutual=total_mutual,
+    result = CardService.get_partner_votes_grouped(
+        db, user_id, partner_id, locale=locale, fields=_parse_fields(fields)
     )
+    total_mutual = sum(len(cards) for cards in result.values())
+    return ORJSONResponse({**result, "total_mutual": total_mutual})
 
 
 @router.get("/liked/both", response_model=list[CardResponse])
@@ -112,18 +154,17 @@ def get_cards_liked_by_both(
     user1_id: int = Query(...),
     user2_id: int = Query(...),
     locale: str | None = Query(None, description="Locale for translations (e.g., 'es', 'en')"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get cards liked by both users."""
-    cards = CardService.get_liked_by_both(db, user1_id, user2_id, locale=locale)
-    return [CardResponse(**c) for c in cards]
+    return ORJSONResponse(CardService.get_liked_by_both(db, user1_id, user2_id, locale=locale))
 
 
 @router.get("/{card_id}", response_model=CardResponse)
 def get_card(
     card_id: int,
     locale: str | None = Query(None, description="Locale for translations (e.g., 'es', 'en')"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get a single card by ID."""
     card = CardService.get_card(db, card_id)
@@ -158,20 +199,24 @@ def create_card(
     return CardResponse(**card_dict)
 
 
+def _vote(db: Session, user_id: int, card_id: int, preference) -> bool:
+    if not CardService.get_card(db, card_id):
+        return False
+    CardService.vote_on_card(db, user_id, card_id, preference)
+    return True
+
+
 @router.post("/{card_id}/vote", response_model=VoteResponse)
-def vote_on_card(
+async def vote_on_card(
     card_id: int,
     vote: VoteRequest,
     user_id: int = Query(..., description="Current user ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Vote on a card (like/dislike/neutral)."""
-    card = CardService.get_card(db, card_id)
-    if not card:
+    if not await db.run_sync(_vote, user_id, card_id, vote.preference):
         raise HTTPException(status_code=404, detail="Carta no encontrada")
 
-    CardService.vote_on_card(db, user_id, card_id, vote.preference)
-
     return VoteResponse(
         card_id=card_id,
         user_id=user_id,
@@ -181,20 +226,20 @@ def vote_on_card(
 
 
 @router.delete("/{card_id}/vote")
-def delete_vote(
+async def delete_vote(
     card_id: int,
     user_id: int = Query(..., description="Current user ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete user's vote on a card."""
-    deleted = CardService.delete_vote(db, user_id, card_id)
+    deleted = await db.run_sync(CardService.delete_vote, user_id, card_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Voto no encontrado")
     return {"card_id": card_id, "user_id": user_id, "message": "Voto eliminado"}
 
 
 @router.get("/{card_id}/preferences", response_model=list[PreferenceVoteResponse])
-def get_card_preferences(card_id: int, db: Session = Depends(get_db)):
+def get_card_preferences(card_id: int, db: Session = Depends(get_read_db)):
     """Get all votes for a card."""
     card = CardService.get_card(db, card_id)
     if not card:
@@ -220,37 +265,31 @@ def archive_card(
 
 # === Admin endpoints ===
 
-@router.get("/admin/all", response_model=CardListResponse)
+@router.get("/admin/all", response_model=CardListResponse, dependencies=[Depends(require_admin)])
 def get_all_cards_for_admin(
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     include_disabled: bool = Query(True, description="Include disabled cards"),
     locale: str | None = Query(None, description="Locale for translations (e.g., 'es', 'en')"),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
 ):
     """Get all cards for admin management (requires admin user)."""
-    require_admin_access(db, user_id, backoffice_user)
-
+    field_set = _parse_fields(fields)
     cards_data, total = CardService.get_all_cards_for_admin(
-        db, limit=limit, offset=offset, include_disabled=include_disabled, locale=locale
+        db, limit=limit, offset=offset, include_disabled=include_disabled, locale=locale,
+        fields=field_set,
     )
-    cards = [CardResponse(**c) for c in cards_data]
-    return CardListResponse(cards=cards, total=total)
+    return ORJSONResponse({"cards": cards_data, "total": total})
 
 
-@router.patch("/{card_id}/toggle")
+@router.patch("/{card_id}/toggle", dependencies=[Depends(require_admin)])
 def toggle_card_enabled(
     card_id: int,
     enabled: bool = Query(..., description="Enable or disable the card"),
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     db: Session = Depends(get_db),
 ):
     """Toggle a card's enabled status (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     card = CardService.toggle_card_enabled(db, card_id, enabled)
     if not card:
         raise HTTPException(status_code=404, detail="Carta no encontrada")
@@ -258,32 +297,24 @@ def toggle_card_enabled(
     return {"id": card_id, "is_enabled": enabled, "message": "Carta actualizada"}
 
 
-@router.patch("/admin/bulk-toggle")
+@router.patch("/admin/bulk-toggle", dependencies=[Depends(require_admin)])
 def bulk_toggle_cards(
     card_ids: list[int] = Query(..., description="List of card IDs to toggle"),
     enabled: bool = Query(..., description="Enable or disable the cards"),
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     db: Session = Depends(get_db),
 ):
     """Bulk enable/disable cards (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     updated = CardService.bulk_toggle_cards(db, card_ids, enabled)
     return {"updated_count": updated, "is_enabled": enabled}
 
 
-@router.patch("/{card_id}/tags")
+@router.patch("/{card_id}/tags", dependencies=[Depends(require_admin)])
 def update_card_tags(
     card_id: int,
     tags_update: CardTagsUpdate,
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     db: Session = Depends(get_db),
 ):
     """Update a card's tags and intensity (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     card_dict = CardService.update_card_tags(
         db, card_id, tags_update.tags, tags_update.intensity
     )
@@ -293,17 +324,13 @@ def update_card_tags(
     return card_dict
 
 
-@router.patch("/{card_id}")
+@router.patch("/{card_id}", dependencies=[Depends(require_admin)])
 def update_card_admin(
     card_id: int,
     card_update: CardUpdateAdmin,
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     db: Session = Depends(get_db),
 ):
     """Update a card (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     card_dict = CardService.update_card_admin(
         db,
         card_id,
@@ -323,17 +350,13 @@ def update_card_admin(
     return card_dict
 
 
-@router.patch("/{card_id}/groupings")
+@router.patch("/{card_id}/groupings", dependencies=[Depends(require_admin)])
 def update_card_groupings(
     card_id: int,
     groupings_update: CardGroupingsUpdate,
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     db: Session = Depends(get_db),
 ):
     """Update a card's groupings (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     card_dict = CardService.update_card_groupings(
         db, card_id, groupings_update.grouping_ids
     )
@@ -343,17 +366,13 @@ def update_card_groupings(
     return card_dict
 
 
-@router.get("/{card_id}/content")
+@router.get("/{card_id}/content", dependencies=[Depends(require_admin)])
 def get_card_content(
     card_id: int,
     locale: str = Query("en", description="Locale: 'en' or 'es'"),
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     db: Session = Depends(get_db),
 ):
     """Get card content for a specific locale (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     content = CardService.get_card_content_by_locale(db, card_id, locale)
     if not content:
         raise HTTPException(status_code=404, detail="Carta no encontrada")
@@ -361,17 +380,13 @@ def get_card_content(
     return content
 
 
-@router.patch("/{card_id}/content")
+@router.patch("/{card_id}/content", dependencies=[Depends(require_admin)])
 def update_card_content(
     card_id: int,
     content_update: CardContentUpdate,
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     db: Session = Depends(get_db),
 ):
     """Update card title and description for a specific locale (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     card = CardService.update_card_content(
         db, card_id, content_update.title, content_update.description, content_update.locale
     )
@@ -388,13 +403,10 @@ def update_card_content(
 @router.post("/admin/create", response_model=CardResponse)
 def create_card_admin(
     card_data: CardCreateAdmin,
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
+    admin_user_id: int | None = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """Create a new card with optional Spanish translation (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     card = CardService.create_card_admin(
         db,
         title=card_data.title,
@@ -411,22 +423,19 @@ def create_card_admin(
         spice_level=card_data.spice_level,
         difficulty_level=card_data.difficulty_level,
         credit_value=card_data.credit_value,
-        created_by_user_id=user_id,
+        created_by_user_id=admin_user_id,
     )
 
     card_dict = CardService._build_card_dict(db, card, locale="es", include_tags_list=True)
     return CardResponse(**card_dict)
 
 
-@router.get("/admin/csv/export")
+@router.get("/admin/csv/export", dependencies=[Depends(require_admin)])
 def export_cards_csv(
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     include_disabled: bool = Query(True, description="Include disabled cards"),
     db: Session = Depends(get_db),
 ):
     """Export cards to CSV (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
     csv_text = CardCsvService.export_cards_csv(db, include_disabled=include_disabled)
     return Response(
         content=csv_text,
@@ -435,15 +444,16 @@ def export_cards_csv(
     )
 
 
-@router.post("/admin/csv/preview", response_model=CardCsvPreviewResponse)
+@router.post(
+    "/admin/csv/preview",
+    response_model=CardCsvPreviewResponse,
+    dependencies=[Depends(require_admin)],
+)
 def preview_cards_csv(
     file: UploadFile = File(...),
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
     db: Session = Depends(get_db),
 ):
     """Preview CSV import (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
     try:
         content = file.file.read().decode("utf-8-sig")
     except UnicodeDecodeError as exc:
@@ -456,12 +466,10 @@ def preview_cards_csv(
 @router.post("/admin/csv/apply", response_model=CardCsvApplyResponse)
 def apply_cards_csv(
     file: UploadFile = File(...),
-    user_id: int | None = Query(None, description="Admin user ID"),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
+    admin_user_id: int | None = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """Apply CSV import (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
     try:
         content = file.file.read().decode("utf-8-sig")
     except UnicodeDecodeError as exc:
@@ -471,5 +479,5 @@ def apply_cards_csv(
     if errors:
         raise HTTPException(status_code=400, detail={"errors": errors})
 
-    result = CardCsvService.apply_import(db, rows, user_id)
+    result = CardCsvService.apply_import(db, rows, admin_user_id)
     return CardCsvApplyResponse(**result)
@@ -1,26 +1,28 @@
 """Credit routes - Balance and ledger."""
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_async_db
 from app.schemas.credit import (
     CreditBalanceResponse,
     CreditLedgerResponse,
     CreditLedgerListResponse,
 )
 from app.services.credit_service import CreditService
+from app.api.read_routing import get_read_db
 
 router = APIRouter()
 
 
 @router.get("/balance", response_model=CreditBalanceResponse)
-def get_balance(
+async def get_balance(
     user_id: int = Query(..., description="User ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get current credit balance for a user."""
-    balance = CreditService.get_balance(db, user_id)
+    balance = await db.run_sync(CreditService.get_balance, user_id)
     return CreditBalanceResponse(user_id=user_id, balance=balance)
 
 
@@ -29,7 +31,7 @@ def get_ledger(
     user_id: int = Query(..., description="User ID"),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get credit ledger (transaction history) for a user."""
     entries, total = CreditService.get_ledger(db, user_id, limit=limit, offset=offset)
@@ -0,0 +1,35 @@
+"""Dashboard routes - Home page data in one request."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.enrichment import enrich_period
+from app.api.read_routing import get_read_db
+from app.schemas.dashboard import DashboardResponse
+from app.schemas.user import PartnerInfo
+from app.services.dashboard_service import DashboardService
+from app.services.period_service import PeriodService
+
+router = APIRouter()
+
+
+@router.get("", response_model=DashboardResponse)
+def get_dashboard(
+    user_id: int = Query(..., description="Current user ID"),
+    db: Session = Depends(get_read_db),
+):
+    """Active period, balance, proposal and card counts for the Home page."""
+    dashboard = DashboardService.get_dashboard(db, user_id)
+    if dashboard is None:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+
+    period = dashboard.pop("period")
+    partner = dashboard.pop("partner")
+    dashboard.pop("user")
+    return DashboardResponse(
+        user_id=user_id,
+        partner=PartnerInfo.model_validate(partner) if partner else None,
+        period=enrich_period(period) if period else None,
+        current_week=PeriodService.get_current_week(period) if period else 0,
+        **dashboard,
+    )
@@ -0,0 +1,126 @@
+"""Event routes - Real-time push over SSE with a WebSocket fallback."""
+
+import asyncio
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+
+from app.api.session_dependencies import get_session_claims
+from app.events import event_bus
+from app.session_tokens import SessionClaims, verify_session_token
+
+router = APIRouter()
+
+# Seconds between keepalive messages so proxies don't close idle streams
+KEEPALIVE_SECONDS = 15
+
+# EventSource and browser WebSockets can't set headers, so they pass the token here
+TOKEN_DESCRIPTION = "Session token, for clients that can't send an Authorization header"
+
+
+def _owns_stream(user_id: int, claims: SessionClaims | None, token: str | None) -> bool:
+    """Whether the session (Bearer header, else the `token` param) is this user's."""
+    if claims is None and token:
+        claims = verify_session_token(token)
+    return claims is not None and claims.user_id == user_id
+
+
+async def _next_event(subscription):
+    """Wait for the next event, or None when the keepalive interval passes."""
+    try:
+        return await asyncio.wait_for(subscription.queue.get(), KEEPALIVE_SECONDS)
+    except asyncio.TimeoutError:
+        return None
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    user_id: int = Query(..., description="User ID"),
+    last_event_id: int | None = Query(None, description="Replay events after this ID"),
+    last_event_id_header: int | None = Header(None, alias="Last-Event-ID"),
+    token: str | None = Query(None, description=TOKEN_DESCRIPTION),
+    claims: SessionClaims | None = Depends(get_session_claims),
+):
+    """
+    Server-Sent Events stream of proposal, vote and balance events for a user.
+    Browsers reconnect with the Last-Event-ID header and get missed events replayed.
+    Requires a session token of that user.
+    """
+    if claims is None and not token:
+        raise HTTPException(status_code=401, detail="Credenciales requeridas")
+    if not _owns_stream(user_id, claims, token):
+        raise HTTPException(status_code=403, detail="Solo puedes ver tus propios eventos")
+    if last_event_id is None:
+        last_event_id = last_event_id_header
+    subscription = event_bus.subscribe(user_id, last_event_id)
+
+    async def stream():
+        try:
+            yield f"retry: {KEEPALIVE_SECONDS * 1000}\n\n"
+            for item in subscription.replay:
+                yield item.to_sse()
+            while not await request.is_disconnected():
+                item = await _next_event(subscription)
+                yield item.to_sse() if item else ": keepalive\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def events_websocket(
+    websocket: WebSocket,
+    user_id: int = Query(..., description="User ID"),
+    last_event_id: int | None = Query(None, description="Replay events after this ID"),
+    token: str | None = Query(None, description=TOKEN_DESCRIPTION),
+):
+    """
+    WebSocket fallback for clients that can't use SSE. Sends events as JSON.
+    Requires a session token of that user; otherwise the handshake is refused.
+    """
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    claims = verify_session_token(credentials) if scheme.lower() == "bearer" else None
+    if not _owns_stream(user_id, claims, token):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    subscription = event_bus.subscribe(user_id, last_event_id)
+    # Client messages are ignored; receiving only tells us when it disconnects
+    disconnected = asyncio.ensure_future(websocket.receive_text())
+    try:
+        for item in subscription.replay:
+            await websocket.send_json(item.to_dict())
+        while True:
+            next_event = asyncio.ensure_future(_next_event(subscription))
+            done, _ = await asyncio.wait(
+                {next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if next_event in done:
+                item = next_event.result()
+                await websocket.send_json(item.to_dict() if item else {"type": "keepalive"})
+            else:
+                next_event.cancel()
+            if disconnected in done:
+                disconnected.result()
+                disconnected = asyncio.ensure_future(websocket.receive_text())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        event_bus.unsubscribe(subscription)
@@ -5,31 +5,47 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.grouping import Grouping
-from app.schemas.grouping import GroupingResponse, GroupingCreate, GroupingUpdate
-from app.api.admin_access import require_admin_access
-from app.api.backoffice_dependencies import get_backoffice_user_optional
-from app.models.backoffice_user import BackofficeUser
+from app.schemas.grouping import (
+    GroupingResponse,
+    GroupingCreate,
+    GroupingUpdate,
+    GroupingProgressResponse,
+)
+from app.services.card_service import CardService
+from app.api.admin_access import require_admin
+from app.api.read_routing import get_read_db
+from app.api.conditional import CATALOG_CACHE_CONTROL, catalog_cache
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[GroupingResponse])
-def get_groupings(db: Session = Depends(get_db)):
+@router.get(
+    "",
+    response_model=list[GroupingResponse],
+    dependencies=[Depends(catalog_cache(CATALOG_CACHE_CONTROL))],
+)
+def get_groupings(db: Session = Depends(get_read_db)):
     """Get all groupings."""
     groupings = db.query(Grouping).order_by(Grouping.display_order, Grouping.name).all()
     return [GroupingResponse.model_validate(grouping) for grouping in groupings]
 
 
-@router.post("", response_model=GroupingResponse)
+@router.get("/progress", response_model=list[GroupingProgressResponse])
+def get_groupings_progress(
+    user_id: int = Query(..., description="Current user ID"),
+    partner_id: int = Query(..., description="Partner user ID"),
+    db: Session = Depends(get_read_db),
+):
+    """Cards per grouping, how many each partner voted on and mutual likes."""
+    return CardService.get_grouping_progress(db, user_id, partner_id)
+
+
+@router.post("", response_model=GroupingResponse, dependencies=[Depends(require_admin)])
 def create_grouping(
     grouping: GroupingCreate,
-    user_id: int | None = Query(None, description="Admin user ID"),
     db: Session = Depends(get_db),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
 ):
     """Create a new grouping (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     existing = db.query(Grouping).filter(Grouping.slug == grouping.slug).first()
     if existing:
         raise HTTPException(status_code=409, detail="Slug ya existe")
@@ -46,17 +62,17 @@ def create_grouping(
     return GroupingResponse.model_validate(new_grouping)
 
 
-@router.patch("/{grouping_id}", response_model=GroupingResponse)
+@router.patch(
+    "/{grouping_id}",
+    response_model=GroupingResponse,
+    dependencies=[Depends(require_admin)],
+)
 def update_grouping(
     grouping_id: int,
     grouping_update: GroupingUpdate,
-    user_id: int | None = Query(None, description="Admin user ID"),
     db: Session = Depends(get_db),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
 ):
     """Update a grouping (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     grouping = db.query(Grouping).filter(Grouping.id == grouping_id).first()
     if not grouping:
         raise HTTPException(status_code=404, detail="Grouping no encontrado")
@@ -79,16 +95,12 @@ def update_grouping(
     return GroupingResponse.model_validate(grouping)
 
 
-@router.delete("/{grouping_id}")
+@router.delete("/{grouping_id}", dependencies=[Depends(require_admin)])
 def delete_grouping(
     grouping_id: int,
-    user_id: int | None = Query(None, description="Admin user ID"),
     db: Session = Depends(get_db),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
 ):
     """Delete a grouping (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     grouping = db.query(Grouping).filter(Grouping.id == grouping_id).first()
     if not grouping:
         raise HTTPException(status_code=404, detail="Grouping no encontrado")
@@ -4,39 +4,21 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.api.enrichment import enrich_period, enrich_proposal
+from app.api.idempotency import Idempotency, get_idempotency
 from app.models.period import PeriodStatus
 from app.schemas.period import (
     PeriodCreate,
     PeriodResponse,
     PeriodListResponse,
 )
-from app.schemas.proposal import ProposalListResponse, ProposalResponse
-from app.schemas.card import CardResponse
-from app.schemas.user import UserResponse
+from app.schemas.proposal import ProposalListResponse
 from app.services.period_service import PeriodService, PeriodError
 from app.services.proposal_service import ProposalService
 
 router = APIRouter()
 
 
-def _enrich_period(period) -> PeriodResponse:
-    """Add computed fields to period response."""
-    current_week = PeriodService.get_current_week(period)
-    total_weeks = PeriodService.PERIOD_DURATIONS[period.period_type]
-    return PeriodResponse(
-        id=period.id,
-        period_type=period.period_type,
-        status=period.status,
-        start_date=period.start_date,
-        end_date=period.end_date,
-        weekly_base_credits=period.weekly_base_credits,
-        cards_to_play_per_week=period.cards_to_play_per_week,
-        created_at=period.created_at,
-        current_week=current_week,
-        total_weeks=total_weeks,
-    )
-
-
 @router.post("", response_model=PeriodResponse)
 def create_period(period: PeriodCreate, db: Session = Depends(get_db)):
     """Create a new period."""
@@ -48,7 +30,7 @@ def create_period(period: PeriodCreate, db: Session = Depends(get_db)):
             weekly_base_credits=period.weekly_base_credits,
             cards_to_play_per_week=period.cards_to_play_per_week,
         )
-        return _enrich_period(new_period)
+        return enrich_period(new_period)
     except PeriodError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -63,7 +45,7 @@ def get_periods(
     """Get periods."""
     periods, total = PeriodService.get_periods(db, status=status, limit=limit, offset=offset)
     return PeriodListResponse(
-        periods=[_enrich_period(p) for p in periods],
+        periods=[enrich_period(p) for p in periods],
         total=total,
     )
 
@@ -74,7 +56,7 @@ def get_active_period(db: Session = Depends(get_db)):
     period = PeriodService.get_active_period(db)
     if not period:
         return None
-    return _enrich_period(period)
+    return enrich_period(period)
 
 
 @router.get("/{period_id}", response_model=PeriodResponse)
@@ -83,7 +65,7 @@ def get_period(period_id: int, db: Session = Depends(get_db)):
     period = PeriodService.get_period(db, period_id)
     if not period:
         raise HTTPException(status_code=404, detail="Periodo no encontrado")
-    return _enrich_period(period)
+    return enrich_period(period)
 
 
 @router.patch("/{period_id}/activate", response_model=PeriodResponse)
@@ -91,7 +73,7 @@ def activate_period(period_id: int, db: Session = Depends(get_db)):
     """Activate a period."""
     try:
         period = PeriodService.activate_period(db, period_id)
-        return _enrich_period(period)
+        return enrich_period(period)
     except PeriodError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -101,7 +83,7 @@ def complete_period(period_id: int, db: Session = Depends(get_db)):
     """Mark a period as done."""
     try:
         period = PeriodService.complete_period(db, period_id)
-        return _enrich_period(period)
+        return enrich_period(period)
     except PeriodError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -122,26 +104,10 @@ def get_period_proposals(
         db, period_id, limit=limit, offset=offset
     )
 
-    enriched = []
-    for p in proposals:
-        enriched.append(ProposalResponse(
-            id=p.id,
-            period_id=p.period_id,
-            week_index=p.week_index,
-            proposed_by_user_id=p.proposed_by_user_id,
-            proposed_to_user_id=p.proposed_to_user_id,
-            card_id=p.card_id,
-            status=p.status,
-            created_at=p.created_at,
-            responded_at=p.responded_at,
-            completed_requested_at=p.completed_requested_at,
-            completed_confirmed_at=p.completed_confirmed_at,
-            card=CardResponse.model_validate(p.card) if p.card else None,
-            proposed_by=UserResponse.model_validate(p.proposed_by) if p.proposed_by else None,
-            proposed_to=UserResponse.model_validate(p.proposed_to) if p.proposed_to else None,
-        ))
-
-    return ProposalListResponse(proposals=enriched, total=total)
+    return ProposalListResponse(
+        proposals=[enrich_proposal(p, db) for p in proposals],
+        total=total,
+    )
 
 
 @router.post("/{period_id}/grant-weekly-credits")
@@ -149,10 +115,16 @@ def grant_weekly_credits(
     period_id: int,
     user_ids: list[int],
     db: Session = Depends(get_db),
+    idempotency: Idempotency = Depends(get_idempotency),
 ):
-    """Grant weekly credits to users for a period."""
+    """
+    Grant weekly credits to users for a period.
+    Retries with the same Idempotency-Key return the first response.
+    """
+    if idempotency.replay is not None:
+        return idempotency.replay
     try:
         count = PeriodService.grant_weekly_credits_to_users(db, period_id, user_ids)
-        return {"message": f"Creditos otorgados a {count} usuarios"}
+        return idempotency.save({"message": f"Creditos otorgados a {count} usuarios"})
     except PeriodError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,9 +1,13 @@
 """Proposal routes - Create, respond, complete, confirm."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_async_db
+from app.api.read_routing import get_read_db
+from app.api.enrichment import enrich_proposal
+from app.api.idempotency import Idempotency, get_idempotency
 from app.models.proposal import ProposalStatus
 from app.schemas.proposal import (
     ProposalCreate,
@@ -11,63 +15,31 @@ from app.schemas.proposal import (
     ProposalResponse,
     ProposalRespondRequest,
     ProposalListResponse,
+    ProposalSuggestionsResponse,
 )
-from app.schemas.card import CardResponse
-from app.schemas.user import UserResponse
-from app.services.proposal_service import ProposalService, ProposalError
+from app.services.proposal_service import (
+    ProposalService,
+    ProposalError,
+    ProposalConflictError,
+)
+from app.services.suggestion_service import SuggestionService
 
 router = APIRouter()
 
 
-def _enrich_proposal(proposal, db) -> ProposalResponse:
-    """Add card and user info to proposal response."""
-    # Get display title/description from card or custom fields
-    display_title = proposal.custom_title
-    display_description = proposal.custom_description
-    if proposal.card:
-        display_title = proposal.card.title
-        display_description = proposal.card.description
-
-    return ProposalResponse(
-        id=proposal.id,
-        period_id=proposal.period_id,
-        week_index=proposal.week_index,
-        proposed_by_user_id=proposal.proposed_by_user_id,
-        proposed_to_user_id=proposal.proposed_to_user_id,
-        card_id=proposal.card_id,
-        challenge_type=proposal.challenge_type,
-        custom_title=proposal.custom_title,
-        custom_description=proposal.custom_description,
-        # Guided challenge fields
-        why_proposing=proposal.why_proposing,
-        boundary=proposal.boundary,
-        # Custom challenge fields
-        location=proposal.location,
-        duration=proposal.duration,
-        boundaries_json=proposal.boundaries_json,
-        reward_type=proposal.reward_type,
-        reward_details=proposal.reward_details,
-        credit_cost=proposal.credit_cost,
-        status=proposal.status,
-        created_at=proposal.created_at,
-        responded_at=proposal.responded_at,
-        completed_requested_at=proposal.completed_requested_at,
-        completed_confirmed_at=proposal.completed_confirmed_at,
-        card=CardResponse.model_validate(proposal.card) if proposal.card else None,
-        proposed_by=UserResponse.model_validate(proposal.proposed_by) if proposal.proposed_by else None,
-        proposed_to=UserResponse.model_validate(proposal.proposed_to) if proposal.proposed_to else None,
-        display_title=display_title,
-        display_description=display_description,
-    )
-
-
 @router.post("", response_model=ProposalResponse)
 def create_proposal(
     proposal: ProposalCreate,
     user_id: int = Query(..., description="Current user ID (proposer)"),
     db: Session = Depends(get_db),
+    idempotency: Idempotency = Depends(get_idempotency),
 ):
-    """Create a new proposal. Can be from card OR custom reto. Proposing is FREE."""
+    """
+    Create a new proposal. Can be from card OR custom reto. Proposing is FREE.
+    Retries with the same Idempotency-Key return the first response.
+    """
+    if idempotency.replay is not None:
+        return idempotency.replay
     try:
         new_proposal = ProposalService.create_proposal(
             db,
@@ -88,37 +60,70 @@ def create_proposal(
             reward_type=proposal.reward_type,
             reward_details=proposal.reward_details,
         )
-        return _enrich_proposal(new_proposal, db)
+        return idempotency.save(enrich_proposal(new_proposal, db))
     except ProposalError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _list_proposals(
+    db: Session,
+    user_id: int,
+    as_recipient: bool,
+    status: ProposalStatus | None,
+    limit: int,
+    offset: int,
+) -> ProposalListResponse:
+    proposals, total = ProposalService.get_proposals_for_user(
+        db, user_id, as_recipient=as_recipient, status=status, limit=limit, offset=offset
+    )
+    return ProposalListResponse(
+        proposals=[enrich_proposal(p, db) for p in proposals],
+        total=total,
+    )
+
+
+def _get_enriched_proposal(db: Session, proposal_id: int) -> ProposalResponse | None:
+    proposal = ProposalService.get_proposal(db, proposal_id)
+    return enrich_proposal(proposal, db) if proposal else None
+
+
 @router.get("", response_model=ProposalListResponse)
-def get_proposals(
+async def get_proposals(
     user_id: int = Query(..., description="User ID"),
     as_recipient: bool = Query(True, description="True=received, False=sent"),
     status: ProposalStatus | None = None,
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get proposals for a user."""
-    proposals, total = ProposalService.get_proposals_for_user(
-        db, user_id, as_recipient=as_recipient, status=status, limit=limit, offset=offset
+    return await db.run_sync(
+        _list_proposals, user_id, as_recipient, status, limit, offset
     )
-    return ProposalListResponse(
-        proposals=[_enrich_proposal(p, db) for p in proposals],
-        total=total,
+
+
+@router.get("/suggestions", response_model=ProposalSuggestionsResponse)
+def get_proposal_suggestions(
+    user_id: int = Query(..., description="Current user ID"),
+    partner_id: int = Query(..., description="Partner user ID"),
+    locale: str | None = Query(None, description="Locale for translations (e.g., 'es', 'en')"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    """Mutual-liked cards not yet proposed this period, best first."""
+    suggestions = SuggestionService.get_suggestions(
+        db, user_id, partner_id, locale=locale, limit=limit
     )
+    return ProposalSuggestionsResponse(suggestions=suggestions)
 
 
 @router.get("/{proposal_id}", response_model=ProposalResponse)
-def get_proposal(proposal_id: int, db: Session = Depends(get_db)):
+async def get_proposal(proposal_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a single proposal."""
-    proposal = ProposalService.get_proposal(db, proposal_id)
+    proposal = await db.run_sync(_get_enriched_proposal, proposal_id)
     if not proposal:
         raise HTTPException(status_code=404, detail="Propuesta no encontrada")
-    return _enrich_proposal(proposal, db)
+    return proposal
 
 
 @router.patch("/{proposal_id}", response_model=ProposalResponse)
@@ -131,7 +136,7 @@ def update_proposal(
     """Update a proposal before it is accepted."""
     try:
         proposal = ProposalService.update_proposal(db, proposal_id, user_id, request)
-        return _enrich_proposal(proposal, db)
+        return enrich_proposal(proposal, db)
     except ProposalError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -155,11 +160,15 @@ def respond_to_proposal(
     request: ProposalRespondRequest,
     user_id: int = Query(..., description="Current user ID (recipient)"),
     db: Session = Depends(get_db),
+    idempotency: Idempotency = Depends(get_idempotency),
 ):
     """
     Respond to a proposal (accept/maybe_later/reject).
     When accepting, must provide credit_cost (1-7).
+    Retries with the same Idempotency-Key return the first response.
     """
+    if idempotency.replay is not None:
+        return idempotency.replay
     if not request.validate_response():
         raise HTTPException(
             status_code=400,
@@ -170,7 +179,9 @@ def respond_to_proposal(
         proposal = ProposalService.respond_to_proposal(
             db, proposal_id, user_id, request.response, request.credit_cost
         )
-        return _enrich_proposal(proposal, db)
+        return idempotency.save(enrich_proposal(proposal, db))
+    except ProposalConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ProposalError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -180,11 +191,16 @@ def mark_proposal_complete(
     proposal_id: int,
     user_id: int = Query(..., description="Current user ID (recipient)"),
     db: Session = Depends(get_db),
+    idempotency: Idempotency = Depends(get_idempotency),
 ):
     """Recipient marks proposal as completed (pending confirmation)."""
+    if idempotency.replay is not None:
+        return idempotency.replay
     try:
         proposal = ProposalService.mark_as_completed(db, proposal_id, user_id)
-        return _enrich_proposal(proposal, db)
+        return idempotency.save(enrich_proposal(proposal, db))
+    except ProposalConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ProposalError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -194,10 +210,18 @@ def confirm_proposal_completion(
     proposal_id: int,
     user_id: int = Query(..., description="Current user ID (proposer)"),
     db: Session = Depends(get_db),
+    idempotency: Idempotency = Depends(get_idempotency),
 ):
-    """Proposer confirms completion. Awards credits to recipient."""
+    """
+    Proposer confirms completion. Awards credits to recipient.
+    Retries with the same Idempotency-Key return the first response.
+    """
+    if idempotency.replay is not None:
+        return idempotency.replay
     try:
         proposal = ProposalService.confirm_completion(db, proposal_id, user_id)
-        return _enrich_proposal(proposal, db)
+        return idempotency.save(enrich_proposal(proposal, db))
+    except ProposalConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ProposalError as e:
         raise HTTPException(status_code=400, detail=str(e))
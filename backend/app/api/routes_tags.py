@@ -9,9 +9,9 @@ from app.database import get_db
 from app.models.tag import Tag
 from app.models.card import Card
 from app.schemas.tag import TagResponse, TagsGroupedResponse, TagCreate, TagUpdate
-from app.api.admin_access import require_admin_access
-from app.api.backoffice_dependencies import get_backoffice_user_optional
-from app.models.backoffice_user import BackofficeUser
+from app.api.admin_access import require_admin
+from app.api.read_routing import get_read_db
+from app.api.conditional import CATALOG_CACHE_CONTROL, catalog_cache
 
 router = APIRouter()
 
@@ -77,10 +77,14 @@ def _remove_tag_slug(db: Session, slug: str) -> None:
         db.commit()
 
 
-@router.get("", response_model=list[TagResponse])
+@router.get(
+    "",
+    response_model=list[TagResponse],
+    dependencies=[Depends(catalog_cache(CATALOG_CACHE_CONTROL))],
+)
 def get_tags(
     tag_type: str | None = Query(None, description="Filter by tag type: category, intensity, subtag"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get all tags, optionally filtered by type."""
     query = db.query(Tag)
@@ -91,8 +95,12 @@ def get_tags(
     return [TagResponse.model_validate(t) for t in tags]
 
 
-@router.get("/grouped", response_model=TagsGroupedResponse)
-def get_tags_grouped(db: Session = Depends(get_db)):
+@router.get(
+    "/grouped",
+    response_model=TagsGroupedResponse,
+    dependencies=[Depends(catalog_cache(CATALOG_CACHE_CONTROL))],
+)
+def get_tags_grouped(db: Session = Depends(get_read_db)):
     """Get all tags grouped by type for the filter UI."""
     tags = db.query(Tag).order_by(Tag.display_order).all()
 
@@ -116,16 +124,12 @@ def get_tags_grouped(db: Session = Depends(get_db)):
     )
 
 
-@router.post("", response_model=TagResponse)
+@router.post("", response_model=TagResponse, dependencies=[Depends(require_admin)])
 def create_tag(
     tag: TagCreate,
-    user_id: int | None = Query(None, description="Admin user ID"),
     db: Session = Depends(get_db),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
 ):
     """Create a new tag (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     existing = db.query(Tag).filter(Tag.slug == tag.slug).first()
     if existing:
         raise HTTPException(status_code=409, detail="Slug ya existe")
@@ -149,17 +153,13 @@ def create_tag(
     return TagResponse.model_validate(new_tag)
 
 
-@router.patch("/{tag_id}", response_model=TagResponse)
+@router.patch("/{tag_id}", response_model=TagResponse, dependencies=[Depends(require_admin)])
 def update_tag(
     tag_id: int,
     tag_update: TagUpdate,
-    user_id: int | None = Query(None, description="Admin user ID"),
     db: Session = Depends(get_db),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
 ):
     """Update a tag (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     tag = db.query(Tag).filter(Tag.id == tag_id).first()
     if not tag:
         raise HTTPException(status_code=404, detail="Tag no encontrado")
@@ -193,16 +193,12 @@ def update_tag(
     return TagResponse.model_validate(tag)
 
 
-@router.delete("/{tag_id}")
+@router.delete("/{tag_id}", dependencies=[Depends(require_admin)])
 def delete_tag(
     tag_id: int,
-    user_id: int | None = Query(None, description="Admin user ID"),
     db: Session = Depends(get_db),
-    backoffice_user: BackofficeUser | None = Depends(get_backoffice_user_optional),
 ):
     """Delete a tag (admin only)."""
-    require_admin_access(db, user_id, backoffice_user)
-
     tag = db.query(Tag).filter(Tag.id == tag_id).first()
     if not tag:
         raise HTTPException(status_code=404, detail="Tag no encontrado")
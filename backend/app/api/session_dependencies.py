@@ -0,0 +1,22 @@
+"""Dependencies for signed session tokens."""
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.session_tokens import SessionClaims, verify_session_token
+
+session_security = HTTPBearer(auto_error=False)
+
+
+def get_session_claims(
+    credentials: HTTPAuthorizationCredentials | None = Depends(session_security),
+) -> SessionClaims | None:
+    """Claims of the Bearer token, verified without touching the database."""
+    if not credentials:
+        return None
+
+    claims = verify_session_token(credentials.credentials)
+    if not claims:
+        raise HTTPException(status_code=401, detail="Sesion invalida o expirada")
+
+    return claims
@@ -1,13 +1,63 @@
 """Simple PIN-based authentication."""
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from app.config import config
+
+
+class PinVerifierBusy(Exception):
+    """Too many PIN checks are already queued."""
+    pass
+
+
+# bcrypt is CPU-bound; keep it off the event loop and the shared request
+# threadpool so a burst of logins can't starve other endpoints.
+_pin_executor = ThreadPoolExecutor(
+    max_workers=config.PIN_VERIFY_WORKERS, thread_name_prefix="pin-verify"
+)
+_pin_slots = threading.BoundedSemaphore(config.PIN_VERIFY_MAX_PENDING)
+
 
 def hash_pin(pin: str) -> str:
     """Hash a PIN using bcrypt."""
-    return bcrypt.hashpw(pin.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    salt = bcrypt.gensalt(rounds=config.PIN_BCRYPT_ROUNDS)
+    return bcrypt.hashpw(pin.encode('utf-8'), salt).decode('utf-8')
 
 
 def verify_pin(plain_pin: str, hashed_pin: str) -> bool:
     """Verify a PIN against its hash."""
     return bcrypt.checkpw(plain_pin.encode('utf-8'), hashed_pin.encode('utf-8'))
+
+
+def needs_rehash(hashed_pin: str) -> bool:
+    """True when the hash was made with a different cost than PIN_BCRYPT_ROUNDS."""
+    try:
+        rounds = int(hashed_pin.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != config.PIN_BCRYPT_ROUNDS
+
+
+async def _run_bounded(func, *args):
+    """Run func on the PIN pool, or raise PinVerifierBusy if the pool is saturated."""
+    if not _pin_slots.acquire(blocking=False):
+        raise PinVerifierBusy()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_pin_executor, func, *args)
+    finally:
+        _pin_slots.release()
+
+
+async def verify_pin_async(plain_pin: str, hashed_pin: str) -> bool:
+    """verify_pin on the dedicated PIN pool."""
+    return await _run_bounded(verify_pin, plain_pin, hashed_pin)
+
+
+async def hash_pin_async(pin: str) -> str:
+    """hash_pin on the dedicated PIN pool."""
+    return await _run_bounded(hash_pin, pin)
@@ -0,0 +1,87 @@
+"""Version counter for the catalog (cards, tags, groupings and users).
+
+Catalog endpoints answer with a strong ETag built from the counter (see
+app/api/conditional.py). Any ORM write to a catalog model bumps the counter
+once the transaction commits.
+Bulk UPDATE/DELETE statements bypass the ORM, so code using them on those
+tables must call `mark_changed` on its session.
+
+The counter is per process and starts from a random prefix, so a restart
+never reuses a tag. Like the event bus, this assumes a single app process.
+With a read replica, no ETag is issued for READ_REPLICA_STICKY_SECONDS after
+a bump, so a lagging replica can't serve old data under the new tag.
+"""
+
+import secrets
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.database import READ_REPLICA_URL
+from app.models.card import Card, CardTranslation
+from app.models.grouping import Grouping
+from app.models.tag import Tag
+from app.models.user import User
+
+CATALOG_MODELS = (Card, CardTranslation, Grouping, Tag, User)
+_PENDING_KEY = "catalog_changed"
+
+
+class CatalogVersion:
+    """Process-wide catalog version and the ETag derived from it."""
+
+    def __init__(self, settle_seconds: float = 0.0):
+        self.settle_seconds = settle_seconds
+        self._lock = threading.Lock()
+        self._prefix = secrets.token_hex(4)
+        self._version = 0
+        self._changed_at = float("-inf")
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._changed_at = time.monotonic()
+
+    def etag(self) -> str | None:
+        """Strong ETag for the current version (None while replicas catch up)."""
+        with self._lock:
+            if time.monotonic() - self._changed_at < self.settle_seconds:
+                return None
+            return f'"{self._prefix}-{self._version}"'
+
+
+catalog_version = CatalogVersion(
+    config.READ_REPLICA_STICKY_SECONDS if READ_REPLICA_URL else 0.0
+)
+
+
+def mark_changed(session: Session) -> None:
+    """Bump the catalog version when `session` commits."""
+    session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    if any(
+        isinstance(obj, CATALOG_MODELS)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        mark_changed(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        catalog_version.bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -16,6 +16,78 @@ class AppConfig:
     CURRENCY_NAME: str = os.getenv("CURRENCY_NAME", "Venus")
     CURRENCY_NAME_LOWER: str = CURRENCY_NAME.lower()
 
+    # Background sweeper that expires stale proposals
+    # Seconds between runs (0 disables it) and periods handled per transaction
+    PROPOSAL_EXPIRY_INTERVAL_SECONDS: int = int(
+        os.getenv("PROPOSAL_EXPIRY_INTERVAL_SECONDS", "3600")
+    )
+    PROPOSAL_EXPIRY_BATCH_SIZE: int = int(os.getenv("PROPOSAL_EXPIRY_BATCH_SIZE", "200"))
+
+    # PIN hashing: bcrypt cost (old hashes are upgraded on login), threads
+    # dedicated to bcrypt and how many checks may be queued before rejecting
+    PIN_BCRYPT_ROUNDS: int = int(os.getenv("PIN_BCRYPT_ROUNDS", "12"))
+    PIN_VERIFY_WORKERS: int = int(os.getenv("PIN_VERIFY_WORKERS", "2"))
+    PIN_VERIFY_MAX_PENDING: int = int(os.getenv("PIN_VERIFY_MAX_PENDING", "8"))
+
+    # Login attempts: burst size and refill per minute, per user and per client IP
+    LOGIN_USER_BURST: int = int(os.getenv("LOGIN_USER_BURST", "5"))
+    LOGIN_USER_PER_MINUTE: float = float(os.getenv("LOGIN_USER_PER_MINUTE", "5"))
+    LOGIN_IP_BURST: int = int(os.getenv("LOGIN_IP_BURST", "20"))
+    LOGIN_IP_PER_MINUTE: float = float(os.getenv("LOGIN_IP_PER_MINUTE", "30"))
+    # Take the client IP from the hop the nginx proxy appends to X-Forwarded-For.
+    # Only enable it when the backend is reachable solely through that proxy
+    TRUST_PROXY_HEADERS: bool = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+
+    # Secret for signing session tokens (set it in production so tokens survive restarts)
+    SESSION_SECRET: str = os.getenv("SESSION_SECRET", "")
+    SESSION_TOKEN_TTL_HOURS: int = int(os.getenv("SESSION_TOKEN_TTL_HOURS", "720"))
+
+    # Log a suspected N+1 when one statement shape runs this many times in a request
+    QUERY_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "10"))
+
+    # Response compression: smallest body compressed (bytes), gzip level (1-9)
+    # and brotli quality (0-11, used when the brotli package is installed)
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Sampling profiler (see app.profiling): where profiles are saved, how many
+    # are kept, sampling interval, and the background sampler's schedule
+    # (seconds between runs, 0 disables it) and length
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "/tmp/couple-cards-profiles")
+    PROFILE_KEEP_FILES: int = int(os.getenv("PROFILE_KEEP_FILES", "50"))
+    PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    PROFILE_BACKGROUND_INTERVAL_SECONDS: int = int(
+        os.getenv("PROFILE_BACKGROUND_INTERVAL_SECONDS", "0")
+    )
+    PROFILE_BACKGROUND_DURATION_SECONDS: float = float(
+        os.getenv("PROFILE_BACKGROUND_DURATION_SECONDS", "10")
+    )
+
+    # Seconds a client's reads stay on the primary after it writes
+    # (only used when READ_REPLICA_URL is set)
+    READ_REPLICA_STICKY_SECONDS: float = float(os.getenv("READ_REPLICA_STICKY_SECONDS", "5"))
+
+    # Seconds the active period and user rows are cached per process (0 disables it)
+    CONTEXT_CACHE_TTL_SECONDS: float = float(os.getenv("CONTEXT_CACHE_TTL_SECONDS", "30"))
+
+    # max-age for the public catalog listings (tags, groupings, cards); clients
+    # revalidate with If-None-Match afterwards
+    CATALOG_MAX_AGE_SECONDS: int = int(os.getenv("CATALOG_MAX_AGE_SECONDS", "60"))
+
+    # Computed swipe-deck pages cached per process (either set to 0 disables it)
+    FEED_CACHE_MAX_ENTRIES: int = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "1000"))
+    FEED_CACHE_TTL_SECONDS: float = float(os.getenv("FEED_CACHE_TTL_SECONDS", "30"))
+
+    # Stored responses for Idempotency-Key retries
+    # Hours a key is kept, and seconds between cleanup runs (0 disables it)
+    IDEMPOTENCY_KEY_TTL_HOURS: int = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+    # Seconds after which a key whose request never finished can be reused
+    IDEMPOTENCY_LEASE_SECONDS: int = int(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
+    IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS: int = int(
+        os.getenv("IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS", "3600")
+    )
+
 
 # Singleton instance
 config = AppConfig()
@@ -0,0 +1,185 @@
+"""Request- and process-scoped cache for the active period and user context.
+
+The active period and the user rows (names, partner, admin flag) are read by
+most requests but rarely change. Lookups go through the request cache (kept
+in the DB session's `info`), then a process-wide cache with a short TTL, then
+the database.
+
+Any ORM write to a Period or User invalidates the cached values once the
+transaction commits. Bulk UPDATE/DELETE statements bypass the ORM, so code
+using them on those tables must call `invalidate_period`/`invalidate_user`.
+The TTL bounds staleness for changes made by other processes.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from app.config import config
+from app.models.period import Period, PeriodStatus
+from app.models.user import User
+
+_REQUEST_KEY = "context_cache"
+_PENDING_KEY = "context_cache_invalidations"
+_ACTIVE_PERIOD = "active_period"
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """The user columns needed for access checks and placeholder rendering."""
+
+    id: int
+    name: str
+    nickname: str | None
+    is_admin: bool
+    partner_id: int | None
+
+
+class ContextCache:
+    """Process-wide TTL cache with per-request memoization on the DB session."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[object, tuple[float, object]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key):
+        """Return (found, value) from the process cache."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+
+    def _set(self, key, value) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    @staticmethod
+    def _request_cache(db: Session) -> dict:
+        return db.info.setdefault(_REQUEST_KEY, {})
+
+    def get_active_period(self, db: Session) -> Period | None:
+        """The ACTIVE period, attached to `db` without querying when cached."""
+        request_cache = self._request_cache(db)
+        if _ACTIVE_PERIOD in request_cache:
+            return request_cache[_ACTIVE_PERIOD]
+
+        found, values = self._get(_ACTIVE_PERIOD)
+        if found:
+            period = self._attach(db, values) if values else None
+        else:
+            period = db.query(Period).filter(Period.status == PeriodStatus.ACTIVE).first()
+            self._set(_ACTIVE_PERIOD, self._column_values(period) if period else None)
+
+        request_cache[_ACTIVE_PERIOD] = period
+        return period
+
+    @staticmethod
+    def _column_values(period: Period) -> dict:
+        return {
+            attr.key: getattr(period, attr.key)
+            for attr in Period.__mapper__.column_attrs
+        }
+
+    @staticmethod
+    def _attach(db: Session, values: dict) -> Period:
+        """
+        Put a cached period into the session as if it had been loaded. If the
+        session already holds that period, it's returned as is: it may carry
+        changes newer than the cached values.
+        """
+        existing = db.identity_map.get(identity_key(Period, values["id"]))
+        if existing is not None:
+            return existing
+        period = Period(**values)
+        make_transient_to_detached(period)
+        return db.merge(period, load=False)
+
+    def get_user(self, db: Session, user_id: int | None) -> UserSnapshot | None:
+        """Snapshot of a user, or None if it doesn't exist."""
+        if user_id is None:
+            return None
+        key = ("user", user_id)
+        request_cache = self._request_cache(db)
+        if key in request_cache:
+            return request_cache[key]
+
+        found, user = self._get(key)
+        if not found:
+            row = db.query(
+                User.id, User.name, User.nickname, User.is_admin, User.partner_id
+            ).filter(User.id == user_id).first()
+            user = UserSnapshot(*row) if row else None
+            self._set(key, user)
+
+        request_cache[key] = user
+        return user
+
+    def get_couple(
+        self, db: Session, user_id: int, partner_id: int | None
+    ) -> tuple[UserSnapshot | None, UserSnapshot | None]:
+        """Snapshots of a user and their partner."""
+        return self.get_user(db, user_id), self.get_user(db, partner_id)
+
+    def is_admin(self, db: Session, user_id: int) -> bool:
+        user = self.get_user(db, user_id)
+        return bool(user and user.is_admin)
+
+    def invalidate_period(self) -> None:
+        with self._lock:
+            self._entries.pop(_ACTIVE_PERIOD, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(("user", user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+context_cache = ContextCache(config.CONTEXT_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session: Session, flush_context) -> None:
+    keys = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Period):
+            keys.add(_ACTIVE_PERIOD)
+        elif isinstance(obj, User) and obj.id is not None:
+            keys.add(("user", obj.id))
+    if keys:
+        # This session's own view changed right away; other requests see it on commit
+        session.info.pop(_REQUEST_KEY, None)
+        session.info.setdefault(_PENDING_KEY, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    for key in session.info.pop(_PENDING_KEY, ()):
+        if key == _ACTIVE_PERIOD:
+            context_cache.invalidate_period()
+        else:
+            context_cache.invalidate_user(key[1])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_REQUEST_KEY, None)
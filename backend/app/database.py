@@ -4,10 +4,11 @@ import os
 from pathlib import Path
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 
 # Load .env file from project root
 env_path = Path(__file__).parent.parent.parent.parent / ".env"
@@ -36,26 +37,158 @@ def get_engine_args() -> dict:
     db_type = os.getenv("DB_TYPE", "sqlite").lower()
 
     if db_type == "mysql":
+        return {"poolclass": QueuePool, **get_mysql_pool_args()}
+    elif is_sqlite_memory():
+        # An in-memory database only lives as long as its connection
         return {
-            "poolclass": QueuePool,
-            "pool_size": 5,
-            "max_overflow": 10,
-            "pool_pre_ping": True,
-            "pool_recycle": 3600,
+            "connect_args": {"check_same_thread": False},
+            "poolclass": StaticPool,
         }
     else:
-        # SQLite needs check_same_thread=False for FastAPI
+        # One connection per checkout; check_same_thread=False because pooled
+        # connections are handed to whichever worker thread checks them out
         return {
             "connect_args": {"check_same_thread": False},
-            "poolclass": StaticPool,
+            "poolclass": QueuePool,
+            "pool_size": int(os.getenv("SQLITE_POOL_SIZE", "5")),
+            "max_overflow": int(os.getenv("SQLITE_MAX_OVERFLOW", "10")),
+        }
+
+
+def get_mysql_pool_args() -> dict:
+    """MySQL pool sizing, tunable through env (applies per engine and per worker)."""
+    return {
+        "pool_size": int(os.getenv("MYSQL_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("MYSQL_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("MYSQL_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("MYSQL_POOL_RECYCLE", "3600")),
+        "pool_pre_ping": os.getenv("MYSQL_POOL_PRE_PING", "true").lower() == "true",
+    }
+
+
+def is_sqlite_memory() -> bool:
+    """Check if the SQLite database is in memory."""
+    return os.getenv("SQLITE_PATH", "./couple_cards.db") in ("", ":memory:")
+
+
+def get_sqlite_pragmas() -> dict[str, str]:
+    """PRAGMAs run on every new SQLite connection, tunable through env."""
+    return {
+        # WAL lets readers keep reading while a writer commits
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        # NORMAL is durable across app crashes in WAL mode; only an OS crash
+        # can roll back the last commits
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        # Wait for a competing writer instead of failing with "database is locked"
+        "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+        # Negative values are KiB: 64 MiB page cache per connection
+        "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),
+        "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+        "foreign_keys": os.getenv("SQLITE_FOREIGN_KEYS", "ON"),
+    }
+
+
+def install_sqlite_pragmas(target: Engine) -> None:
+    """Run the SQLite PRAGMAs on each connection the engine opens."""
+    pragmas = get_sqlite_pragmas()
+
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def get_async_database_url(url: str) -> str:
+    """Same database through its async driver (aiomysql / aiosqlite)."""
+    return (
+        url.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+        .replace("sqlite://", "sqlite+aiosqlite://", 1)
+    )
+
+
+def get_async_engine_args() -> dict:
+    """Get async engine arguments based on database type."""
+    db_type = os.getenv("DB_TYPE", "sqlite").lower()
+
+    if db_type == "mysql":
+        return get_mysql_pool_args()
+    elif is_sqlite_memory():
+        return {"poolclass": StaticPool}
+    else:
+        return {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": int(os.getenv("SQLITE_POOL_SIZE", "5")),
+            "max_overflow": int(os.getenv("SQLITE_MAX_OVERFLOW", "10")),
         }
 
 
+class ReadSession(Session):
+    """
+    Session for read-only endpoints: queries go to the replica until the
+    session flushes or is marked `use_primary`, then everything goes to the primary.
+    """
+
+    def __init__(self, *args, primary: Engine, replica: Engine | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replica = replica
+        self.use_primary = replica is None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing:
+            self.use_primary = True
+        return self.primary if self.use_primary else self.replica
+
+
 # Database URL and engine
 DATABASE_URL = get_database_url()
 engine = create_engine(DATABASE_URL, **get_engine_args())
+if engine.dialect.name == "sqlite":
+    install_sqlite_pragmas(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for GET endpoints (same engine settings as the primary)
+READ_REPLICA_URL = os.getenv("READ_REPLICA_URL", "")
+replica_engine = create_engine(READ_REPLICA_URL, **get_engine_args()) if READ_REPLICA_URL else None
+ReadSessionLocal = sessionmaker(
+    class_=ReadSession, autoflush=False, primary=engine, replica=replica_engine
+)
+
+# Async engine, created on first use so sync-only tools never load the async drivers
+_async_engine: AsyncEngine | None = None
+_AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+_async_replica_engine: AsyncEngine | None = None
+_AsyncReadSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get (or create) the async engine."""
+    global _async_engine, _AsyncSessionLocal, _async_replica_engine, _AsyncReadSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(DATABASE_URL), **get_async_engine_args()
+        )
+        if _async_engine.dialect.name == "sqlite":
+            install_sqlite_pragmas(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine, autoflush=False, expire_on_commit=True
+        )
+        if READ_REPLICA_URL:
+            _async_replica_engine = create_async_engine(
+                get_async_database_url(READ_REPLICA_URL), **get_async_engine_args()
+            )
+        _AsyncReadSessionLocal = async_sessionmaker(
+            sync_session_class=ReadSession,
+            autoflush=False,
+            primary=_async_engine.sync_engine,
+            replica=_async_replica_engine.sync_engine if _async_replica_engine else None,
+        )
+    return _async_engine
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
@@ -71,6 +204,29 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency to get an async DB session.
+    Services are sync; call them with `await db.run_sync(func, *args)`.
+    """
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_read_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Async ReadSession factory (creates the async engines on first use)."""
+    get_async_engine()
+    return _AsyncReadSessionLocal
+
+
+async def dispose_async_engine():
+    """Close the async engines' connections, if they were created."""
+    for async_engine in (_async_engine, _async_replica_engine):
+        if async_engine is not None:
+            await async_engine.dispose()
+
+
 def create_tables():
     """Create all tables in the database."""
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,132 @@
+"""In-process pub/sub that pushes proposal, vote and credit events to clients.
+
+Each user has a channel with a bounded replay buffer. Services queue events on
+their DB session with `publish_after_commit`; they are only delivered once the
+transaction commits and are dropped on rollback.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Events kept per user for replay after a reconnect
+HISTORY_SIZE = 100
+# Events buffered per connected client before it is considered too slow
+QUEUE_SIZE = 500
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "type": self.type, "data": self.data}
+
+    def to_sse(self) -> str:
+        """Format the event as a Server-Sent Events message."""
+        payload = json.dumps(self.data, default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+@dataclass(eq=False)
+class Subscription:
+    """A connected client listening on one user's channel."""
+
+    user_id: int
+    loop: asyncio.AbstractEventLoop
+    replay: list[Event]
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(QUEUE_SIZE))
+
+    def deliver(self, item: Event) -> None:
+        """Hand an event to the client from any thread."""
+        self.loop.call_soon_threadsafe(self._put, item)
+
+    def _put(self, item: Event) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            logger.warning("Dropping event %s for slow client of user %s", item.id, self.user_id)
+
+
+class EventBus:
+    """Per-user channels with replay from a last-event-id."""
+
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._history_size = history_size
+        self._history: dict[int, deque[Event]] = {}
+        self._subscribers: dict[int, set[Subscription]] = {}
+
+    def publish(self, user_ids: Iterable[int], event_type: str, data: dict) -> None:
+        """Publish one event to each of the given users' channels."""
+        with self._lock:
+            for user_id in set(user_ids):
+                item = Event(id=next(self._ids), type=event_type, data=data)
+                history = self._history.setdefault(user_id, deque(maxlen=self._history_size))
+                history.append(item)
+                for subscription in self._subscribers.get(user_id, ()):
+                    subscription.deliver(item)
+
+    def subscribe(self, user_id: int, last_event_id: int | None = None) -> Subscription:
+        """
+        Start listening on a user's channel from the running event loop.
+        Events newer than `last_event_id` still in the buffer are put in `replay`.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            replay = []
+            if last_event_id is not None:
+                replay = [
+                    item for item in self._history.get(user_id, ())
+                    if item.id > last_event_id
+                ]
+            subscription = Subscription(user_id=user_id, loop=loop, replay=replay)
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering events to a client."""
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+event_bus = EventBus()
+
+
+def publish_after_commit(
+    db: Session, user_ids: Iterable[int], event_type: str, data: dict
+) -> None:
+    """Queue an event on the session; it is published when the transaction commits."""
+    db.info.setdefault("pending_events", []).append((list(user_ids), event_type, data))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_events(session: Session) -> None:
+    for user_ids, event_type, data in session.info.pop("pending_events", []):
+        event_bus.publish(user_ids, event_type, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session: Session) -> None:
+    session.info.pop("pending_events", None)
@@ -0,0 +1,149 @@
+"""Per-couple cache of computed swipe-deck pages (and other couple views).
+
+A couple's deck is requested over and over with the same parameters (remounts,
+tab switches, filter toggles). Computed pages, grouping progress and proposal
+suggestions are kept in a bounded LRU with a TTL, keyed by the couple, the
+parameters, plus:
+
+- each user's generation, bumped when a vote or proposal of theirs commits,
+  so it invalidates exactly the entries of the couples it belongs to;
+- the catalog version (app.catalog_version), so card, tag, grouping and user
+  writes invalidate every entry.
+
+Pages are cached before shuffling; callers shuffle their own copy. Bulk
+UPDATE/DELETE statements bypass the ORM, so code using them on votes or
+proposals must call `invalidate_after_commit` (or `clear`). The TTL bounds
+staleness for changes made by other processes or read from a lagging replica.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.catalog_version import catalog_version
+from app.config import config
+from app.models.card import PreferenceVote
+from app.models.proposal import Proposal
+
+_PENDING_KEY = "feed_cache_users"
+
+
+class FeedCache:
+    """Process-wide LRU+TTL cache of couple views with per-user generations."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._generations: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def generation(self, user_id: int | None) -> int:
+        """How many vote or proposal commits of this user have invalidated the cache."""
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def get(self, key: tuple):
+        """Return (found, value), refreshing the entry's LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: tuple, value) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, user_id: int, partner_id: int | None, key: tuple, compute):
+        """
+        compute() through the cache, under `key` plus both users'
+        generations and the catalog version.
+        """
+        if not self.enabled:
+            return compute()
+        # Generations are read before computing, so a change committed
+        # meanwhile leaves the result under an already outdated key
+        full_key = (
+            self.generation(user_id),
+            self.generation(partner_id),
+            catalog_version.version,
+            *key,
+        )
+        found, value = self.get(full_key)
+        if not found:
+            value = compute()
+            self.set(full_key, value)
+        return value
+
+    def bump(self, user_ids) -> None:
+        """Invalidate the pages of every couple these users belong to."""
+        with self._lock:
+            for user_id in user_ids:
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+
+feed_cache = FeedCache(config.FEED_CACHE_MAX_ENTRIES, config.FEED_CACHE_TTL_SECONDS)
+
+
+def invalidate_after_commit(session: Session, user_ids) -> None:
+    """Bump these users' generations when `session` commits."""
+    session.info.setdefault(_PENDING_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    users = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, PreferenceVote):
+            users.add(obj.user_id)
+        elif isinstance(obj, Proposal):
+            users.update((obj.proposed_by_user_id, obj.proposed_to_user_id))
+    if users:
+        invalidate_after_commit(session, users)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session) -> None:
+    users = session.info.pop(_PENDING_KEY, None)
+    if users:
+        feed_cache.bump(users)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -1,10 +1,26 @@
 """FastAPI main application."""
 
-from fastapi import FastAPI
+import logging
+import os
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import create_tables
+from app import database, metrics
+from app.compression import CompressionMiddleware
+from app.config import config
+from app.context_cache import context_cache
+from app.feed_cache import feed_cache
+from app.database import READ_REPLICA_URL, create_tables, dispose_async_engine
 from app.api import api_router
+from app.api.read_routing import ReadYourWritesMiddleware
+from app.profiling import ProfileMiddleware, run_background_profile
+from app.query_stats import QueryStatsMiddleware
+from app.scheduler import PeriodicJob
+from app.services.proposal_service import ProposalService
+from app.services.idempotency_service import IdempotencyService
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 
 app = FastAPI(
     title="Couple Cards + Dares API",
@@ -21,14 +37,79 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for JSON and CSV bodies (inside the timing middlewares, so
+# compression time is counted)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=config.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=config.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=config.COMPRESSION_BROTLI_QUALITY,
+)
+
+# Keep a client's reads on the primary right after its own writes
+if READ_REPLICA_URL:
+    app.add_middleware(
+        ReadYourWritesMiddleware, sticky_seconds=config.READ_REPLICA_STICKY_SECONDS
+    )
+
+# Per-request SQL counts and DB time (Server-Timing header and logs)
+app.add_middleware(
+    QueryStatsMiddleware, n_plus_one_threshold=config.QUERY_N_PLUS_ONE_THRESHOLD
+)
+
+# Request latency and in-flight requests for /metrics. Wraps every middleware
+# above, so it times them too; only the profiler below sits outside it
+# (it runs on opted-in requests only)
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.register_engine("primary", lambda: database.engine)
+metrics.register_engine("replica", lambda: database.replica_engine)
+metrics.register_engine("async", lambda: database._async_engine)
+metrics.register_cache("context", context_cache)
+metrics.register_cache("feed", feed_cache)
+
+# Sampling profiler for requests sent with X-Profile and a backoffice token
+app.add_middleware(ProfileMiddleware)
+
 # Include all routes
 app.include_router(api_router, prefix="/api")
 
+# Background jobs
+background_jobs = [
+    PeriodicJob(
+        "proposal-expiry",
+        config.PROPOSAL_EXPIRY_INTERVAL_SECONDS,
+        lambda db: ProposalService.expire_stale_proposals(
+            db, batch_size=config.PROPOSAL_EXPIRY_BATCH_SIZE
+        ),
+    ),
+    PeriodicJob(
+        "idempotency-cleanup",
+        config.IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS,
+        lambda db: IdempotencyService.purge_expired(db, config.IDEMPOTENCY_KEY_TTL_HOURS),
+    ),
+    PeriodicJob(
+        "background-profile",
+        config.PROFILE_BACKGROUND_INTERVAL_SECONDS,
+        run_background_profile,
+        uses_db=False,
+    ),
+]
+
 
 @app.on_event("startup")
 def startup():
-    """Create tables on startup."""
+    """Create tables and start background jobs on startup."""
     create_tables()
+    for job in background_jobs:
+        job.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background jobs and close async DB connections."""
+    for job in background_jobs:
+        job.stop()
+    await dispose_async_engine()
 
 
 @app.get("/")
@@ -41,3 +122,9 @@ def root():
 def health():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus metrics (not proxied by nginx; scrape the backend directly)."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,321 @@
+"""Prometheus metrics served at `/metrics` in the text exposition format.
+
+Updates go to per-thread shards (each thread only writes its own dicts), so
+the hot path takes no lock; shards are summed when `/metrics` is scraped.
+Pool, in-flight and cache metrics are read at scrape time.
+
+Metrics:
+- http_requests_in_progress, http_request_duration_seconds{method,route,status}
+- db_queries_total / db_query_seconds_total{route}, db_queries_per_request
+- db_pool_size / db_pool_checked_out / db_pool_overflow{engine}
+- app_writes_total{kind}: committed votes, proposals and ledger entries
+- cache_hits_total / cache_misses_total / cache_hit_ratio{cache}
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class _Shards:
+    """One dict per thread; only the owning thread writes to it."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: list[dict] = []
+
+    def mine(self) -> dict:
+        values = getattr(self._local, "values", None)
+        if values is None:
+            values = self._local.values = {}
+            with self._lock:
+                self._all.append(values)
+        return values
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            shards = list(self._all)
+        return [shard.copy() for shard in shards]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._shards = _Shards()
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        values = self._shards.mine()
+        values[label_values] = values.get(label_values, 0) + amount
+
+    def value(self, *label_values) -> float:
+        return sum(shard.get(label_values, 0) for shard in self._shards.snapshot())
+
+    def collect(self) -> list[str]:
+        totals: dict[tuple, float] = {}
+        for shard in self._shards.snapshot():
+            for key, amount in shard.items():
+                totals[key] = totals.get(key, 0) + amount
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key in sorted(totals, key=str):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {totals[key]}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._shards = _Shards()
+
+    def observe(self, value: float, *label_values) -> None:
+        values = self._shards.mine()
+        # Per-bucket counts, then sum and count
+        series = values.get(label_values)
+        if series is None:
+            series = values[label_values] = [0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def collect(self) -> list[str]:
+        totals: dict[tuple, list] = {}
+        for shard in self._shards.snapshot():
+            for key, series in shard.items():
+                merged = totals.setdefault(key, [0] * len(series))
+                for i, amount in enumerate(list(series)):
+                    merged[i] += amount
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key in sorted(totals, key=str):
+            series = totals[key]
+            cumulative = 0
+            for bound, amount in zip((*self.buckets, "+Inf"), series):
+                cumulative += amount
+                labels = _format_labels((*self.labels, "le"), (*key, bound))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {series[-2]}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Gauge:
+    """Metric whose samples are read by a callback at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...],
+        read: Callable[[], Iterable[tuple[tuple, float]]],
+        metric_type: str = "gauge",
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.read = read
+        self.metric_type = metric_type
+
+    def collect(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        for key, value in self.read():
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return lines
+
+
+# --- Sources read at scrape time -------------------------------------------
+
+_in_progress = [0]  # only touched on the event loop
+_engines: dict[str, Callable] = {}
+_caches: dict[str, object] = {}
+
+
+def register_engine(name: str, get_engine: Callable) -> None:
+    """Report pool usage for the engine returned by `get_engine` (may return None)."""
+    _engines[name] = get_engine
+
+
+def register_cache(name: str, cache) -> None:
+    """Report hit ratio for an object with `hits` and `misses` attributes."""
+    _caches[name] = cache
+
+
+def _pool_samples(attribute: str):
+    for name, get_engine in _engines.items():
+        engine = get_engine()
+        pool = getattr(getattr(engine, "sync_engine", engine), "pool", None)
+        method = getattr(pool, attribute, None)
+        if method is not None:
+            yield (name,), method()
+
+
+def _cache_ratio_samples():
+    for name, cache in _caches.items():
+        total = cache.hits + cache.misses
+        yield (name,), cache.hits / total if total else 0.0
+
+
+# --- Metrics ----------------------------------------------------------------
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ("method", "route", "status"),
+)
+queries_total = Counter("db_queries_total", "SQL statements run by requests", ("route",))
+query_seconds_total = Counter(
+    "db_query_seconds_total", "Time requests spent in SQL statements", ("route",)
+)
+queries_per_request = Histogram(
+    "db_queries_per_request", "SQL statements per request", buckets=QUERY_COUNT_BUCKETS
+)
+writes_total = Counter(
+    "app_writes_total", "Committed votes, proposals and ledger entries", ("kind",)
+)
+
+REGISTRY = [
+    Gauge(
+        "http_requests_in_progress", "Requests being handled", (),
+        lambda: [((), _in_progress[0])],
+    ),
+    request_duration,
+    queries_total,
+    query_seconds_total,
+    queries_per_request,
+    Gauge("db_pool_size", "Configured pool size", ("engine",), lambda: _pool_samples("size")),
+    Gauge(
+        "db_pool_checked_out", "Connections in use", ("engine",),
+        lambda: _pool_samples("checkedout"),
+    ),
+    Gauge(
+        "db_pool_overflow", "Connections open beyond pool_size", ("engine",),
+        lambda: _pool_samples("overflow"),
+    ),
+    writes_total,
+    Gauge(
+        "cache_hits_total", "In-process cache hits", ("cache",),
+        lambda: [((name,), cache.hits) for name, cache in _caches.items()],
+        metric_type="counter",
+    ),
+    Gauge(
+        "cache_misses_total", "In-process cache misses", ("cache",),
+        lambda: [((name,), cache.misses) for name, cache in _caches.items()],
+        metric_type="counter",
+    ),
+    Gauge("cache_hit_ratio", "In-process cache hit ratio", ("cache",), _cache_ratio_samples),
+]
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+def route_label(scope: Scope) -> str:
+    """Route template (not the raw path) to keep label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+def observe_request_queries(scope: Scope, count: int, duration: float) -> None:
+    route = route_label(scope)
+    queries_total.inc(route, amount=count)
+    query_seconds_total.inc(route, amount=duration)
+    queries_per_request.observe(count)
+
+
+class MetricsMiddleware:
+    """Track in-flight requests and latency per route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        _in_progress[0] += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _in_progress[0] -= 1
+            request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"], route_label(scope), status[0],
+            )
+
+
+# --- Committed writes -------------------------------------------------------
+
+_WRITE_KINDS = {"PreferenceVote": "vote", "Proposal": "proposal", "CreditLedger": "ledger"}
+_WRITES_KEY = "metrics_writes"
+
+
+def count_writes(session: Session, kind: str, count: int = 1) -> None:
+    """
+    Count writes once `session` commits. ORM writes are counted on flush;
+    bulk UPDATE/DELETE statements bypass it, so code using them calls this.
+    """
+    session.info.setdefault(_WRITES_KEY, []).extend([kind] * count)
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_writes(session: Session, flush_context) -> None:
+    pending = session.info.setdefault(_WRITES_KEY, [])
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        kind = _WRITE_KINDS.get(type(obj).__name__)
+        if kind and (obj not in session.dirty or session.is_modified(obj)):
+            pending.append(kind)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_writes(session: Session) -> None:
+    for kind in session.info.pop(_WRITES_KEY, []):
+        writes_total.inc(kind)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    session.info.pop(_WRITES_KEY, None)
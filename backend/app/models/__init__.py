@@ -8,6 +8,7 @@ from app.models.credit import CreditBalance, CreditLedger
 from app.models.tag import Tag
 from app.models.backoffice_user import BackofficeUser
 from app.models.grouping import Grouping
+from app.models.idempotency_key import IdempotencyKey
 
 __all__ = [
     "User",
@@ -20,4 +21,5 @@ __all__ = [
     "Tag",
     "BackofficeUser",
     "Grouping",
+    "IdempotencyKey",
 ]
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 from enum import Enum
-from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -36,6 +36,10 @@ class PreferenceType(str, Enum):
 
 class Card(Base):
     __tablename__ = "cards"
+    __table_args__ = (
+        # Card listing: WHERE status = ? AND is_enabled ORDER BY created_at DESC
+        Index("ix_cards_status_enabled_created", "status", "is_enabled", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -94,6 +98,10 @@ class Card(Base):
 
 class PreferenceVote(Base):
     __tablename__ = "preference_votes"
+    __table_args__ = (
+        # Votes on a card / partner votes: WHERE card_id [IN (...)] AND user_id = ?
+        Index("ix_preference_votes_card_user", "card_id", "user_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 from enum import Enum
-from sqlalchemy import Integer, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -14,6 +14,7 @@ class LedgerType(str, Enum):
     COMPLETION_REWARD = "completion_reward"
     ADMIN_ADJUSTMENT = "admin_adjustment"
     INITIAL_GRANT = "initial_grant"
+    PROPOSAL_REFUND = "proposal_refund"
 
 
 class CreditBalance(Base):
@@ -36,6 +37,9 @@ class CreditBalance(Base):
 class CreditLedger(Base):
     """Immutable ledger of all credit transactions (source of truth)."""
     __tablename__ = "credit_ledger"
+    __table_args__ = (
+        Index("ix_credit_ledger_user_created", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
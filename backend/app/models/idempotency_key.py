@@ -0,0 +1,37 @@
+"""Idempotency key model - Stored responses for safely retried requests."""
+
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    A client-supplied Idempotency-Key and the response it produced, per user.
+    Rows without a status_code are still being processed.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # 0 for requests not made on behalf of a user
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    key: Mapped[str] = mapped_column(String(64), nullable=False)
+    # SHA-256 of method, path, query and body; a key can't be reused for another request
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<IdempotencyKey(user_id={self.user_id}, key='{self.key}', "
+            f"status_code={self.status_code})>"
+        )
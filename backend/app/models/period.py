@@ -2,7 +2,7 @@
 
 from datetime import datetime, date, timezone
 from enum import Enum
-from sqlalchemy import String, Integer, Date, DateTime, Enum as SQLEnum
+from sqlalchemy import String, Integer, Date, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -22,6 +22,7 @@ class PeriodStatus(str, Enum):
 
 class Period(Base):
     __tablename__ = "periods"
+    __table_args__ = (Index("ix_periods_status", "status"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     period_type: Mapped[PeriodType] = mapped_column(
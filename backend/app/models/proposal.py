@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 from enum import Enum
-from sqlalchemy import Integer, String, DateTime, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -35,6 +35,21 @@ class RewardType(str, Enum):
 
 class Proposal(Base):
     __tablename__ = "proposals"
+    __table_args__ = (
+        Index("ix_proposals_period_status", "period_id", "status"),
+        # Inbox / outbox lists: WHERE user = ? AND status = ? ORDER BY created_at
+        Index(
+            "ix_proposals_to_user_status_created",
+            "proposed_to_user_id", "status", "created_at",
+        ),
+        Index(
+            "ix_proposals_by_user_status_created",
+            "proposed_by_user_id", "status", "created_at",
+        ),
+        # Same lists without a status filter: WHERE user = ? ORDER BY created_at
+        Index("ix_proposals_to_user_created", "proposed_to_user_id", "created_at"),
+        Index("ix_proposals_by_user_created", "proposed_by_user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     period_id: Mapped[int] = mapped_column(ForeignKey("periods.id"), nullable=False)
@@ -77,6 +92,8 @@ class Proposal(Base):
     status: Mapped[ProposalStatus] = mapped_column(
         SQLEnum(ProposalStatus), default=ProposalStatus.PROPOSED
     )
+    # Bumped on every state transition (optimistic concurrency)
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
     )
@@ -0,0 +1,215 @@
+"""Opt-in sampling profiler for production requests.
+
+A sampler thread reads `sys._current_frames()` every few milliseconds and
+counts the stacks of busy threads. Profiles are written in the collapsed
+stack format (`frame;frame;frame count`), which speedscope and flamegraph.pl
+open directly.
+
+- Per request: send `X-Profile: 1` (or `?_profile=1`) with a backoffice
+  session token. The response gets `X-Profile-File` naming the saved profile;
+  download it from `/api/backoffice/profiles/<name>`. Only one request is
+  profiled at a time.
+- Background: every PROFILE_BACKGROUND_INTERVAL_SECONDS, sample the whole
+  process for PROFILE_BACKGROUND_DURATION_SECONDS into an aggregate profile.
+
+Samples include every busy thread in the process, so concurrent requests show
+up in a request profile too.
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import config
+from app.session_tokens import ROLE_BACKOFFICE, verify_session_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIX = ".collapsed"
+
+# Leaf frames of threads that are parked waiting for work
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("_asyncio.py", "run"),
+}
+
+_BACKEND_ROOT = str(Path(__file__).resolve().parent.parent) + os.sep
+_SITE_PACKAGES = "site-packages" + os.sep
+
+_request_slot = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    if path.startswith(_BACKEND_ROOT):
+        path = path[len(_BACKEND_ROOT):]
+    elif _SITE_PACKAGES in path:
+        path = path[path.rindex(_SITE_PACKAGES) + len(_SITE_PACKAGES):]
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Count the stacks of busy threads on a background thread."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, str(thread_id)))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+def to_collapsed(stacks: Counter[str]) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def save_profile(name: str, stacks: Counter[str]) -> str:
+    """Write a profile to PROFILE_DIR, keeping the newest PROFILE_KEEP_FILES."""
+    directory = Path(config.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{name}{PROFILE_SUFFIX}"
+    (directory / filename).write_text(to_collapsed(stacks))
+
+    saved = sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda p: p.stat().st_mtime)
+    for old in saved[: max(len(saved) - config.PROFILE_KEEP_FILES, 0)]:
+        old.unlink(missing_ok=True)
+    return filename
+
+
+def profile_path(filename: str) -> Path | None:
+    """Path of a saved profile, or None if the name is unknown or unsafe."""
+    if "/" in filename or "\\" in filename or not filename.endswith(PROFILE_SUFFIX):
+        return None
+    path = Path(config.PROFILE_DIR) / filename
+    return path if path.is_file() else None
+
+
+def list_profiles() -> list[str]:
+    directory = Path(config.PROFILE_DIR)
+    if not directory.is_dir():
+        return []
+    return sorted((p.name for p in directory.glob(f"*{PROFILE_SUFFIX}")), reverse=True)
+
+
+def run_background_profile() -> str | None:
+    """Sample the whole process for a while and save an aggregate profile."""
+    sampler = StackSampler(config.PROFILE_SAMPLE_INTERVAL_MS / 1000).start()
+    time.sleep(config.PROFILE_BACKGROUND_DURATION_SECONDS)
+    stacks = sampler.stop()
+    return save_profile("aggregate", stacks) if stacks else None
+
+
+def _wants_profile(scope: Scope) -> bool:
+    headers = dict(scope.get("headers", []))
+    requested = headers.get(b"x-profile", b"").lower() in (b"1", b"true") or parse_qs(
+        scope.get("query_string", b"").decode("latin-1")
+    ).get("_profile") == ["1"]
+    if not requested:
+        return False
+
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer":
+        return False
+    claims = verify_session_token(token)
+    return claims is not None and claims.role == ROLE_BACKOFFICE
+
+
+class ProfileMiddleware:
+    """Profile requests that ask for it with backoffice credentials."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not _request_slot.acquire(blocking=False):
+            await self.app(scope, receive, _with_header(send, b"x-profile", b"busy"))
+            return
+
+        sampler = StackSampler(config.PROFILE_SAMPLE_INTERVAL_MS / 1000).start()
+        name = re.sub(r"[^A-Za-z0-9]+", "-", f"{scope['method']} {scope['path']}").strip("-")
+        pending: list[Message] = []
+        saved: list[str] = []
+
+        async def send_with_profile(message: Message):
+            # Hold the response start until the body is complete, so the
+            # header can name the saved profile. Streamed responses are
+            # saved when they end, without the header.
+            if message["type"] == "http.response.start":
+                pending.append(message)
+                return
+            if pending:
+                start = pending.pop()
+                if not message.get("more_body", False):
+                    saved.append(save_profile(name, sampler.stop()))
+                    headers = [*start.get("headers", []), (b"x-profile-file", saved[0].encode())]
+                    start = {**start, "headers": headers}
+                await send(start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            stacks = sampler.stop()
+            if not saved:
+                logger.info("Saved request profile %s", save_profile(name, stacks))
+            _request_slot.release()
+
+
+def _with_header(send: Send, name: bytes, value: bytes) -> Send:
+    async def wrapped(message: Message):
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": [*message.get("headers", []), (name, value)]}
+        await send(message)
+
+    return wrapped
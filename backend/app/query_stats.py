@@ -0,0 +1,138 @@
+"""Per-request SQL statement counts and DB time, with N+1 detection.
+
+Cursor events on every Engine add each statement to the QueryStats of the
+current request (a ContextVar, which also follows requests into the
+threadpool and into AsyncSession.run_sync). QueryStatsMiddleware reports the
+totals in a `Server-Timing` header and one structured log line per request,
+and warns when the same statement shape repeats `QUERY_N_PLUS_ONE_THRESHOLD`
+times, which usually means a query inside a loop.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import metrics
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+# Expanded IN lists and VALUES rows differ only in their number of placeholders
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repeats of the same query compare equal."""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Statements and DB time recorded while it is the current collector."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run at least `threshold` times (suspected N+1)."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+@contextmanager
+def collect_queries():
+    """Record the statements run in this context (and threads it starts)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("query_stats_start")
+    if stats is not None and starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # after_cursor_execute doesn't run for failed statements
+    connection = exception_context.connection
+    starts = connection.info.get("query_stats_start") if connection is not None else None
+    if starts:
+        starts.pop()
+
+
+class QueryStatsMiddleware:
+    """Count SQL statements per request; report them in Server-Timing and logs."""
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [0]
+        with collect_queries() as stats:
+
+            async def send_with_timing(message: Message):
+                if message["type"] == "http.response.start":
+                    status[0] = message["status"]
+                    timing = (
+                        f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"'
+                    )
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timing.encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                metrics.observe_request_queries(scope, stats.count, stats.duration)
+                if stats.count:
+                    self._log(scope, status[0], stats)
+
+    def _log(self, scope: Scope, status: int, stats: QueryStats):
+        route = scope.get("route")
+        record = {
+            "method": scope["method"],
+            "path": getattr(route, "path", scope["path"]),
+            "status": status,
+            "queries": stats.count,
+            "db_ms": round(stats.duration * 1000, 1),
+        }
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if repeated:
+            record["n_plus_one"] = [{"statement": s[:200], "count": n} for s, n in repeated]
+            logger.warning("sql %s", json.dumps(record))
+        else:
+            logger.info("sql %s", json.dumps(record))
@@ -0,0 +1,48 @@
+"""In-memory token-bucket rate limiting."""
+
+import threading
+import time
+
+
+class TokenBucketLimiter:
+    """
+    One bucket per key holding up to `capacity` tokens, refilled at
+    `refill_per_second`. Each attempt takes a token.
+    """
+
+    # Full buckets are dropped once this many keys are tracked
+    MAX_KEYS = 10_000
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._lock = threading.Lock()
+        self._buckets: dict[object, tuple[float, float]] = {}
+
+    def _tokens(self, key, now: float) -> float:
+        tokens, updated_at = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+
+    def acquire(self, key) -> float:
+        """
+        Take a token for `key`. Returns 0 when allowed, otherwise the seconds
+        to wait before the next token is available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._tokens(key, now)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / self.refill_per_second
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.MAX_KEYS:
+                self._prune(now)
+            return 0.0
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k in self._buckets if self._tokens(k, now) >= self.capacity]:
+            del self._buckets[key]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
@@ -0,0 +1,73 @@
+"""Periodic background jobs that run inside the API process."""
+
+import logging
+import threading
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+from app import database
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    Run a function with its own DB session every `interval` seconds on a
+    daemon thread. Jobs created with `uses_db=False` get no session and are
+    called without arguments.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[Session], Any] | Callable[[], Any],
+        uses_db: bool = True,
+    ):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.uses_db = uses_db
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> Any:
+        """Run the job a single time. Errors are logged, never raised."""
+        if not self.uses_db:
+            try:
+                return self.func()
+            except Exception:
+                logger.exception("Background job %s failed", self.name)
+                return None
+
+        db = database.SessionLocal()
+        try:
+            return self.func(db)
+        except Exception:
+            db.rollback()
+            logger.exception("Background job %s failed", self.name)
+            return None
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        """Start the job thread. An interval of 0 or less disables the job."""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name=f"job-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the job thread to finish and wait briefly for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.run_once()
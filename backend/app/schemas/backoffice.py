@@ -10,4 +10,5 @@ class BackofficeLoginRequest(BaseModel):
 
 class BackofficeLoginResponse(BaseModel):
     username: str
+    token: str
     message: str
@@ -0,0 +1,31 @@
+"""Dashboard schemas - Response DTOs."""
+
+from pydantic import BaseModel
+
+from app.schemas.period import PeriodResponse
+from app.schemas.user import PartnerInfo
+
+
+class GroupingUnvotedCount(BaseModel):
+    grouping_id: int
+    slug: str
+    name: str
+    unvoted: int
+
+
+class DashboardResponse(BaseModel):
+    """Everything the Home page needs on open."""
+    user_id: int
+    partner: PartnerInfo | None = None
+    period: PeriodResponse | None = None
+    # Week of the active period (0 without one)
+    current_week: int = 0
+    balance: int
+    # Proposal counts by status, in the active period
+    proposals_sent: dict[str, int]
+    proposals_received: dict[str, int]
+    # Enabled cards the user hasn't voted on yet
+    unvoted_total: int
+    unvoted_by_grouping: list[GroupingUnvotedCount]
+    # Active cards both partners liked
+    mutual_likes: int
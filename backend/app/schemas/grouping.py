@@ -28,3 +28,14 @@ class GroupingResponse(GroupingBase):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class GroupingProgressResponse(BaseModel):
+    """Voting progress of a couple in one grouping."""
+    grouping_id: int
+    slug: str
+    name: str
+    total: int
+    voted_by_me: int
+    voted_by_partner: int
+    mutual_likes: int
@@ -140,3 +140,17 @@ class ProposalRespondRequest(BaseModel):
 class ProposalListResponse(BaseModel):
     proposals: list[ProposalResponse]
     total: int
+
+
+class ProposalSuggestion(BaseModel):
+    """A mutual-liked card worth proposing, with what its score is made of."""
+    card: CardResponse
+    score: float
+    # When the card became a mutual like
+    liked_at: datetime
+    # Smoothed share of past proposals with the card's tags that were accepted
+    tag_acceptance_rate: float
+
+
+class ProposalSuggestionsResponse(BaseModel):
+    suggestions: list[ProposalSuggestion]
@@ -46,4 +46,5 @@ class LoginRequest(BaseModel):
 
 class LoginResponse(BaseModel):
     user: UserResponse
+    token: str
     message: str = "Login exitoso"
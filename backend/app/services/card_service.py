@@ -2,17 +2,49 @@
 
 import json
 import random
-from sqlalchemy.orm import Session, joinedload
+from collections.abc import Collection
+
+from sqlalchemy import and_, case, distinct, func
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
 
 from app.models.card import Card, PreferenceVote, CardCategory, CardStatus, PreferenceType, CardTranslation
 from app.models.tag import Tag
-from app.models.grouping import Grouping
-from app.models.user import User
+from app.models.grouping import Grouping, card_groupings
+from app.catalog_version import mark_changed
+from app.context_cache import context_cache
+from app.feed_cache import feed_cache
+from app.events import publish_after_commit
 from app.utils.placeholders import replace_placeholders_in_card
 
 # Default locale (cards are stored in English)
 DEFAULT_LOCALE = "en"
 
+# The fields of a card dict (CardResponse's); list endpoints can ask for a
+# subset (`fields=`) and skip the work behind the ones left out
+CARD_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "category",
+    "spice_level",
+    "difficulty_level",
+    "credit_value",
+    "is_challenge",
+    "question_type",
+    "question_params",
+    "tags",
+    "source",
+    "status",
+    "is_enabled",
+    "created_by_user_id",
+    "created_at",
+    "user_preference",
+    "partner_preference",
+    "tags_list",
+    "groupings_list",
+)
+TEXT_FIELDS = frozenset({"title", "description"})
+
 
 class CardService:
     """Card operations and preference voting."""
@@ -30,11 +62,14 @@ class CardService:
         if not locale or locale == DEFAULT_LOCALE:
             return card.title, card.description
 
-        # Look for translation
-        translation = db.query(CardTranslation).filter(
-            CardTranslation.card_id == card.id,
-            CardTranslation.locale == locale,
-        ).first()
+        # Look for translation (in memory if the list query eager-loaded them)
+        if "translations" in card.__dict__:
+            translation = next((t for t in card.translations if t.locale == locale), None)
+        else:
+            translation = db.query(CardTranslation).filter(
+                CardTranslation.card_id == card.id,
+                CardTranslation.locale == locale,
+            ).first()
 
         if translation:
             return translation.title, translation.description or card.description
@@ -51,9 +86,21 @@ class CardService:
         partner_vote: PreferenceVote | None = None,
         include_tags_list: bool = False,
         include_groupings_list: bool = False,
+        tags_by_slug: dict[str, Tag] | None = None,
+        fields: Collection[str] | None = None,
     ) -> dict:
-        """Build a card response dict with optional translations and votes."""
-        title, description = CardService._get_translated_text(db, card, locale)
+        """
+        Build a card response dict with optional translations and votes.
+        Pass `tags_by_slug` (see _load_tags) when building many cards.
+        The dict has exactly CardResponse's fields, so list endpoints can
+        serialize it without validating it again; with `fields` it has only
+        those, and translations, tags and groupings are only resolved if asked.
+        """
+        wanted = CARD_FIELDS if fields is None else fields
+        if TEXT_FIELDS.intersection(wanted):
+            title, description = CardService._get_translated_text(db, card, locale)
+        else:
+            title = description = None
         card_dict = {
             "id": card.id,
             "title": title,
@@ -73,13 +120,45 @@ class CardService:
             "created_at": card.created_at,
             "user_preference": user_vote.preference if user_vote else None,
             "partner_preference": partner_vote.preference if partner_vote else None,
+            "tags_list": (
+                CardService._get_card_tags(db, card.id, card, tags_by_slug)
+                if include_tags_list and "tags_list" in wanted else []
+            ),
+            "groupings_list": (
+                CardService._get_card_groupings(db, card.id, card)
+                if include_groupings_list and "groupings_list" in wanted else []
+            ),
         }
-        if include_tags_list:
-            card_dict["tags_list"] = CardService._get_card_tags(db, card.id, card)
-        if include_groupings_list:
-            card_dict["groupings_list"] = CardService._get_card_groupings(db, card.id, card)
+        if fields is not None:
+            card_dict = {name: value for name, value in card_dict.items() if name in fields}
         return card_dict
 
+    @staticmethod
+    def _list_load_options(
+        locale: str | None, fields: Collection[str] | None = None
+    ) -> list:
+        """Eager loads for card lists, so building each card dict runs no queries."""
+        wanted = CARD_FIELDS if fields is None else fields
+        options = []
+        if "groupings_list" in wanted:
+            options.append(selectinload(Card.groupings))
+        if locale and locale != DEFAULT_LOCALE and TEXT_FIELDS.intersection(wanted):
+            options.append(selectinload(Card.translations))
+        return options
+
+    @staticmethod
+    def _get_votes_by_card(
+        db: Session, user_id: int, card_ids: list[int]
+    ) -> dict[int, PreferenceVote]:
+        """A user's votes on the given cards, keyed by card ID."""
+        if not card_ids:
+            return {}
+        votes = db.query(PreferenceVote).filter(
+            PreferenceVote.user_id == user_id,
+            PreferenceVote.card_id.in_(card_ids),
+        ).all()
+        return {vote.card_id: vote for vote in votes}
+
     @staticmethod
     def get_cards(
         db: Session,
@@ -172,6 +251,7 @@ class CardService:
             )
             db.add(vote)
 
+        CardService._publish_vote(db, user_id, card_id, preference.value)
         db.commit()
         db.refresh(vote)
         return vote
@@ -188,9 +268,24 @@ class CardService:
         if not vote:
             return False
         db.delete(vote)
+        CardService._publish_vote(db, user_id, card_id, None)
         db.commit()
         return True
 
+    @staticmethod
+    def _publish_vote(
+        db: Session, user_id: int, card_id: int, preference: str | None
+    ) -> None:
+        """Notify the voter's partner of a vote change once it is committed."""
+        voter = context_cache.get_user(db, user_id)
+        if voter and voter.partner_id:
+            publish_after_commit(
+                db,
+                [voter.partner_id],
+                "vote",
+                {"user_id": user_id, "card_id": card_id, "preference": preference},
+            )
+
     @staticmethod
     def get_user_vote(
         db: Session, user_id: int, card_id: int
@@ -243,38 +338,64 @@ class CardService:
         return query
 
     @staticmethod
-    def _get_card_tags(db: Session, card_id: int, card: Card | None = None) -> list[dict]:
-        """Get all tags for a card by parsing JSON and looking up in tags table."""
-        import json
+    def _get_tag_slugs(card: Card) -> list[str]:
+        """Tag slugs (tags + intensity) from a card's JSON tags field."""
+        return CardService._parse_tag_slugs(card.tags)
 
-        # Get card if not provided
-        if card is None:
-            card = db.query(Card).filter(Card.id == card_id).first()
-        if not card or not card.tags:
+    @staticmethod
+    def _parse_tag_slugs(tags: str | None) -> list[str]:
+        """Tag slugs (tags + intensity) from a JSON tags value."""
+        if not tags:
             return []
-
-        # Parse the JSON tags field
         try:
-            tags_data = json.loads(card.tags)
+            tags_data = json.loads(tags)
         except json.JSONDecodeError:
             return []
 
-        # Get all tag slugs (tags + intensity)
         slugs = tags_data.get("tags", [])
         intensity = tags_data.get("intensity")
         if intensity and intensity not in slugs:
             slugs.append(intensity)
+        return slugs
+
+    @staticmethod
+    def _load_tags(db: Session, cards: list[Card]) -> dict[str, Tag]:
+        """Tags used by any of the cards, keyed by slug, in a single query."""
+        slugs = {slug for card in cards for slug in CardService._get_tag_slugs(card)}
+        if not slugs:
+            return {}
+        return {tag.slug: tag for tag in db.query(Tag).filter(Tag.slug.in_(slugs)).all()}
+
+    @staticmethod
+    def _get_card_tags(
+        db: Session,
+        card_id: int,
+        card: Card | None = None,
+        tags_by_slug: dict[str, Tag] | None = None,
+    ) -> list[dict]:
+        """Get all tags for a card by parsing JSON and looking up in tags table."""
+        # Get card if not provided
+        if card is None:
+            card = db.query(Card).filter(Card.id == card_id).first()
+        if not card:
+            return []
 
+        slugs = CardService._get_tag_slugs(card)
         if not slugs:
             return []
 
-        # Lookup tags in database
-        tags = db.query(Tag).filter(Tag.slug.in_(slugs)).all()
+        # Lookup tags in database (or in the preloaded tags)
+        if tags_by_slug is not None:
+            tags = [tags_by_slug[slug] for slug in slugs if slug in tags_by_slug]
+        else:
+            tags = db.query(Tag).filter(Tag.slug.in_(slugs)).all()
         return [
             {
                 "id": tag.id,
                 "slug": tag.slug,
                 "name": tag.name,
+                "name_en": tag.name_en,
+                "name_es": tag.name_es,
                 "tag_type": tag.tag_type,
                 "parent_slug": tag.parent_slug,
                 "display_order": tag.display_order,
@@ -319,11 +440,54 @@ class CardService:
         unvoted_only: bool = False,
         voted_only: bool = False,
         locale: str | None = None,
+        fields: Collection[str] | None = None,
+        seed: int | None = None,
     ) -> tuple[list[dict], int]:
-        """Get cards with both users' preferences included."""
-        # Fetch user and partner for placeholder replacement
-        user = db.query(User).filter(User.id == user_id).first()
-        partner = db.query(User).filter(User.id == partner_id).first()
+        """
+        Get cards with both users' preferences included, shuffled (repeatably
+        with `seed`). Pages come from feed_cache when possible, so treat the
+        card dicts as read-only.
+        """
+        page_args = (
+            user_id, partner_id, category, grouping_slug, grouping_id, is_challenge,
+            tuple(tags or ()), tuple(exclude_tags or ()), limit, offset,
+            unvoted_only, voted_only, locale,
+            frozenset(fields) if fields is not None else None,
+        )
+        cards, total = feed_cache.get_or_compute(
+            user_id, partner_id, page_args,
+            lambda: CardService._compute_feed_page(db, *page_args),
+        )
+
+        # Shuffle cards for variety
+        cards = list(cards)
+        (random.Random(seed) if seed is not None else random).shuffle(cards)
+        return cards, total
+
+    @staticmethod
+    def _compute_feed_page(
+        db: Session,
+        user_id: int,
+        partner_id: int,
+        category: CardCategory | None,
+        grouping_slug: str | None,
+        grouping_id: int | None,
+        is_challenge: bool | None,
+        tags: tuple[str, ...],
+        exclude_tags: tuple[str, ...],
+        limit: int,
+        offset: int,
+        unvoted_only: bool,
+        voted_only: bool,
+        locale: str | None,
+        fields: frozenset[str] | None,
+    ) -> tuple[tuple[dict, ...], int]:
+        """One page of get_cards_with_preferences, unshuffled."""
+        wanted = CARD_FIELDS if fields is None else fields
+        # User and partner for placeholder replacement
+        replace_text = bool(TEXT_FIELDS.intersection(wanted))
+        if replace_text:
+            user, partner = context_cache.get_couple(db, user_id, partner_id)
 
         # Build base query - only enabled and active cards
         query = db.query(Card).filter(
@@ -352,31 +516,106 @@ class CardService:
             query = query.filter(Card.id.in_(voted_card_ids))
 
         total = query.count()
-        cards = query.order_by(Card.created_at.desc()).offset(offset).limit(limit).all()
+        cards = (
+            query.options(*CardService._list_load_options(locale, fields))
+            .order_by(Card.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
 
-        # Shuffle cards for variety
-        cards = list(cards)
-        random.shuffle(cards)
+        # Votes and tags for the whole page in one query each
+        card_ids = [card.id for card in cards]
+        user_votes = (
+            CardService._get_votes_by_card(db, user_id, card_ids)
+            if not unvoted_only and "user_preference" in wanted else {}
+        )
+        partner_votes = (
+            CardService._get_votes_by_card(db, partner_id, card_ids)
+            if "partner_preference" in wanted else {}
+        )
+        tags_by_slug = CardService._load_tags(db, cards) if "tags_list" in wanted else {}
 
         result = []
         for card in cards:
-            user_vote = CardService.get_user_vote(db, user_id, card.id) if not unvoted_only else None
-            partner_vote = CardService.get_user_vote(db, partner_id, card.id)
-
             card_dict = CardService._build_card_dict(
                 db,
                 card,
                 locale=locale,
-                user_vote=user_vote,
-                partner_vote=partner_vote,
+                user_vote=user_votes.get(card.id),
+                partner_vote=partner_votes.get(card.id),
                 include_tags_list=True,
                 include_groupings_list=True,
+                tags_by_slug=tags_by_slug,
+                fields=fields,
             )
-            # Replace placeholders with actual names
-            card_dict = replace_placeholders_in_card(card_dict, user, partner)
+            if replace_text:
+                # Replace placeholders with actual names
+                card_dict = replace_placeholders_in_card(card_dict, user, partner)
             result.append(card_dict)
 
-        return result, total
+        return tuple(result), total
+
+    @staticmethod
+    def get_grouping_progress(db: Session, user_id: int, partner_id: int) -> list[dict]:
+        """
+        Per grouping: playable cards, how many each partner voted on and how
+        many both liked. Cached with the couple's decks (see feed_cache).
+        """
+        return list(feed_cache.get_or_compute(
+            user_id, partner_id, ("grouping_progress", user_id, partner_id),
+            lambda: CardService._compute_grouping_progress(db, user_id, partner_id),
+        ))
+
+    @staticmethod
+    def _compute_grouping_progress(db: Session, user_id: int, partner_id: int) -> tuple:
+        """One grouped aggregate over card_groupings and both users' votes."""
+        my_vote = aliased(PreferenceVote)
+        partner_vote = aliased(PreferenceVote)
+        both_like = and_(
+            my_vote.preference == PreferenceType.LIKE,
+            partner_vote.preference == PreferenceType.LIKE,
+        )
+        rows = (
+            db.query(
+                Grouping.id,
+                Grouping.slug,
+                Grouping.name,
+                func.count(distinct(Card.id)),
+                func.count(distinct(my_vote.card_id)),
+                func.count(distinct(partner_vote.card_id)),
+                func.count(distinct(case((both_like, Card.id)))),
+            )
+            .outerjoin(card_groupings, card_groupings.c.grouping_id == Grouping.id)
+            .outerjoin(
+                Card,
+                and_(
+                    Card.id == card_groupings.c.card_id,
+                    Card.status == CardStatus.ACTIVE,
+                    Card.is_enabled == True,
+                ),
+            )
+            .outerjoin(my_vote, and_(my_vote.card_id == Card.id, my_vote.user_id == user_id))
+            .outerjoin(
+                partner_vote,
+                and_(partner_vote.card_id == Card.id, partner_vote.user_id == partner_id),
+            )
+            .group_by(Grouping.id, Grouping.slug, Grouping.name, Grouping.display_order)
+            .order_by(Grouping.display_order, Grouping.name)
+            .all()
+        )
+        return tuple(
+            {
+                "grouping_id": grouping_id,
+                "slug": slug,
+                "name": name,
+                "total": total,
+                "voted_by_me": voted_by_me,
+                "voted_by_partner": voted_by_partner,
+                "mutual_likes": mutual_likes,
+            }
+            for grouping_id, slug, name, total, voted_by_me, voted_by_partner, mutual_likes in rows
+        )
 
     @staticmethod
     def get_liked_by_both(
@@ -396,7 +635,7 @@ class CardService:
             PreferenceVote.preference == PreferenceType.LIKE,
         ).subquery()
 
-        cards = db.query(Card).filter(
+        cards = db.query(Card).options(*CardService._list_load_options(locale)).filter(
             Card.id.in_(user1_likes),
             Card.id.in_(user2_likes),
             Card.status == CardStatus.ACTIVE,
@@ -424,15 +663,18 @@ class CardService:
         user_id: int,
         partner_id: int,
         locale: str | None = None,
+        fields: Collection[str] | None = None,
     ) -> dict[str, list[dict]]:
         """
         Get cards where both users have voted, grouped by partner's preference.
         Returns dict with keys: like, maybe, dislike, neutral
         Each card includes both partner's preference and user's own preference.
         """
-        # Fetch user and partner for placeholder replacement
-        user = db.query(User).filter(User.id == user_id).first()
-        partner = db.query(User).filter(User.id == partner_id).first()
+        wanted = CARD_FIELDS if fields is None else fields
+        # User and partner for placeholder replacement
+        replace_text = bool(TEXT_FIELDS.intersection(wanted))
+        if replace_text:
+            user, partner = context_cache.get_couple(db, user_id, partner_id)
 
         # Get all cards where BOTH users have voted
         user_votes = db.query(PreferenceVote.card_id).filter(
@@ -452,30 +694,45 @@ class CardService:
             "neutral": [],
         }
 
-        for partner_vote in partner_votes:
-            card = db.query(Card).filter(
-                Card.id == partner_vote.card_id,
+        # Load the cards, the user's own votes and their tags in one query each
+        card_ids = [vote.card_id for vote in partner_votes]
+        cards = {
+            card.id: card
+            for card in db.query(Card).options(
+                *CardService._list_load_options(locale, fields)
+            ).filter(
+                Card.id.in_(card_ids),
                 Card.status == CardStatus.ACTIVE,
                 Card.is_enabled == True,
-            ).first()
+            ).all()
+        } if card_ids else {}
+        user_votes = (
+            CardService._get_votes_by_card(db, user_id, list(cards))
+            if "user_preference" in wanted else {}
+        )
+        tags_by_slug = (
+            CardService._load_tags(db, list(cards.values())) if "tags_list" in wanted else {}
+        )
 
+        for partner_vote in partner_votes:
+            card = cards.get(partner_vote.card_id)
             if not card:
                 continue
 
-            # Get user's own vote on this card
-            user_vote = CardService.get_user_vote(db, user_id, card.id)
-
             card_dict = CardService._build_card_dict(
                 db,
                 card,
                 locale=locale,
-                user_vote=user_vote,
+                user_vote=user_votes.get(card.id),
                 partner_vote=partner_vote,
                 include_tags_list=True,
                 include_groupings_list=True,
+                tags_by_slug=tags_by_slug,
+                fields=fields,
             )
-            # Replace placeholders with actual names
-            card_dict = replace_placeholders_in_card(card_dict, user, partner)
+            if replace_text:
+                # Replace placeholders with actual names
+                card_dict = replace_placeholders_in_card(card_dict, user, partner)
 
             # Add to appropriate group based on partner's preference
             pref_key = partner_vote.preference.value  # like, maybe, dislike, neutral
@@ -501,6 +758,7 @@ class CardService:
         offset: int = 0,
         include_disabled: bool = True,
         locale: str | None = None,
+        fields: Collection[str] | None = None,
     ) -> tuple[list[dict], int]:
         """Get all cards for admin management, including disabled ones."""
         query = db.query(Card).filter(Card.status == CardStatus.ACTIVE)
@@ -509,7 +767,17 @@ class CardService:
             query = query.filter(Card.is_enabled == True)
 
         total = query.count()
-        cards = query.order_by(Card.id.asc()).offset(offset).limit(limit).all()
+        cards = (
+            query.options(*CardService._list_load_options(locale, fields))
+            .order_by(Card.id.asc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        tags_by_slug = (
+            CardService._load_tags(db, cards)
+            if fields is None or "tags_list" in fields else {}
+        )
 
         result = []
         for card in cards:
@@ -519,6 +787,8 @@ class CardService:
                 locale=locale,
                 include_tags_list=True,
                 include_groupings_list=True,
+                tags_by_slug=tags_by_slug,
+                fields=fields,
             )
             result.append(card_dict)
 
@@ -531,6 +801,7 @@ class CardService:
             {"is_enabled": enabled},
             synchronize_session=False
         )
+        mark_changed(db)
         db.commit()
         return updated
 
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.models.credit import CreditBalance, CreditLedger, LedgerType
 from app.models.user import User
+from app.events import publish_after_commit
 from app.config import CURRENCY_NAME
 
 
@@ -19,7 +20,7 @@ class CreditService:
         return balance.balance if balance else 0
 
     @staticmethod
-    def get_or_create_balance(db: Session, user_id: int) -> CreditBalance:
+    def get_or_create_balance(db: Session, user_id: int, commit: bool = True) -> CreditBalance:
         """Get or create balance record for user."""
         balance = db.query(CreditBalance).filter(
             CreditBalance.user_id == user_id
@@ -27,8 +28,11 @@ class CreditService:
         if not balance:
             balance = CreditBalance(user_id=user_id, balance=0)
             db.add(balance)
-            db.commit()
-            db.refresh(balance)
+            if commit:
+                db.commit()
+                db.refresh(balance)
+            else:
+                db.flush()
         return balance
 
     @staticmethod
@@ -40,8 +44,13 @@ class CreditService:
         period_id: int | None = None,
         proposal_id: int | None = None,
         note: str | None = None,
+        commit: bool = True,
     ) -> CreditLedger:
-        """Add a ledger entry and update balance atomically."""
+        """
+        Add a ledger entry and update balance atomically.
+        With commit=False the entry is only flushed, so callers can include it
+        in a larger transaction.
+        """
         # Create ledger entry
         entry = CreditLedger(
             user_id=user_id,
@@ -53,12 +62,32 @@ class CreditService:
         )
         db.add(entry)
 
-        # Update balance
-        balance = CreditService.get_or_create_balance(db, user_id)
-        balance.balance += amount
+        # Update balance in SQL so concurrent writers can't lose an update
+        CreditService.get_or_create_balance(db, user_id, commit=commit)
+        db.query(CreditBalance).filter(CreditBalance.user_id == user_id).update(
+            {CreditBalance.balance: CreditBalance.balance + amount}
+        )
+        db.flush()
+        publish_after_commit(
+            db,
+            [user_id],
+            "balance",
+            {
+                "user_id": user_id,
+                "balance": db.query(CreditBalance.balance)
+                .filter(CreditBalance.user_id == user_id)
+                .scalar(),
+                "amount": amount,
+                "type": ledger_type.value,
+                "ledger_id": entry.id,
+            },
+        )
 
-        db.commit()
-        db.refresh(entry)
+        if commit:
+            db.commit()
+            db.refresh(entry)
+        else:
+            db.flush()
         return entry
 
     @staticmethod
@@ -88,7 +117,7 @@ class CreditService:
 
     @staticmethod
     def deduct_proposal_cost(
-        db: Session, user_id: int, proposal_id: int, cost: int
+        db: Session, user_id: int, proposal_id: int, cost: int, commit: bool = True
     ) -> CreditLedger:
         """Deduct credits for making a proposal."""
         return CreditService.add_ledger_entry(
@@ -98,11 +127,12 @@ class CreditService:
             amount=-cost,  # Negative for deduction
             proposal_id=proposal_id,
             note="Costo de propuesta",
+            commit=commit,
         )
 
     @staticmethod
     def award_completion_reward(
-        db: Session, user_id: int, proposal_id: int, reward: int
+        db: Session, user_id: int, proposal_id: int, reward: int, commit: bool = True
     ) -> CreditLedger:
         """Award credits for completing a dare."""
         return CreditService.add_ledger_entry(
@@ -112,6 +142,22 @@ class CreditService:
             amount=reward,
             proposal_id=proposal_id,
             note="Recompensa por completar reto",
+            commit=commit,
+        )
+
+    @staticmethod
+    def refund_proposal_cost(
+        db: Session, user_id: int, proposal_id: int, cost: int, commit: bool = True
+    ) -> CreditLedger:
+        """Give back the credits deducted when a proposal was accepted."""
+        return CreditService.add_ledger_entry(
+            db=db,
+            user_id=user_id,
+            ledger_type=LedgerType.PROPOSAL_REFUND,
+            amount=cost,
+            proposal_id=proposal_id,
+            note="Reembolso de propuesta expirada",
+            commit=commit,
         )
 
     @staticmethod
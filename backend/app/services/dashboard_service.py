@@ -0,0 +1,107 @@
+"""Dashboard Service - Everything the Home page shows, in one pass."""
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session, aliased
+
+from app.context_cache import context_cache
+from app.models.card import Card, CardStatus, PreferenceType, PreferenceVote
+from app.models.grouping import Grouping, card_groupings
+from app.models.proposal import Proposal, ProposalStatus
+from app.services.credit_service import CreditService
+
+
+class DashboardService:
+    """Aggregates for the Home page, one grouped query per section."""
+
+    @staticmethod
+    def get_dashboard(db: Session, user_id: int) -> dict | None:
+        """
+        User, partner and active period (from context_cache), balance,
+        proposal counts, unvoted card counts and mutual likes.
+        Returns None if the user doesn't exist.
+        """
+        user = context_cache.get_user(db, user_id)
+        if not user:
+            return None
+        partner = context_cache.get_user(db, user.partner_id)
+        period = context_cache.get_active_period(db)
+
+        sent, received = DashboardService._proposal_counts(
+            db, user_id, period.id if period else None
+        )
+        unvoted_total, unvoted_by_grouping = DashboardService._unvoted_counts(db, user_id)
+        return {
+            "user": user,
+            "partner": partner,
+            "period": period,
+            "balance": CreditService.get_balance(db, user_id),
+            "proposals_sent": sent,
+            "proposals_received": received,
+            "unvoted_total": unvoted_total,
+            "unvoted_by_grouping": unvoted_by_grouping,
+            "mutual_likes": (
+                DashboardService._mutual_likes(db, user_id, partner.id) if partner else 0
+            ),
+        }
+
+    @staticmethod
+    def _proposal_counts(
+        db: Session, user_id: int, period_id: int | None
+    ) -> tuple[dict[str, int], dict[str, int]]:
+        """Sent and received proposals by status (in the active period, if any)."""
+        is_received = (Proposal.proposed_to_user_id == user_id).label("is_received")
+        query = db.query(Proposal.status, is_received, func.count(Proposal.id)).filter(
+            or_(Proposal.proposed_by_user_id == user_id, Proposal.proposed_to_user_id == user_id)
+        )
+        if period_id is not None:
+            query = query.filter(Proposal.period_id == period_id)
+
+        sent = {status.value: 0 for status in ProposalStatus}
+        received = dict(sent)
+        for status, was_received, count in query.group_by(Proposal.status, is_received):
+            (received if was_received else sent)[status.value] += count
+        return sent, received
+
+    @staticmethod
+    def _unvoted_counts(db: Session, user_id: int) -> tuple[int, list[dict]]:
+        """Playable cards the user hasn't voted on: in total and per grouping."""
+        voted = db.query(PreferenceVote.card_id).filter(
+            PreferenceVote.user_id == user_id
+        ).scalar_subquery()
+        playable = and_(
+            Card.status == CardStatus.ACTIVE,
+            Card.is_enabled == True,
+            Card.id.not_in(voted),
+        )
+
+        total = db.query(func.count(Card.id)).filter(playable).scalar()
+        rows = (
+            db.query(Grouping.id, Grouping.slug, Grouping.name, func.count(Card.id))
+            .outerjoin(card_groupings, card_groupings.c.grouping_id == Grouping.id)
+            .outerjoin(Card, and_(Card.id == card_groupings.c.card_id, playable))
+            .group_by(Grouping.id, Grouping.slug, Grouping.name, Grouping.display_order)
+            .order_by(Grouping.display_order, Grouping.name)
+            .all()
+        )
+        return total, [
+            {"grouping_id": grouping_id, "slug": slug, "name": name, "unvoted": count}
+            for grouping_id, slug, name, count in rows
+        ]
+
+    @staticmethod
+    def _mutual_likes(db: Session, user_id: int, partner_id: int) -> int:
+        """Playable cards both users liked (as counted by grouping progress and suggestions)."""
+        partner_vote = aliased(PreferenceVote)
+        return db.query(func.count(PreferenceVote.id)).join(
+            partner_vote,
+            and_(
+                partner_vote.card_id == PreferenceVote.card_id,
+                partner_vote.user_id == partner_id,
+                partner_vote.preference == PreferenceType.LIKE,
+            ),
+        ).join(Card, Card.id == PreferenceVote.card_id).filter(
+            PreferenceVote.user_id == user_id,
+            PreferenceVote.preference == PreferenceType.LIKE,
+            Card.status == CardStatus.ACTIVE,
+            Card.is_enabled == True,
+        ).scalar()
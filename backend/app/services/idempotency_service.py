@@ -0,0 +1,129 @@
+"""Idempotency Service - Reserve, store and replay responses by Idempotency-Key."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyError(Exception):
+    """The key was already used for a different request."""
+    pass
+
+
+class IdempotencyConflictError(IdempotencyError):
+    """A request with the same key is still being processed."""
+    pass
+
+
+class IdempotencyService:
+    """
+    A key is reserved (committed) before the request runs, so a concurrent
+    retry sees it and doesn't run the same operation twice. Once the request
+    succeeds its response is stored and later retries get it back.
+    Keys are scoped per user: the same key from two users never collides.
+
+    A reservation whose request never finished (the process died between the
+    reservation and the stored response) is reclaimed after a short lease,
+    so retries don't get 409 until the key expires. Proposal transitions are
+    guarded by their version check, so a retry of one that did commit gets
+    a 400/409 rather than applying it twice.
+    """
+
+    MAX_KEY_LENGTH = 64
+    # user_id of keys for requests not made on behalf of a user
+    NO_USER = 0
+
+    @staticmethod
+    def _cutoff(ttl_hours: int = 0, seconds: int = 0) -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            hours=ttl_hours, seconds=seconds
+        )
+
+    @staticmethod
+    def _lookup(db: Session, user_id: int, key: str):
+        return db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+        )
+
+    @staticmethod
+    def reserve(
+        db: Session,
+        user_id: int,
+        key: str,
+        fingerprint: str,
+        ttl_hours: int,
+        lease_seconds: int,
+    ) -> IdempotencyKey | None:
+        """
+        Reserve a user's key for a request.
+        Returns None when the key is new (the caller runs the request), or the
+        stored record when the same request already completed.
+        """
+        db.add(IdempotencyKey(user_id=user_id, key=key, fingerprint=fingerprint))
+        try:
+            db.commit()
+            return None
+        except IntegrityError:
+            db.rollback()
+
+        existing = IdempotencyService._lookup(db, user_id, key).first()
+        if existing is None:
+            # Released by its request meanwhile (or the insert failed for
+            # another reason): let the client retry rather than looping here
+            raise IdempotencyConflictError("Hay una solicitud con esta Idempotency-Key en proceso")
+        if existing.created_at < IdempotencyService._cutoff(ttl_hours=ttl_hours) or (
+            existing.status_code is None
+            and existing.created_at < IdempotencyService._cutoff(seconds=lease_seconds)
+        ):
+            # Expired or abandoned: start over with a fresh reservation
+            db.delete(existing)
+            db.commit()
+            return IdempotencyService.reserve(
+                db, user_id, key, fingerprint, ttl_hours, lease_seconds
+            )
+
+        if existing.fingerprint != fingerprint:
+            raise IdempotencyError("Idempotency-Key ya usada con otra solicitud")
+        if existing.status_code is None:
+            raise IdempotencyConflictError("Hay una solicitud con esta Idempotency-Key en proceso")
+        return existing
+
+    @staticmethod
+    def complete(
+        db: Session, user_id: int, key: str, status_code: int, response_body: str
+    ) -> None:
+        """Store the response of a reserved key."""
+        IdempotencyService._lookup(db, user_id, key).update(
+            {
+                IdempotencyKey.status_code: status_code,
+                IdempotencyKey.response_body: response_body,
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+
+    @staticmethod
+    def release(db: Session, user_id: int, key: str) -> None:
+        """Drop a reservation whose request failed, so it can be retried."""
+        db.rollback()
+        IdempotencyService._lookup(db, user_id, key).filter(
+            IdempotencyKey.status_code.is_(None),
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def purge_expired(db: Session, ttl_hours: int) -> int:
+        """Delete keys older than the TTL. Returns how many were removed."""
+        deleted = db.query(IdempotencyKey).filter(
+            IdempotencyKey.created_at < IdempotencyService._cutoff(ttl_hours=ttl_hours)
+        ).delete(synchronize_session=False)
+        db.commit()
+        if deleted:
+            logger.info("Purged %s expired idempotency keys", deleted)
+        return deleted
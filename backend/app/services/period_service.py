@@ -3,6 +3,7 @@
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 
+from app.context_cache import context_cache
 from app.models.period import Period, PeriodType, PeriodStatus
 from app.services.credit_service import CreditService
 
@@ -88,10 +89,8 @@ class PeriodService:
 
     @staticmethod
     def get_active_period(db: Session) -> Period | None:
-        """Get the currently active period."""
-        return db.query(Period).filter(
-            Period.status == PeriodStatus.ACTIVE
-        ).first()
+        """Get the currently active period (cached, see app.context_cache)."""
+        return context_cache.get_active_period(db)
 
     @staticmethod
     def get_periods(
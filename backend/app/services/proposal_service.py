@@ -1,19 +1,32 @@
 """Proposal Service - State machine and business rules."""
 
-from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+import logging
+from datetime import date, datetime, timezone
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.proposal import Proposal, ProposalStatus, ChallengeType, RewardType
 from app.models.card import Card
+from app.models.period import Period, PeriodStatus
+from app.models.user import User
+from app.events import publish_after_commit
+from app.feed_cache import invalidate_after_commit
+from app.metrics import count_writes
 from app.services.credit_service import CreditService
 from app.config import CURRENCY_NAME_LOWER
 
+logger = logging.getLogger(__name__)
+
 
 class ProposalError(Exception):
     """Custom exception for proposal errors."""
     pass
 
 
+class ProposalConflictError(ProposalError):
+    """The proposal changed between reading and writing it (lost race)."""
+    pass
+
+
 class ProposalService:
     """
     Proposal state machine and business rules.
@@ -22,6 +35,10 @@ class ProposalService:
     - proposed → accepted | maybe_later | rejected
     - accepted → completed_pending_confirmation
     - completed_pending_confirmation → completed_confirmed
+    - proposed | maybe_later | accepted → expired (sweeper, when the week is over)
+
+    Every transition is a conditional UPDATE on (status, version), so two
+    concurrent requests can't both apply it.
 
     Credit flow (new):
     - Proposing is FREE (no cost)
@@ -45,14 +62,94 @@ class ProposalService:
         },
     }
 
+    # Open statuses that go stale once their week or period is over
+    EXPIRABLE_STATUSES = (
+        ProposalStatus.PROPOSED,
+        ProposalStatus.MAYBE_LATER,
+        ProposalStatus.ACCEPTED,
+    )
+
     MAX_CREDIT_COST = 7
 
+    # Relations read by the proposal responses (card, both users and their partners)
+    LIST_LOAD_OPTIONS = (
+        selectinload(Proposal.card),
+        selectinload(Proposal.proposed_by).selectinload(User.partner),
+        selectinload(Proposal.proposed_to).selectinload(User.partner),
+    )
+
     @staticmethod
     def can_transition(from_status: ProposalStatus, to_status: ProposalStatus) -> bool:
         """Check if a status transition is valid."""
         valid = ProposalService.VALID_TRANSITIONS.get(from_status, set())
         return to_status in valid
 
+    @staticmethod
+    def _publish_status(
+        db: Session,
+        proposal_id: int,
+        proposed_by_user_id: int,
+        proposed_to_user_id: int,
+        status: ProposalStatus,
+        version: int,
+    ) -> None:
+        """Notify both users of a proposal status change once it is committed."""
+        publish_after_commit(
+            db,
+            [proposed_by_user_id, proposed_to_user_id],
+            "proposal",
+            {
+                "proposal_id": proposal_id,
+                "status": status.value,
+                "version": version,
+                "proposed_by_user_id": proposed_by_user_id,
+                "proposed_to_user_id": proposed_to_user_id,
+            },
+        )
+
+    @staticmethod
+    def _apply_transition(
+        db: Session,
+        proposal: Proposal,
+        to_status: ProposalStatus,
+        values: dict | None = None,
+    ) -> None:
+        """
+        Move a proposal to `to_status` with a conditional UPDATE on the status
+        and version that were read. If another request changed the proposal in
+        between, nothing is written and ProposalConflictError is raised.
+        The caller commits.
+        """
+        updated = db.query(Proposal).filter(
+            Proposal.id == proposal.id,
+            Proposal.status == proposal.status,
+            Proposal.version == proposal.version,
+        ).update(
+            {
+                Proposal.status: to_status,
+                Proposal.version: Proposal.version + 1,
+                **(values or {}),
+            },
+            synchronize_session=False,
+        )
+        if updated != 1:
+            db.rollback()
+            raise ProposalConflictError(
+                "La propuesta fue modificada por otra solicitud, intenta de nuevo"
+            )
+        count_writes(db, "proposal")
+        invalidate_after_commit(
+            db, (proposal.proposed_by_user_id, proposal.proposed_to_user_id)
+        )
+        ProposalService._publish_status(
+            db,
+            proposal.id,
+            proposal.proposed_by_user_id,
+            proposal.proposed_to_user_id,
+            to_status,
+            proposal.version + 1,
+        )
+
     @staticmethod
     def create_proposal(
         db: Session,
@@ -111,6 +208,15 @@ class ProposalService:
             status=ProposalStatus.PROPOSED,
         )
         db.add(proposal)
+        db.flush()
+        ProposalService._publish_status(
+            db,
+            proposal.id,
+            proposed_by_user_id,
+            proposed_to_user_id,
+            ProposalStatus.PROPOSED,
+            proposal.version,
+        )
         db.commit()
         db.refresh(proposal)
         return proposal
@@ -165,16 +271,17 @@ class ProposalService:
                     f"El proponente no tiene suficientes {CURRENCY_NAME_LOWER} ({credit_cost} requeridos)"
                 )
 
-            # Deduct credits from proposer
+        values = {Proposal.responded_at: datetime.now(timezone.utc)}
+        if response == ProposalStatus.ACCEPTED:
+            values[Proposal.credit_cost] = credit_cost
+        ProposalService._apply_transition(db, proposal, response, values)
+
+        if response == ProposalStatus.ACCEPTED:
+            # Deduct credits from proposer (same transaction as the transition)
             CreditService.deduct_proposal_cost(
-                db, proposal.proposed_by_user_id, proposal.id, credit_cost
+                db, proposal.proposed_by_user_id, proposal.id, credit_cost, commit=False
             )
 
-            # Store the credit cost
-            proposal.credit_cost = credit_cost
-
-        proposal.status = response
-        proposal.responded_at = datetime.now(timezone.utc)
         db.commit()
         db.refresh(proposal)
         return proposal
@@ -205,8 +312,12 @@ class ProposalService:
                 f"Transicion invalida: {proposal.status} → completed_pending_confirmation"
             )
 
-        proposal.status = ProposalStatus.COMPLETED_PENDING_CONFIRMATION
-        proposal.completed_requested_at = datetime.now(timezone.utc)
+        ProposalService._apply_transition(
+            db,
+            proposal,
+            ProposalStatus.COMPLETED_PENDING_CONFIRMATION,
+            {Proposal.completed_requested_at: datetime.now(timezone.utc)},
+        )
         db.commit()
         db.refresh(proposal)
         return proposal
@@ -241,12 +352,16 @@ class ProposalService:
             raise ProposalError(f"No hay costo de {CURRENCY_NAME_LOWER} establecido")
 
         # Update status
-        proposal.status = ProposalStatus.COMPLETED_CONFIRMED
-        proposal.completed_confirmed_at = datetime.now(timezone.utc)
+        ProposalService._apply_transition(
+            db,
+            proposal,
+            ProposalStatus.COMPLETED_CONFIRMED,
+            {Proposal.completed_confirmed_at: datetime.now(timezone.utc)},
+        )
 
-        # Award credits to recipient
+        # Award credits to recipient (same transaction as the transition)
         CreditService.award_completion_reward(
-            db, proposal.proposed_to_user_id, proposal.id, reward
+            db, proposal.proposed_to_user_id, proposal.id, reward, commit=False
         )
 
         db.commit()
@@ -330,7 +445,13 @@ class ProposalService:
             query = query.filter(Proposal.status == status)
 
         total = query.count()
-        proposals = query.order_by(Proposal.created_at.desc()).offset(offset).limit(limit).all()
+        proposals = (
+            query.options(*ProposalService.LIST_LOAD_OPTIONS)
+            .order_by(Proposal.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
         return proposals, total
 
     @staticmethod
@@ -348,5 +469,129 @@ class ProposalService:
         """Get all proposals for a period."""
         query = db.query(Proposal).filter(Proposal.period_id == period_id)
         total = query.count()
-        proposals = query.order_by(Proposal.created_at.desc()).offset(offset).limit(limit).all()
+        proposals = (
+            query.options(*ProposalService.LIST_LOAD_OPTIONS)
+            .order_by(Proposal.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
         return proposals, total
+
+    @staticmethod
+    def expire_stale_proposals(
+        db: Session,
+        today: date | None = None,
+        batch_size: int = 200,
+    ) -> dict:
+        """
+        Expire open proposals whose period is done or whose week has passed.
+        Accepted proposals get their credit cost refunded to the proposer.
+        Runs one bulk UPDATE per batch of periods, each batch in its own transaction.
+        """
+        today = today or date.today()
+        report = {"periods": 0, "expired": 0, "refunded": 0, "refunded_credits": 0}
+
+        # Done periods that still hold open proposals
+        done_period_ids = [
+            row.period_id
+            for row in db.query(Proposal.period_id)
+            .join(Period, Period.id == Proposal.period_id)
+            .filter(
+                Period.status == PeriodStatus.DONE,
+                Proposal.status.in_(ProposalService.EXPIRABLE_STATUSES),
+            )
+            .distinct()
+            .order_by(Proposal.period_id)
+        ]
+        for start in range(0, len(done_period_ids), batch_size):
+            ProposalService._expire_batch(
+                db, done_period_ids[start:start + batch_size], None, report
+            )
+
+        # Active periods: only the weeks that are already over
+        active_periods = db.query(Period.id, Period.start_date).filter(
+            Period.status == PeriodStatus.ACTIVE
+        ).all()
+        for period_id, start_date in active_periods:
+            weeks_elapsed = (today - start_date).days // 7
+            if weeks_elapsed >= 1:
+                ProposalService._expire_batch(db, [period_id], weeks_elapsed, report)
+
+        logger.info(
+            "Proposal expiry: periods=%(periods)s expired=%(expired)s "
+            "refunded=%(refunded)s refunded_credits=%(refunded_credits)s",
+            report,
+        )
+        return report
+
+    @staticmethod
+    def _expire_batch(
+        db: Session,
+        period_ids: list[int],
+        max_week_index: int | None,
+        report: dict,
+    ) -> None:
+        """Expire one batch of periods and refund accepted proposals in one transaction."""
+        scope = [
+            Proposal.period_id.in_(period_ids),
+            Proposal.status.in_(ProposalService.EXPIRABLE_STATUSES),
+        ]
+        if max_week_index is not None:
+            scope.append(Proposal.week_index <= max_week_index)
+
+        # Lock the rows so accepted ones can't be completed while we refund them
+        affected = (
+            db.query(
+                Proposal.id,
+                Proposal.proposed_by_user_id,
+                Proposal.proposed_to_user_id,
+                Proposal.status,
+                Proposal.version,
+                Proposal.credit_cost,
+            )
+            .filter(*scope)
+            .with_for_update()
+            .all()
+        )
+        refunds = [
+            (row.id, row.proposed_by_user_id, row.credit_cost)
+            for row in affected
+            if row.status == ProposalStatus.ACCEPTED and row.credit_cost is not None
+        ]
+
+        expired = db.query(Proposal).filter(*scope).update(
+            {
+                Proposal.status: ProposalStatus.EXPIRED,
+                Proposal.version: Proposal.version + 1,
+            },
+            synchronize_session=False,
+        )
+        count_writes(db, "proposal", expired)
+
+        for proposal_id, proposer_id, credit_cost in refunds:
+            CreditService.refund_proposal_cost(
+                db, proposer_id, proposal_id, credit_cost, commit=False
+            )
+        invalidate_after_commit(
+            db,
+            {user_id for row in affected
+             for user_id in (row.proposed_by_user_id, row.proposed_to_user_id)},
+        )
+
+        for row in affected:
+            ProposalService._publish_status(
+                db,
+                row.id,
+                row.proposed_by_user_id,
+                row.proposed_to_user_id,
+                ProposalStatus.EXPIRED,
+                row.version + 1,
+            )
+
+        db.commit()
+
+        report["periods"] += len(period_ids)
+        report["expired"] += expired
+        report["refunded"] += len(refunds)
+        report["refunded_credits"] += sum(cost for _, _, cost in refunds)
@@ -0,0 +1,206 @@
+"""Suggestion Service - Mutual-liked cards to propose, ranked by history."""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, case, or_
+from sqlalchemy.orm import Session, aliased
+
+from app.context_cache import context_cache
+from app.feed_cache import feed_cache
+from app.models.card import Card, CardStatus, PreferenceType, PreferenceVote
+from app.models.proposal import Proposal, ProposalStatus
+from app.services.card_service import CardService
+from app.utils.placeholders import replace_placeholders_in_card
+
+# Bounds on the work per request: mutual likes scored, past proposals read
+MAX_CANDIDATES = 500
+HISTORY_SIZE = 200
+
+# Score = weighted recency, tag acceptance rate and credit value (each 0..1)
+RECENCY_WEIGHT = 0.4
+ACCEPTANCE_WEIGHT = 0.4
+CREDIT_WEIGHT = 0.2
+# Days after which a mutual like's recency score halves
+RECENCY_HALF_LIFE_DAYS = 14
+MAX_CREDIT_VALUE = 10
+
+ACCEPTED_STATUSES = frozenset({
+    ProposalStatus.ACCEPTED,
+    ProposalStatus.COMPLETED_PENDING_CONFIRMATION,
+    ProposalStatus.COMPLETED_CONFIRMED,
+})
+DECIDED_STATUSES = ACCEPTED_STATUSES | {
+    ProposalStatus.REJECTED,
+    ProposalStatus.MAYBE_LATER,
+    ProposalStatus.EXPIRED,
+}
+
+
+class SuggestionService:
+    """Rank a couple's mutual likes as proposal suggestions."""
+
+    @staticmethod
+    def get_suggestions(
+        db: Session,
+        user_id: int,
+        partner_id: int,
+        locale: str | None = None,
+        limit: int = 10,
+    ) -> list[dict]:
+        """
+        Mutual-liked cards not yet proposed in the active period, best first.
+        Cached per couple until one of them votes or a proposal between them
+        changes (see feed_cache).
+        """
+        period = context_cache.get_active_period(db)
+        period_id = period.id if period else None
+        return list(feed_cache.get_or_compute(
+            user_id, partner_id, ("suggestions", user_id, partner_id, period_id, locale, limit),
+            lambda: SuggestionService._compute_suggestions(
+                db, user_id, partner_id, period_id, locale, limit
+            ),
+        ))
+
+    @staticmethod
+    def _compute_suggestions(
+        db: Session,
+        user_id: int,
+        partner_id: int,
+        period_id: int | None,
+        locale: str | None,
+        limit: int,
+    ) -> tuple[dict, ...]:
+        candidates = SuggestionService._mutual_likes(db, user_id, partner_id, period_id)
+        if not candidates:
+            return ()
+        rates = SuggestionService._tag_acceptance_rates(db, user_id, partner_id)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        scored = []
+        for card_id, tags, credit_value, liked_at in candidates:
+            slugs = CardService._parse_tag_slugs(tags)
+            days = max((now - liked_at).total_seconds() / 86400, 0)
+            recency = 0.5 ** (days / RECENCY_HALF_LIFE_DAYS)
+            acceptance = (
+                sum(rates.get(slug, 0.5) for slug in slugs) / len(slugs) if slugs else 0.5
+            )
+            credit = min(credit_value or 0, MAX_CREDIT_VALUE) / MAX_CREDIT_VALUE
+            score = (
+                RECENCY_WEIGHT * recency
+                + ACCEPTANCE_WEIGHT * acceptance
+                + CREDIT_WEIGHT * credit
+            )
+            scored.append((score, liked_at, card_id, acceptance))
+        scored.sort(key=lambda item: (-item[0], -item[1].timestamp(), item[2]))
+        top = scored[:limit]
+
+        # Card dicts only for the cards returned
+        cards = {
+            card.id: card
+            for card in db.query(Card)
+            .options(*CardService._list_load_options(locale))
+            .filter(Card.id.in_([card_id for _, _, card_id, _ in top]))
+        }
+        tags_by_slug = CardService._load_tags(db, list(cards.values()))
+        user, partner = context_cache.get_couple(db, user_id, partner_id)
+        return tuple(
+            {
+                "card": replace_placeholders_in_card(
+                    CardService._build_card_dict(
+                        db,
+                        cards[card_id],
+                        locale=locale,
+                        include_tags_list=True,
+                        include_groupings_list=True,
+                        tags_by_slug=tags_by_slug,
+                    ),
+                    user,
+                    partner,
+                ),
+                "score": round(score, 4),
+                "liked_at": liked_at,
+                "tag_acceptance_rate": round(acceptance, 4),
+            }
+            for score, liked_at, card_id, acceptance in top
+        )
+
+    @staticmethod
+    def _mutual_likes(
+        db: Session, user_id: int, partner_id: int, period_id: int | None
+    ) -> list[tuple]:
+        """
+        (card_id, tags, credit_value, liked_at) of playable cards both liked,
+        minus those already proposed between them in the period. At most
+        MAX_CANDIDATES, the most recent mutual likes (liked_at being the
+        later of the two votes, as in the recency score).
+        """
+        my_vote = aliased(PreferenceVote)
+        partner_vote = aliased(PreferenceVote)
+        liked_at = case(
+            (my_vote.updated_at > partner_vote.updated_at, my_vote.updated_at),
+            else_=partner_vote.updated_at,
+        )
+        query = (
+            db.query(Card.id, Card.tags, Card.credit_value, liked_at)
+            .join(my_vote, and_(
+                my_vote.card_id == Card.id,
+                my_vote.user_id == user_id,
+                my_vote.preference == PreferenceType.LIKE,
+            ))
+            .join(partner_vote, and_(
+                partner_vote.card_id == Card.id,
+                partner_vote.user_id == partner_id,
+                partner_vote.preference == PreferenceType.LIKE,
+            ))
+            .filter(Card.status == CardStatus.ACTIVE, Card.is_enabled == True)
+        )
+        if period_id is not None:
+            proposed = db.query(Proposal.card_id).filter(
+                Proposal.period_id == period_id,
+                Proposal.card_id.isnot(None),
+                SuggestionService._between(user_id, partner_id),
+            )
+            query = query.filter(Card.id.not_in(proposed))
+
+        return [
+            tuple(row)
+            for row in query.order_by(liked_at.desc(), Card.id).limit(MAX_CANDIDATES)
+        ]
+
+    @staticmethod
+    def _tag_acceptance_rates(db: Session, user_id: int, partner_id: int) -> dict[str, float]:
+        """
+        Share of decided card proposals between the couple that were accepted,
+        per tag, over the last HISTORY_SIZE. Smoothed towards 0.5 so a
+        single outcome doesn't dominate.
+        """
+        history = (
+            db.query(Proposal.status, Card.tags)
+            .join(Card, Card.id == Proposal.card_id)
+            .filter(
+                SuggestionService._between(user_id, partner_id),
+                Proposal.status.in_(DECIDED_STATUSES),
+            )
+            .order_by(Proposal.created_at.desc())
+            .limit(HISTORY_SIZE)
+            .all()
+        )
+        accepted: dict[str, int] = defaultdict(int)
+        decided: dict[str, int] = defaultdict(int)
+        for status, tags in history:
+            for slug in CardService._parse_tag_slugs(tags):
+                decided[slug] += 1
+                if status in ACCEPTED_STATUSES:
+                    accepted[slug] += 1
+        return {slug: (accepted[slug] + 1) / (count + 2) for slug, count in decided.items()}
+
+    @staticmethod
+    def _between(user_id: int, partner_id: int):
+        """Proposals from either partner to the other."""
+        return or_(
+            and_(Proposal.proposed_by_user_id == user_id,
+                 Proposal.proposed_to_user_id == partner_id),
+            and_(Proposal.proposed_by_user_id == partner_id,
+                 Proposal.proposed_to_user_id == user_id),
+        )
@@ -0,0 +1,91 @@
+"""Stateless session tokens signed with HMAC-SHA256.
+
+A token is `<base64url(json claims)>.<base64url(signature)>`. It is verified
+with the server secret only, so authenticated requests don't need to look up
+the user or backoffice credentials in the database.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from dataclasses import asdict, dataclass
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+ROLE_USER = "user"
+ROLE_ADMIN = "admin"
+ROLE_BACKOFFICE = "backoffice"
+
+if config.SESSION_SECRET:
+    _secret = config.SESSION_SECRET.encode("utf-8")
+else:
+    # Fine for local development only: every restart invalidates all tokens
+    # (the compose files refuse to start without SESSION_SECRET)
+    logger.error(
+        "SESSION_SECRET is not set: using a random per-process secret, so every "
+        "restart logs all users out. Set SESSION_SECRET outside local development."
+    )
+    _secret = secrets.token_bytes(32)
+
+
+@dataclass(frozen=True)
+class SessionClaims:
+    role: str
+    expires_at: int
+    user_id: int | None = None
+    partner_id: int | None = None
+    username: str | None = None
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role in (ROLE_ADMIN, ROLE_BACKOFFICE)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(_secret, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def create_session_token(
+    role: str,
+    user_id: int | None = None,
+    partner_id: int | None = None,
+    username: str | None = None,
+) -> str:
+    """Issue a signed token that expires after SESSION_TOKEN_TTL_HOURS."""
+    claims = SessionClaims(
+        role=role,
+        expires_at=int(time.time()) + config.SESSION_TOKEN_TTL_HOURS * 3600,
+        user_id=user_id,
+        partner_id=partner_id,
+        username=username,
+    )
+    payload = _b64encode(json.dumps(asdict(claims), separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_session_token(token: str) -> SessionClaims | None:
+    """Return the claims of a valid, unexpired token, or None."""
+    payload, _, signature = token.partition(".")
+    if not payload or not token.isascii() or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        claims = SessionClaims(**json.loads(_b64decode(payload)))
+    except (ValueError, TypeError):
+        return None
+    if claims.expires_at < time.time():
+        return None
+    return claims
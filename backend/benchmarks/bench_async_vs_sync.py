@@ -0,0 +1,118 @@
+"""Compare card listing throughput through the sync and async database paths.
+
+Both endpoints run the same query helper; the sync one holds a threadpool
+thread per request while the async one awaits the AsyncSession.
+
+    python benchmarks/bench_async_vs_sync.py --requests 500 --concurrency 32
+
+Uses a throwaway SQLite file unless DB_TYPE/MYSQL_* are set in the environment.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+if os.getenv("DB_TYPE", "sqlite").lower() == "sqlite" and "SQLITE_PATH" not in os.environ:
+    os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.routes_cards import _list_cards
+from app.database import SessionLocal, create_tables, dispose_async_engine, get_async_db, get_db
+from app.models.card import Card, CardCategory
+
+LIST_ARGS = dict(
+    category=None, grouping_slug=None, grouping_id=None, user_id=None, partner_id=None,
+    is_challenge=None, tags=None, exclude_tags=None, unvoted_only=False, voted_only=False,
+    locale=None, limit=50, offset=0,
+)
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/sync")
+def list_sync(db: Session = Depends(get_db)):
+    return _list_cards(db, **LIST_ARGS)
+
+
+@bench_app.get("/async")
+async def list_async(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(_list_cards, **LIST_ARGS)
+
+
+def seed(card_count: int) -> None:
+    create_tables()
+    db = SessionLocal()
+    try:
+        existing = db.query(Card).count()
+        categories = list(CardCategory)
+        db.add_all(
+            Card(
+                title=f"Bench card {i}",
+                description="Benchmark card",
+                category=categories[i % len(categories)],
+            )
+            for i in range(existing, card_count)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run(path: str, total: int, concurrency: int) -> dict:
+    latencies = []
+    queue = iter(range(total))
+    transport = httpx.ASGITransport(app=bench_app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # warm up pools
+
+        async def worker():
+            for _ in queue:
+                started = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--cards", type=int, default=200)
+    args = parser.parse_args()
+
+    seed(args.cards)
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    for path in ("/sync", "/async"):
+        result = await run(path, args.requests, args.concurrency)
+        print(
+            f"{path:7} {result['rps']:8.1f} req/s  "
+            f"p50 {result['p50']:7.1f} ms  p95 {result['p95']:7.1f} ms"
+        )
+    await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""Serialization time and bytes on the wire for a page of cards.
+
+Builds a `/api/cards` page from the generated dataset, then compares the old
+path (validate every dict into CardResponse, FastAPI's JSON encoding) with
+direct orjson serialization, and the body size raw, gzipped and brotli'd.
+
+    python benchmarks/bench_card_serialization.py --cards 200 --scale small
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ["DB_TYPE"] = "sqlite"
+os.environ.setdefault("SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "unused.db"))
+
+import orjson
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.compression import brotli
+from app.config import config
+from app.schemas.card import CardListResponse, CardResponse
+from app.services.card_service import CardService
+from datagen import cached_sqlite_dataset
+
+
+def pydantic_path(cards: list[dict], total: int) -> bytes:
+    response = CardListResponse(cards=[CardResponse(**c) for c in cards], total=total)
+    # What FastAPI does with a returned model, a response_model and the
+    # default JSONResponse: dump, validate again, serialize, json.dumps
+    validated = CardListResponse.model_validate(response.model_dump())
+    content = validated.model_dump(mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def orjson_path(cards: list[dict], total: int) -> bytes:
+    return orjson.dumps({"cards": cards, "total": total})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--scale", default="small")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{cached_sqlite_dataset(args.scale)}")
+    with Session(engine) as db:
+        cards, total = CardService.get_cards_with_preferences(
+            db, 1, 2, limit=args.cards, locale="en"
+        )
+
+    print(f"{len(cards)} cards")
+    results = {}
+    for name, func in (("pydantic + json", pydantic_path), ("orjson direct", orjson_path)):
+        seconds = min(timeit.repeat(lambda: func(cards, total), number=1, repeat=args.repeat))
+        results[name] = func(cards, total)
+        print(f"  {name:<16} {seconds * 1000:8.2f} ms")
+
+    body = results["orjson direct"]
+    print("bytes on the wire")
+    print(f"  {'raw':<16} {len(body):8d}")
+    print(f"  {'gzip':<16} {len(gzip.compress(body, config.COMPRESSION_GZIP_LEVEL)):8d}")
+    if brotli is not None:
+        compressed = brotli.compress(body, quality=config.COMPRESSION_BROTLI_QUALITY)
+        print(f"  {'brotli':<16} {len(compressed):8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Reader latency on SQLite while a writer keeps committing.
+
+Compares the old profile (one shared StaticPool connection, rollback journal)
+with the pooled WAL profile from `get_engine_args` / `get_sqlite_pragmas`.
+
+    python benchmarks/bench_sqlite_concurrency.py --readers 8 --seconds 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ["DB_TYPE"] = "sqlite"
+os.environ.setdefault("SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from app.database import get_engine_args, install_sqlite_pragmas
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS bench (id INTEGER PRIMARY KEY, payload TEXT)"
+
+
+def legacy_engine(url: str):
+    engine = create_engine(
+        url, connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA journal_mode=DELETE"))
+    return engine
+
+
+def wal_engine(url: str):
+    engine = create_engine(url, **get_engine_args())
+    install_sqlite_pragmas(engine)
+    return engine
+
+
+def run(engine, readers: int, seconds: float, batch: int) -> dict:
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+        conn.execute(text("DELETE FROM bench"))
+
+    stop = threading.Event()
+    latencies: list[float] = []
+    writes = [0]
+    errors = [0]
+    lock = threading.Lock()
+
+    def writer():
+        payload = "x" * 512
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("INSERT INTO bench (payload) VALUES (:p)"),
+                        [{"p": payload}] * batch,
+                    )
+                writes[0] += 1
+            except OperationalError:
+                errors[0] += 1
+
+    def reader():
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        text("SELECT id, payload FROM bench ORDER BY id DESC LIMIT 1")
+                    ).all()
+            except OperationalError:
+                with lock:
+                    errors[0] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=writer)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "reads": len(latencies),
+        "writes": writes[0],
+        "errors": errors[0],
+        "p50": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+        "max": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch", type=int, default=500, help="rows per write transaction")
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.environ['SQLITE_PATH']}"
+    print(f"{args.readers} readers, 1 writer ({args.batch} rows/commit), {args.seconds}s")
+    for name, factory in (("legacy", legacy_engine), ("wal", wal_engine)):
+        result = run(factory(url), args.readers, args.seconds, args.batch)
+        print(
+            f"{name:7} reads {result['reads']:7d}  writes {result['writes']:5d}  "
+            f"errors {result['errors']:3d}  read p50 {result['p50']:6.2f} ms  "
+            f"p99 {result['p99']:7.2f} ms  max {result['max']:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark fixtures: a generated SQLite dataset shared by the whole run.
+
+The dataset is generated once per scale/seed into benchmarks/.data and copied
+for each run, so benchmarks that write always start from the same rows.
+
+    BENCH_SCALE=medium python -m pytest benchmarks
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+SCALE = os.getenv("BENCH_SCALE", "small")
+SEED = int(os.getenv("BENCH_SEED", "1"))
+
+# The app binds its engine at import time, so point it at the run's copy first
+if "app.database" in sys.modules:
+    raise pytest.UsageError(
+        "benchmarks bind the app to their own database: run them on their own "
+        "(python -m pytest benchmarks)"
+    )
+_run_dir = tempfile.mkdtemp(prefix="bench-")
+os.environ["DB_TYPE"] = "sqlite"
+os.environ["SQLITE_PATH"] = os.path.join(_run_dir, "bench.db")
+# Measure the computed deck; test_cards_with_preferences_cached turns it back on
+os.environ["FEED_CACHE_MAX_ENTRIES"] = "0"
+
+from datagen import cached_sqlite_dataset  # noqa: E402
+
+TEMPLATE = cached_sqlite_dataset(SCALE, SEED)
+shutil.copyfile(TEMPLATE, os.environ["SQLITE_PATH"])
+
+from app.database import SessionLocal, engine  # noqa: E402
+
+
+def pytest_report_header(config):
+    return f"benchmark dataset: scale={SCALE} seed={SEED} ({TEMPLATE.name})"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    engine.dispose()
+    shutil.rmtree(_run_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def couple():
+    """The first generated couple (users 1 and 2)."""
+    return 1, 2
@@ -0,0 +1,377 @@
+"""Deterministic synthetic dataset for benchmarks and load tests.
+
+The same seed and scale always produce the same rows, so timings from
+different runs and machines are comparable. Rows are written with bulk
+inserts in chunks: the medium scale (~1M votes) takes about a minute on
+SQLite, the large one (100k cards, 5k couples, ~4M votes) several minutes.
+
+    python benchmarks/datagen.py --scale medium
+    python benchmarks/datagen.py --cards 20000 --couples 500 --seed 7
+
+The target database comes from the usual DB_TYPE / SQLITE_PATH / MYSQL_*
+settings. Tables are created if missing; generating into a non-empty
+database is refused.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.card import (
+    Card,
+    CardCategory,
+    CardSource,
+    CardStatus,
+    CardTranslation,
+    PreferenceType,
+    PreferenceVote,
+)
+from app.models.credit import CreditBalance, CreditLedger, LedgerType
+from app.models.grouping import Grouping, card_groupings
+from app.models.period import Period, PeriodStatus, PeriodType
+from app.models.proposal import ChallengeType, Proposal, ProposalStatus
+from app.models.tag import Tag, TagType
+from app.models.user import User
+
+# bcrypt hash of PIN "1234"; hashing once per user would dominate the run
+PIN_HASH = "$2b$12$F/1Llw4KiZG83guEWV0s8O0UHlu4ttTEzBfNmBFy31CKXue.kJidK"
+
+DATA_DIR = Path(__file__).resolve().parent / ".data"
+EPOCH = datetime(2025, 1, 1, 12, 0, 0)
+CHUNK_SIZE = 5000
+
+CATEGORY_TAGS = ["romance", "risas", "calientes", "aventura", "juegos", "conexion"]
+INTENSITY_TAGS = ["suave", "picante", "muy_picante"]
+SUBTAGS_PER_CATEGORY = 4
+GROUPINGS = 24
+PREFERENCES = [
+    (PreferenceType.LIKE, 40),
+    (PreferenceType.MAYBE, 20),
+    (PreferenceType.NEUTRAL, 25),
+    (PreferenceType.DISLIKE, 15),
+]
+PROPOSAL_STATUSES = [
+    (ProposalStatus.COMPLETED_CONFIRMED, 50),
+    (ProposalStatus.REJECTED, 15),
+    (ProposalStatus.ACCEPTED, 10),
+    (ProposalStatus.MAYBE_LATER, 10),
+    (ProposalStatus.PROPOSED, 10),
+    (ProposalStatus.COMPLETED_PENDING_CONFIRMATION, 5),
+]
+
+
+@dataclass(frozen=True)
+class Scale:
+    cards: int
+    couples: int
+    votes_per_user: int
+    proposals_per_couple: int
+    ledger_entries_per_user: int
+    periods: int = 52
+
+
+SCALES = {
+    "tiny": Scale(cards=500, couples=10, votes_per_user=200, proposals_per_couple=20,
+                  ledger_entries_per_user=30, periods=8),
+    "small": Scale(cards=2_000, couples=50, votes_per_user=500, proposals_per_couple=50,
+                   ledger_entries_per_user=100),
+    "medium": Scale(cards=10_000, couples=1_000, votes_per_user=500, proposals_per_couple=100,
+                    ledger_entries_per_user=200),
+    "large": Scale(cards=100_000, couples=5_000, votes_per_user=400, proposals_per_couple=200,
+                   ledger_entries_per_user=400),
+}
+
+
+def _weighted(rng: random.Random, choices: list[tuple]):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def _bulk_insert(db: Session, target, rows) -> int:
+    """Insert an iterable of row dicts in chunks; returns the row count."""
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            db.execute(insert(target), chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        db.execute(insert(target), chunk)
+        total += len(chunk)
+    return total
+
+
+def _tags() -> list[dict]:
+    rows = []
+    order = 0
+    for slug in CATEGORY_TAGS:
+        rows.append(dict(slug=slug, name=slug.title(), tag_type=TagType.CATEGORY.value,
+                         display_order=order))
+        order += 1
+        for i in range(SUBTAGS_PER_CATEGORY):
+            rows.append(dict(slug=f"{slug}_{i}", name=f"{slug.title()} {i}",
+                             tag_type=TagType.SUBTAG.value, parent_slug=slug,
+                             display_order=order))
+            order += 1
+    for slug in INTENSITY_TAGS:
+        rows.append(dict(slug=slug, name=slug.title(), tag_type=TagType.INTENSITY.value,
+                         display_order=order))
+        order += 1
+    return rows
+
+
+def _cards(rng: random.Random, scale: Scale):
+    categories = list(CardCategory)
+    for card_id in range(1, scale.cards + 1):
+        category_tag = rng.choice(CATEGORY_TAGS)
+        tags = [category_tag] + [
+            f"{category_tag}_{i}" for i in rng.sample(range(SUBTAGS_PER_CATEGORY), rng.randint(0, 2))
+        ]
+        yield dict(
+            id=card_id,
+            title=f"Carta {card_id} para {{partner}}",
+            description=f"Descripcion sintetica de la carta {card_id}. " * rng.randint(1, 4),
+            tags=json.dumps({"tags": tags, "intensity": rng.choice(INTENSITY_TAGS)}),
+            category=rng.choice(categories),
+            spice_level=rng.randint(1, 5),
+            difficulty_level=rng.randint(1, 5),
+            credit_value=rng.randint(1, 7),
+            is_challenge=rng.random() < 0.1,
+            source=CardSource.IMPORTED,
+            status=CardStatus.ACTIVE if rng.random() < 0.97 else CardStatus.ARCHIVED,
+            is_enabled=rng.random() < 0.95,
+            created_at=EPOCH + timedelta(minutes=card_id),
+        )
+
+
+def _translations(rng: random.Random, scale: Scale):
+    for card_id in range(1, scale.cards + 1):
+        yield dict(
+            card_id=card_id,
+            locale="en",
+            title=f"Card {card_id} for {{partner}}",
+            description=f"Synthetic description for card {card_id}.",
+            created_at=EPOCH,
+            updated_at=EPOCH,
+        )
+
+
+def _card_groupings(rng: random.Random, scale: Scale):
+    for card_id in range(1, scale.cards + 1):
+        for grouping_id in rng.sample(range(1, GROUPINGS + 1), rng.randint(0, 3)):
+            yield dict(card_id=card_id, grouping_id=grouping_id)
+
+
+def _users(scale: Scale):
+    for user_id in range(1, 2 * scale.couples + 1):
+        yield dict(id=user_id, name=f"Usuario {user_id}", nickname=f"u{user_id}",
+                   pin_hash=PIN_HASH, created_at=EPOCH)
+
+
+def _link_partners(db: Session, scale: Scale) -> None:
+    # Partners reference each other, so they are linked once both rows exist
+    rows = []
+    for couple in range(scale.couples):
+        a, b = 2 * couple + 1, 2 * couple + 2
+        rows += [dict(id=a, partner_id=b), dict(id=b, partner_id=a)]
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.execute(update(User), rows[start:start + CHUNK_SIZE])
+
+
+def _votes(rng: random.Random, scale: Scale):
+    per_user = min(scale.votes_per_user, scale.cards)
+    card_ids = range(1, scale.cards + 1)
+    for couple in range(scale.couples):
+        a, b = 2 * couple + 1, 2 * couple + 2
+        voted_a = rng.sample(card_ids, per_user)
+        # Partners overlap on most of their votes, like real couples do
+        shared = voted_a[: per_user * 3 // 4]
+        voted_b = shared + rng.sample(card_ids, per_user - len(shared))
+        for user_id, voted in ((a, voted_a), (b, set(voted_b))):
+            for card_id in voted:
+                yield dict(
+                    user_id=user_id,
+                    card_id=card_id,
+                    preference=_weighted(rng, PREFERENCES),
+                    updated_at=EPOCH + timedelta(seconds=rng.randrange(365 * 86400)),
+                )
+
+
+def _periods(scale: Scale):
+    start = EPOCH.date()
+    for i in range(scale.periods):
+        period_start = start + timedelta(weeks=i)
+        yield dict(
+            id=i + 1,
+            period_type=PeriodType.WEEK,
+            status=PeriodStatus.ACTIVE if i == scale.periods - 1 else PeriodStatus.DONE,
+            start_date=period_start,
+            end_date=period_start + timedelta(days=6),
+            created_at=EPOCH + timedelta(weeks=i),
+        )
+
+
+def _proposals(rng: random.Random, scale: Scale, proposal_history: list):
+    proposal_id = 0
+    for couple in range(scale.couples):
+        a, b = 2 * couple + 1, 2 * couple + 2
+        for _ in range(scale.proposals_per_couple):
+            proposal_id += 1
+            by_user, to_user = (a, b) if rng.random() < 0.5 else (b, a)
+            period_id = rng.randint(1, scale.periods)
+            created_at = EPOCH + timedelta(weeks=period_id - 1, minutes=rng.randrange(7 * 1440))
+            status = _weighted(rng, PROPOSAL_STATUSES)
+            accepted = status in (
+                ProposalStatus.ACCEPTED,
+                ProposalStatus.COMPLETED_PENDING_CONFIRMATION,
+                ProposalStatus.COMPLETED_CONFIRMED,
+            )
+            cost = rng.randint(1, 7) if accepted else None
+            if status == ProposalStatus.COMPLETED_CONFIRMED:
+                proposal_history.append((proposal_id, by_user, to_user, period_id, cost, created_at))
+            custom = rng.random() < 0.2
+            yield dict(
+                id=proposal_id,
+                period_id=period_id,
+                week_index=1,
+                proposed_by_user_id=by_user,
+                proposed_to_user_id=to_user,
+                card_id=None if custom else rng.randint(1, scale.cards),
+                challenge_type=ChallengeType.CUSTOM if custom else ChallengeType.SIMPLE,
+                custom_title=f"Reto {proposal_id}" if custom else None,
+                credit_cost=cost,
+                status=status,
+                version=3 if accepted else 2 if status != ProposalStatus.PROPOSED else 1,
+                created_at=created_at,
+                responded_at=created_at + timedelta(hours=2) if status != ProposalStatus.PROPOSED else None,
+                completed_confirmed_at=(
+                    created_at + timedelta(days=2)
+                    if status == ProposalStatus.COMPLETED_CONFIRMED else None
+                ),
+            )
+
+
+def _ledger(rng: random.Random, scale: Scale, proposal_history: list, balances: dict):
+    def entry(user_id, entry_type, amount, created_at, period_id=None, proposal_id=None):
+        balances[user_id] = balances.get(user_id, 0) + amount
+        return dict(user_id=user_id, period_id=period_id, proposal_id=proposal_id,
+                    type=entry_type, amount=amount, created_at=created_at)
+
+    for proposal_id, by_user, to_user, period_id, cost, created_at in proposal_history:
+        yield entry(by_user, LedgerType.PROPOSAL_COST, -cost, created_at, period_id, proposal_id)
+        yield entry(to_user, LedgerType.COMPLETION_REWARD, cost, created_at + timedelta(days=2),
+                    period_id, proposal_id)
+
+    for user_id in range(1, 2 * scale.couples + 1):
+        yield entry(user_id, LedgerType.INITIAL_GRANT, 10, EPOCH)
+        for i in range(scale.ledger_entries_per_user):
+            period_id = 1 + i % scale.periods
+            yield entry(user_id, LedgerType.WEEKLY_BASE_GRANT, 3,
+                        EPOCH + timedelta(weeks=period_id - 1, seconds=i), period_id)
+
+
+def generate(db: Session, scale: Scale, seed: int = 1, log=print) -> dict[str, int]:
+    """Fill an empty database; returns row counts per table."""
+    if db.query(Card.id).first() is not None or db.query(User.id).first() is not None:
+        raise RuntimeError("Database is not empty; refusing to generate into it")
+
+    rng = random.Random(seed)
+    counts: dict[str, int] = {}
+    proposal_history: list = []
+    balances: dict[int, int] = {}
+
+    steps = [
+        ("tags", Tag, _tags),
+        ("groupings", Grouping, lambda: (
+            dict(id=i, slug=f"grupo-{i}", name=f"Grupo {i}", display_order=i,
+                 created_at=EPOCH, updated_at=EPOCH)
+            for i in range(1, GROUPINGS + 1)
+        )),
+        ("users", User, lambda: _users(scale)),
+        ("cards", Card, lambda: _cards(rng, scale)),
+        ("card_translations", CardTranslation, lambda: _translations(rng, scale)),
+        ("card_groupings", card_groupings, lambda: _card_groupings(rng, scale)),
+        ("preference_votes", PreferenceVote, lambda: _votes(rng, scale)),
+        ("periods", Period, lambda: _periods(scale)),
+        ("proposals", Proposal, lambda: _proposals(rng, scale, proposal_history)),
+        ("credit_ledger", CreditLedger, lambda: _ledger(rng, scale, proposal_history, balances)),
+        ("credit_balances", CreditBalance, lambda: (
+            dict(user_id=user_id, balance=balance) for user_id, balance in sorted(balances.items())
+        )),
+    ]
+    for name, target, rows in steps:
+        started = time.perf_counter()
+        counts[name] = _bulk_insert(db, target, rows())
+        if target is User:
+            _link_partners(db, scale)
+        db.commit()
+        log(f"{name:>18}: {counts[name]:>9} rows in {time.perf_counter() - started:.1f}s")
+    return counts
+
+
+def cached_sqlite_dataset(scale_name: str, seed: int = 1) -> Path:
+    """Path of a generated SQLite file for this scale/seed, building it once.
+
+    Copy the file before writing to it; it is shared by later runs.
+    """
+    path = DATA_DIR / f"{scale_name}-{seed}.db"
+    if path.exists():
+        return path
+
+    DATA_DIR.mkdir(exist_ok=True)
+    partial = path.with_suffix(".partial")
+    partial.unlink(missing_ok=True)
+    engine = create_engine(f"sqlite:///{partial}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        generate(db, SCALES[scale_name], seed=seed, log=lambda line: None)
+    engine.dispose()
+    partial.rename(path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cards", type=int)
+    parser.add_argument("--couples", type=int)
+    parser.add_argument("--votes-per-user", type=int)
+    parser.add_argument("--proposals-per-couple", type=int)
+    parser.add_argument("--ledger-entries-per-user", type=int)
+    args = parser.parse_args()
+
+    overrides = {
+        field: getattr(args, field)
+        for field in ("cards", "couples", "votes_per_user", "proposals_per_couple",
+                      "ledger_entries_per_user")
+        if getattr(args, field) is not None
+    }
+    scale = replace(SCALES[args.scale], **overrides)
+
+    from app.database import SessionLocal, create_tables
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        counts = generate(db, scale, seed=args.seed)
+    finally:
+        db.close()
+    print(f"Generated {sum(counts.values())} rows ({scale})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Closed-loop load test: how many concurrent couples one backend sustains.
+
+Boots `app.main:app` under uvicorn (or targets a running instance with
+--url) and runs one virtual couple per --couples. Each couple repeats a
+journey as fast as responses come back, plus optional think time:
+
+    [login both] -> fetch deck -> swipe-vote burst -> partner votes ->
+    propose -> accept -> complete -> confirm -> both balances
+
+Couples log in on their first journey and every --login-every journeys after
+that (bcrypt makes logins the most expensive call). Roles swap every journey
+so credits stay balanced. The report shows throughput and p50/p95/p99
+latency and errors per endpoint; save it with --json and pass it to a later
+run with --compare for before/after numbers.
+
+    python benchmarks/loadtest.py --couples 50 --duration 60
+    python benchmarks/loadtest.py --db mysql --workers 4 --couples 200
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000 --couples 20
+
+With --db sqlite the dataset comes from datagen (cached per scale/seed) and
+is copied for the run. With --db mysql the MYSQL_* settings are used as-is;
+fill that database with `datagen.py` first.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PIN = "1234"
+SWIPES_PER_JOURNEY = 10
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Recorder:
+    """Latencies and errors per endpoint label."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.error_samples: dict[str, str] = {}
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.latencies[label].append(time.perf_counter() - started)
+            self.errors[label] += 1
+            self.error_samples.setdefault(label, repr(exc))
+            return None
+        self.latencies[label].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+            self.error_samples.setdefault(label, f"{response.status_code} {response.text[:120]}")
+            return None
+        return response.json() if response.content else {}
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for label in sorted(self.latencies):
+            values = sorted(self.latencies[label])
+            endpoints[label] = {
+                "requests": len(values),
+                "errors": self.errors[label],
+                "rps": len(values) / elapsed,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": values[-1] * 1000,
+            }
+        total = sum(item["requests"] for item in endpoints.values())
+        return {
+            "elapsed_s": elapsed,
+            "requests": total,
+            "errors": sum(item["errors"] for item in endpoints.values()),
+            "rps": total / elapsed if elapsed else 0.0,
+            "endpoints": endpoints,
+            "error_samples": self.error_samples,
+        }
+
+
+async def couple_journeys(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    couple_index: int,
+    period_id: int,
+    deadline: float,
+    think_time: float,
+    login_every: int,
+    rng: random.Random,
+) -> int:
+    """Repeat the journey for one couple until the deadline; returns journeys run."""
+    users = [2 * couple_index + 1, 2 * couple_index + 2]
+    tokens: dict[int, str] = {}
+    journeys = 0
+
+    async def think():
+        if think_time:
+            await asyncio.sleep(rng.uniform(0, 2 * think_time))
+
+    while time.perf_counter() < deadline:
+        me, partner = users if journeys % 2 == 0 else users[::-1]
+        if journeys % login_every == 0:
+            for user_id in users:
+                login = await recorder.call(
+                    client, "POST /api/auth/login", "POST", "/api/auth/login",
+                    json={"user_id": user_id, "pin": PIN},
+                )
+                if login:
+                    tokens[user_id] = login["token"]
+            await think()
+        headers = {"Authorization": f"Bearer {tokens[me]}"} if me in tokens else {}
+
+        deck = await recorder.call(
+            client, "GET /api/cards", "GET", "/api/cards", headers=headers,
+            params={"user_id": me, "partner_id": partner, "unvoted_only": True,
+                    "limit": 20, "offset": rng.randrange(0, 200)},
+        )
+        cards = deck["cards"] if deck else []
+        for card in cards[:SWIPES_PER_JOURNEY]:
+            await recorder.call(
+                client, "POST /api/cards/{id}/vote", "POST", f"/api/cards/{card['id']}/vote",
+                headers=headers, params={"user_id": me},
+                json={"preference": rng.choice(["like", "like", "maybe", "neutral", "dislike"])},
+            )
+        await think()
+
+        await recorder.call(
+            client, "GET /api/cards/partner-votes", "GET", "/api/cards/partner-votes",
+            headers=headers, params={"user_id": me, "partner_id": partner},
+        )
+        await think()
+
+        proposal = await recorder.call(
+            client, "POST /api/proposals", "POST", "/api/proposals",
+            headers={**headers, "Idempotency-Key": str(uuid.uuid4())}, params={"user_id": me},
+            json={"proposed_to_user_id": partner, "period_id": period_id,
+                  "card_id": cards[0]["id"] if cards else None,
+                  "custom_title": None if cards else "Reto de carga"},
+        )
+        if proposal:
+            path = f"/api/proposals/{proposal['id']}"
+            steps = [
+                ("PATCH /api/proposals/{id}/respond", f"{path}/respond", partner,
+                 {"response": "accepted", "credit_cost": 1}),
+                ("PATCH /api/proposals/{id}/complete", f"{path}/complete", partner, None),
+                ("PATCH /api/proposals/{id}/confirm", f"{path}/confirm", me, None),
+            ]
+            for label, url, user_id, body in steps:
+                result = await recorder.call(
+                    client, label, "PATCH", url, params={"user_id": user_id}, json=body,
+                    headers={"Idempotency-Key": str(uuid.uuid4())},
+                )
+                if result is None:
+                    break
+        await think()
+
+        for user_id in (me, partner):
+            await recorder.call(
+                client, "GET /api/credits/balance", "GET", "/api/credits/balance",
+                params={"user_id": user_id},
+            )
+        journeys += 1
+    return journeys
+
+
+async def run_load(args, base_url: str) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.couples * 2, max_keepalive_connections=args.couples)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        period = (await client.get("/api/periods/active")).json()
+        if not period:
+            raise SystemExit("No active period in the target database")
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        journeys = await asyncio.gather(*(
+            couple_journeys(
+                client, recorder, index, period["id"], deadline, args.think_time,
+                args.login_every, random.Random(args.seed * 100_003 + index),
+            )
+            for index in range(args.couples)
+        ))
+        elapsed = time.perf_counter() - started
+
+    summary = recorder.summary(elapsed)
+    summary["journeys"] = sum(journeys)
+    summary["config"] = {
+        "couples": args.couples, "duration": args.duration, "think_time": args.think_time,
+        "login_every": args.login_every,
+        "db": args.db, "workers": args.workers, "scale": args.scale, "url": args.url,
+    }
+    return summary
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, run_dir: str) -> tuple[subprocess.Popen, str]:
+    env = dict(os.environ)
+    # The harness logs in hundreds of times a minute from one address
+    env.update(
+        LOGIN_IP_BURST="1000000", LOGIN_IP_PER_MINUTE="1000000",
+        LOGIN_USER_BURST="1000000", LOGIN_USER_PER_MINUTE="1000000",
+        LOG_LEVEL=env.get("LOG_LEVEL", "WARNING"),
+    )
+    if args.db == "sqlite":
+        sys.path.insert(0, str(Path(__file__).resolve().parent))
+        from datagen import cached_sqlite_dataset
+
+        path = os.path.join(run_dir, "loadtest.db")
+        shutil.copyfile(cached_sqlite_dataset(args.scale, args.seed), path)
+        env.update(DB_TYPE="sqlite", SQLITE_PATH=path)
+    else:
+        env["DB_TYPE"] = "mysql"
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(args.workers), "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        if server.poll() is not None:
+            raise SystemExit(f"Server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return server, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("Server did not become healthy in 30s")
+
+
+def print_report(summary: dict, baseline: dict | None = None) -> None:
+    config = summary["config"]
+    print(
+        f"\n{config['couples']} couples, {summary['elapsed_s']:.1f}s, "
+        f"{summary['journeys']} journeys, {summary['requests']} requests "
+        f"({summary['rps']:.1f}/s), {summary['errors']} errors"
+    )
+    header = f"{'endpoint':<38}{'reqs':>8}{'errs':>6}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(header + ("   p95 vs baseline" if baseline else ""))
+    print("-" * (len(header) + (18 if baseline else 0)))
+    for label, item in summary["endpoints"].items():
+        line = (
+            f"{label:<38}{item['requests']:>8}{item['errors']:>6}{item['rps']:>8.1f}"
+            f"{item['p50_ms']:>8.1f}ms{item['p95_ms']:>7.1f}ms{item['p99_ms']:>7.1f}ms"
+        )
+        before = (baseline or {}).get("endpoints", {}).get(label)
+        if before and before["p95_ms"]:
+            line += f"   {(item['p95_ms'] / before['p95_ms'] - 1) * 100:+6.1f}%"
+        print(line)
+    if baseline:
+        print(f"throughput vs baseline: {(summary['rps'] / baseline['rps'] - 1) * 100:+.1f}%")
+    for label, sample in summary["error_samples"].items():
+        print(f"first error on {label}: {sample}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--couples", type=int, default=20, help="concurrent virtual couples")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean pause between journey steps, in seconds")
+    parser.add_argument("--login-every", type=int, default=20,
+                        help="journeys between logins for each couple")
+    parser.add_argument("--db", choices=["sqlite", "mysql"], default="sqlite")
+    parser.add_argument("--scale", default="small", help="datagen scale for --db sqlite")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--url", help="target a running instance instead of booting one")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="report from an earlier run to compare against")
+    args = parser.parse_args()
+
+    run_dir = tempfile.mkdtemp(prefix="loadtest-")
+    server = None
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            server, base_url = start_server(args, run_dir)
+        summary = asyncio.run(run_load(args, base_url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+    print_report(summary, baseline)
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
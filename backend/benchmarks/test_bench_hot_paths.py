@@ -0,0 +1,130 @@
+"""Hot-path benchmarks against the generated dataset (see conftest.py).
+
+Run through `make bench` to compare with the stored baseline; a mean more
+than BENCH_MAX_REGRESSION slower than the baseline fails the run.
+"""
+
+import csv
+import io
+import itertools
+
+from app.api.routes_tags import _replace_tag_slug
+from app.feed_cache import feed_cache
+from app.models.card import PreferenceType
+from app.models.proposal import ProposalStatus
+from app.services.card_csv_service import CardCsvService
+from app.services.card_service import CardService
+from app.services.period_service import PeriodService
+from app.services.proposal_service import ProposalService
+from app.services.suggestion_service import SuggestionService
+
+
+def test_cards_with_preferences(benchmark, db, couple):
+    cards, total = benchmark(
+        CardService.get_cards_with_preferences, db, *couple, limit=50, locale="en"
+    )
+    assert len(cards) == 50 and total > 50
+
+
+def test_cards_with_preferences_cached(benchmark, db, couple, monkeypatch):
+    monkeypatch.setattr(feed_cache, "max_entries", 1000)
+    cards, _ = benchmark(
+        CardService.get_cards_with_preferences, db, *couple, limit=50, locale="en"
+    )
+    assert len(cards) == 50
+    assert feed_cache.hits
+
+
+def test_cards_with_preferences_sparse(benchmark, db, couple):
+    cards, _ = benchmark(
+        CardService.get_cards_with_preferences,
+        db, *couple, limit=50, locale="en", fields={"id", "title", "user_preference"},
+    )
+    assert len(cards) == 50
+
+
+def test_cards_with_preferences_unvoted(benchmark, db, couple):
+    cards, _ = benchmark(
+        CardService.get_cards_with_preferences,
+        db, *couple, tags=["romance"], unvoted_only=True, limit=50,
+    )
+    assert cards
+
+
+def test_partner_votes_grouped(benchmark, db, couple):
+    grouped = benchmark(CardService.get_partner_votes_grouped, db, *couple, locale="en")
+    assert grouped["like"]
+
+
+def test_proposal_suggestions(benchmark, db, couple):
+    suggestions = benchmark(SuggestionService.get_suggestions, db, *couple, locale="en")
+    assert suggestions
+
+
+def test_csv_export(benchmark, db):
+    content = benchmark(CardCsvService.export_cards_csv, db)
+    assert content.count("\n") > 100
+
+
+def test_csv_import_preview(benchmark, db):
+    content = CardCsvService.export_cards_csv(db)
+    rows, errors, _ = benchmark(CardCsvService.preview_import, db, content)
+    assert rows and not errors
+
+
+def test_csv_import_apply(benchmark, db):
+    # Re-import the first 100 cards with edited titles
+    exported = list(csv.DictReader(io.StringIO(CardCsvService.export_cards_csv(db))))[:100]
+    counter = itertools.count()
+
+    def setup():
+        round_id = next(counter)
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=exported[0].keys())
+        writer.writeheader()
+        for row in exported:
+            writer.writerow({**row, "title_en": f"{row['title_en']} r{round_id}"})
+        rows, errors, _ = CardCsvService.preview_import(db, output.getvalue())
+        assert not errors
+        return (db, rows, None), {}
+
+    summary = benchmark.pedantic(CardCsvService.apply_import, setup=setup, rounds=5)
+    assert summary["updated"] == 100
+
+
+def test_tag_rename(benchmark, db):
+    # Rename back and forth so every round rewrites the same cards
+    names = itertools.cycle([("romance", "romance_renamed"), ("romance_renamed", "romance")])
+    benchmark(lambda: _replace_tag_slug(db, *next(names)))
+
+
+def test_vote(benchmark, db, couple):
+    votes = itertools.cycle(
+        itertools.product(range(1, 201), [PreferenceType.LIKE, PreferenceType.DISLIKE])
+    )
+
+    def vote():
+        card_id, preference = next(votes)
+        return CardService.vote_on_card(db, couple[0], card_id, preference)
+
+    benchmark(vote)
+
+
+def test_proposal_lifecycle(benchmark, db, couple):
+    """Propose, accept, complete and confirm; the couple alternates roles."""
+    period = PeriodService.get_active_period(db)
+    directions = itertools.cycle([couple, couple[::-1]])
+
+    def lifecycle():
+        by_user, to_user = next(directions)
+        proposal = ProposalService.create_proposal(
+            db, period.id, 1, by_user, to_user, card_id=1
+        )
+        ProposalService.respond_to_proposal(
+            db, proposal.id, to_user, ProposalStatus.ACCEPTED, credit_cost=1
+        )
+        ProposalService.mark_as_completed(db, proposal.id, to_user)
+        return ProposalService.confirm_completion(db, proposal.id, by_user)
+
+    proposal = benchmark(lifecycle)
+    assert proposal.status == ProposalStatus.COMPLETED_CONFIRMED
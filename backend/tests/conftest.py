@@ -1,15 +1,37 @@
+"""Test fixtures.
+
+Tests run on SQLite by default: the schema is migrated with Alembic to head,
+as in production, and seeded once per session into an in-memory template;
+each test gets its own copy (SQLite's backup API, well under a millisecond).
+Tests that write from several threads use `file_db_session`, a copy on a WAL
+database file, since a shared-cache memory database locks whole tables and
+ignores the WAL and busy_timeout pragmas. Run in parallel with
+`pytest -n auto`; every xdist worker builds its own template.
+
+`--mysql` (or TEST_DB_BACKEND=mysql) runs the suite against a live MySQL
+migrated with Alembic, as in production. Tests marked `mysql` only run then.
+"""
+
+import itertools
 import os
+import sqlite3
 import sys
 from pathlib import Path
 
 import importlib
+from contextlib import contextmanager
+
 import pytest
 from alembic import command
 from alembic.config import Config
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
 from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -17,8 +39,47 @@ if str(PROJECT_ROOT) not in sys.path:
 
 load_dotenv(PROJECT_ROOT.parent / ".env")
 
-from app.models.user import User  # noqa: E402
+USE_MYSQL = os.getenv("TEST_DB_BACKEND", "sqlite").lower() == "mysql"
+if not USE_MYSQL:
+    # App-level engines (SessionLocal, background jobs) must not open a real file
+    os.environ["DB_TYPE"] = "sqlite"
+    os.environ["SQLITE_PATH"] = ":memory:"
+
 import app.models  # noqa: F401,E402
+from app.api.read_routing import get_async_read_db, get_read_db  # noqa: E402
+from app.context_cache import context_cache  # noqa: E402
+from app.feed_cache import feed_cache  # noqa: E402
+from app.database import (  # noqa: E402
+    get_async_database_url,
+    get_async_db,
+    get_db,
+    install_sqlite_pragmas,
+)
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.query_stats import QueryStats  # noqa: E402
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--mysql",
+        action="store_true",
+        default=USE_MYSQL,
+        help="run against MySQL (TEST_DB_* settings) instead of in-memory SQLite",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "mysql: needs MySQL; skipped unless --mysql is given")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--mysql"):
+        return
+    skip_mysql = pytest.mark.skip(reason="needs MySQL (run with --mysql)")
+    for item in items:
+        if "mysql" in item.keywords:
+            item.add_marker(skip_mysql)
 
 
 def _get_test_db_settings() -> dict:
@@ -35,7 +96,9 @@ def _get_test_db_settings() -> dict:
         "password": os.getenv(
             "TEST_DB_PASSWORD", os.getenv("MYSQL_PASSWORD", "couple_cards_secret")
         ),
-        "name": os.getenv("TEST_DB_NAME", "couple_cards_test"),
+        # One database per xdist worker
+        "name": os.getenv("TEST_DB_NAME", "couple_cards_test")
+        + (f"_{os.environ['PYTEST_XDIST_WORKER']}" if "PYTEST_XDIST_WORKER" in os.environ else ""),
         "admin_user": os.getenv("TEST_DB_ADMIN_USER", os.getenv("MYSQL_ROOT_USER", "root")),
         "admin_password": os.getenv(
             "TEST_DB_ADMIN_PASSWORD", os.getenv("MYSQL_ROOT_PASSWORD", "root_secret")
@@ -47,8 +110,7 @@ def _make_mysql_url(user: str, password: str, host: str, port: str, db: str) ->
     return f"mysql+pymysql://{user}:{password}@{host}:{port}/{db}?charset=utf8mb4"
 
 
-@pytest.fixture(scope="session")
-def test_db_url():
+def _mysql_test_url() -> str:
     settings = _get_test_db_settings()
     return _make_mysql_url(
         settings["user"],
@@ -60,7 +122,15 @@ def test_db_url():
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_database(test_db_url):
+def setup_test_database(request, tmp_path_factory):
+    """Yield the SQLite template connection, or None after migrating MySQL."""
+    if not request.config.getoption("--mysql"):
+        template = _build_sqlite_template(tmp_path_factory.mktemp("template"))
+        yield template
+        template.close()
+        return
+
+    test_db_url = _mysql_test_url()
     settings = _get_test_db_settings()
     server_url = _make_mysql_url(
         settings["admin_user"],
@@ -110,12 +180,9 @@ def setup_test_database(test_db_url):
     import app.database  # noqa: E402
     importlib.reload(app.database)
 
-    alembic_cfg = Config(str(PROJECT_ROOT / "alembic.ini"))
-    alembic_cfg.set_main_option("sqlalchemy.url", test_db_url)
-    alembic_cfg.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
-    command.upgrade(alembic_cfg, "head")
+    _migrate(test_db_url)
 
-    yield
+    yield None
 
     cleanup_engine = create_engine(server_url, isolation_level="AUTOCOMMIT")
     with cleanup_engine.connect() as connection:
@@ -124,12 +191,101 @@ def setup_test_database(test_db_url):
 
 
 @pytest.fixture()
-def db_session(test_db_url):
-    engine = create_engine(test_db_url)
-    SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
-    session = SessionLocal()
-    try:
+def db_session(setup_test_database):
+    keeper = None
+    if setup_test_database is None:
+        engine = create_engine(_mysql_test_url())
         _clear_database(engine)
+    else:
+        engine, keeper = _copy_sqlite_template(setup_test_database)
+    try:
+        with _test_session(engine) as session:
+            yield session
+    finally:
+        if keeper is not None:
+            keeper.close()
+
+
+@pytest.fixture()
+def file_db_session(request, setup_test_database, tmp_path):
+    """db_session on a WAL database file, for tests that write from several threads."""
+    if setup_test_database is None:
+        yield request.getfixturevalue("db_session")
+        return
+    path = tmp_path / "test.db"
+    target = sqlite3.connect(path)
+    try:
+        setup_test_database.backup(target)
+    finally:
+        target.close()
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    install_sqlite_pragmas(engine)
+    with _test_session(engine) as session:
+        yield session
+
+
+@pytest.fixture()
+def async_engine(db_session):
+    url = db_session.get_bind().url.render_as_string(hide_password=False)
+    # TestClient may run each request on a new event loop, so don't pool connections
+    engine = create_async_engine(get_async_database_url(url), poolclass=NullPool)
+    if engine.dialect.name == "sqlite":
+        install_sqlite_pragmas(engine.sync_engine)
+    yield engine
+    engine.sync_engine.dispose()
+
+
+@pytest.fixture()
+def client(db_session, async_engine):
+    """TestClient with the sync and async DB dependencies bound to the test database."""
+
+    async def _get_async_db():
+        async with AsyncSession(async_engine, autoflush=False) as session:
+            yield session
+
+    overrides = {
+        get_db: lambda: db_session,
+        get_read_db: lambda: db_session,
+        get_async_db: _get_async_db,
+        get_async_read_db: _get_async_db,
+    }
+    app.dependency_overrides.update(overrides)
+    try:
+        yield TestClient(app)
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+
+
+@pytest.fixture()
+def max_queries():
+    """`with max_queries(n):` fails if the block runs more than n SQL statements."""
+
+    @contextmanager
+    def _max_queries(limit: int):
+        stats = QueryStats()
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            stats.record(statement, 0.0)
+
+        event.listen(Engine, "before_cursor_execute", _record)
+        try:
+            yield stats
+        finally:
+            event.remove(Engine, "before_cursor_execute", _record)
+        repeated = "\n".join(f"{n}x {shape}" for shape, n in stats.shapes.most_common())
+        assert stats.count <= limit, f"{stats.count} queries (max {limit}):\n{repeated}"
+
+    return _max_queries
+
+
+@contextmanager
+def _test_session(engine):
+    """A session on `engine` with empty caches and the seed users; disposes the engine."""
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    try:
+        context_cache.clear()
+        feed_cache.clear()
         _seed_users(session)
         yield session
     finally:
@@ -137,6 +293,15 @@ def db_session(test_db_url):
         engine.dispose()
 
 
+def _migrate(url: str) -> None:
+    """Upgrade the database at `url` to the latest Alembic revision."""
+    # No ini file: alembic.ini's logging setup would replace pytest's handlers
+    alembic_cfg = Config()
+    alembic_cfg.set_main_option("sqlalchemy.url", url)
+    alembic_cfg.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    command.upgrade(alembic_cfg, "head")
+
+
 def _seed_users(session):
     if session.query(User).count() > 0:
         return
@@ -149,12 +314,61 @@ def _seed_users(session):
     session.commit()
 
 
+_sqlite_databases = itertools.count()
+
+
+def _sqlite_memory_uri(name: str) -> str:
+    # Shared cache lets every connection in this process open the same database
+    return f"file:{name}?mode=memory&cache=shared"
+
+
+def _build_sqlite_template(directory: Path) -> sqlite3.Connection:
+    """
+    Migrate a database file to head, empty it of the migrations' seed data
+    (as MySQL runs do) and add the seed users, then load it into memory.
+    The returned connection keeps the in-memory template alive.
+    """
+    path = directory / "template.db"
+    _migrate(f"sqlite:///{path}")
+    engine = create_engine(f"sqlite:///{path}")
+    _clear_database(engine)
+    with sessionmaker(bind=engine)() as session:
+        _seed_users(session)
+    engine.dispose()
+
+    uri = _sqlite_memory_uri(f"couple_cards_template_{os.getpid()}")
+    template = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    source = sqlite3.connect(path)
+    try:
+        source.backup(template)
+    finally:
+        source.close()
+    return template
+
+
+def _copy_sqlite_template(template: sqlite3.Connection):
+    """A fresh in-memory copy of the template, and the connection keeping it alive."""
+    uri = _sqlite_memory_uri(f"couple_cards_test_{os.getpid()}_{next(_sqlite_databases)}")
+    keeper = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    template.backup(keeper)
+    engine = create_engine(
+        f"sqlite:///{uri}&uri=true", connect_args={"check_same_thread": False}
+    )
+    install_sqlite_pragmas(engine)
+    return engine, keeper
+
+
 def _clear_database(engine):
     inspector = inspect(engine)
     table_names = [name for name in inspector.get_table_names() if name != "alembic_version"]
     if not table_names:
         return
     with engine.begin() as connection:
+        if engine.dialect.name == "sqlite":
+            # Foreign keys aren't enforced without the pragma, so order doesn't matter
+            for table_name in table_names:
+                connection.execute(text(f'DELETE FROM "{table_name}"'))
+            return
         connection.execute(text("SET FOREIGN_KEY_CHECKS=0"))
         for table_name in table_names:
             connection.execute(text(f"TRUNCATE TABLE `{table_name}`"))
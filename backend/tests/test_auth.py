@@ -0,0 +1,128 @@
+import threading
+
+import bcrypt
+import pytest
+
+from app import auth
+from app.api import routes_auth
+from app.config import config
+from app.models.user import User
+from app.rate_limit import TokenBucketLimiter
+
+
+@pytest.fixture(autouse=True)
+def reset_login_limiters():
+    routes_auth.user_login_limiter.reset()
+    routes_auth.ip_login_limiter.reset()
+
+
+def _create_user(db_session, rounds: int) -> User:
+    pin_hash = bcrypt.hashpw(b"1234", bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+    user = User(name="A", pin_hash=pin_hash)
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def test_login_rehashes_pin_to_configured_cost(client, db_session, monkeypatch):
+    monkeypatch.setattr(config, "PIN_BCRYPT_ROUNDS", 5)
+    user = _create_user(db_session, rounds=4)
+
+    response = client.post("/api/auth/login", json={"user_id": user.id, "pin": "1234"})
+
+    assert response.status_code == 200
+    db_session.refresh(user)
+    assert user.pin_hash.startswith("$2b$05$")
+    assert auth.verify_pin("1234", user.pin_hash)
+    assert not auth.needs_rehash(user.pin_hash)
+
+
+def test_login_is_rate_limited_per_user(client, db_session, monkeypatch):
+    monkeypatch.setattr(config, "PIN_BCRYPT_ROUNDS", 4)
+    user = _create_user(db_session, rounds=4)
+
+    statuses = [
+        client.post("/api/auth/login", json={"user_id": user.id, "pin": "0000"}).status_code
+        for _ in range(config.LOGIN_USER_BURST + 1)
+    ]
+
+    assert statuses[:-1] == [401] * config.LOGIN_USER_BURST
+    assert statuses[-1] == 429
+
+
+def test_login_returns_503_when_pin_pool_is_saturated(client, db_session, monkeypatch):
+    monkeypatch.setattr(config, "PIN_BCRYPT_ROUNDS", 4)
+    monkeypatch.setattr(auth, "_pin_slots", threading.BoundedSemaphore(1))
+    auth._pin_slots.acquire()
+    user = _create_user(db_session, rounds=4)
+
+    response = client.post("/api/auth/login", json={"user_id": user.id, "pin": "1234"})
+
+    assert response.status_code == 503
+
+
+def test_token_bucket_refills(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.rate_limit.time.monotonic", lambda: now[0])
+    limiter = TokenBucketLimiter(capacity=2, refill_per_second=0.5)
+
+    assert limiter.acquire("ip") == 0
+    assert limiter.acquire("ip") == 0
+    assert limiter.acquire("ip") == pytest.approx(2.0)
+    assert limiter.acquire("other") == 0
+
+    now[0] += 2
+    assert limiter.acquire("ip") == 0
+
+
+def test_client_ip_uses_the_hop_appended_by_the_proxy(client, db_session, monkeypatch):
+    monkeypatch.setattr(config, "TRUST_PROXY_HEADERS", True)
+    monkeypatch.setattr(routes_auth, "ip_login_limiter", TokenBucketLimiter(1, 0.0001))
+    user = _create_user(db_session, rounds=4)
+
+    def login(forwarded_for):
+        return client.post(
+            "/api/auth/login",
+            json={"user_id": user.id, "pin": "0000"},
+            headers={"X-Forwarded-For": forwarded_for},
+        ).status_code
+
+    # Changing the client-supplied entries doesn't reset the per-IP limit
+    assert login("1.1.1.1, 10.0.0.7") == 401
+    assert login("2.2.2.2, 10.0.0.7") == 429
+    assert login("10.0.0.8") == 401
+
+
+def test_proxy_headers_are_ignored_by_default(client, db_session, monkeypatch):
+    monkeypatch.setattr(routes_auth, "ip_login_limiter", TokenBucketLimiter(1, 0.0001))
+    user = _create_user(db_session, rounds=4)
+
+    statuses = [
+        client.post(
+            "/api/auth/login",
+            json={"user_id": user.id, "pin": "0000"},
+            headers={"X-Forwarded-For": ip, "X-Real-IP": ip},
+        ).status_code
+        for ip in ("1.1.1.1", "2.2.2.2")
+    ]
+
+    assert statuses == [401, 429]
+
+
+def test_requests_blocked_by_ip_dont_use_up_the_account(client, db_session, monkeypatch):
+    monkeypatch.setattr(config, "TRUST_PROXY_HEADERS", True)
+    monkeypatch.setattr(routes_auth, "ip_login_limiter", TokenBucketLimiter(1, 0.0001))
+    user = _create_user(db_session, rounds=4)
+
+    def login(ip):
+        return client.post(
+            "/api/auth/login",
+            json={"user_id": user.id, "pin": "0000"},
+            headers={"X-Forwarded-For": ip},
+        ).status_code
+
+    attacker = [login("1.1.1.1") for _ in range(config.LOGIN_USER_BURST + 1)]
+
+    assert attacker == [401] + [429] * config.LOGIN_USER_BURST
+    # Only the attacker's first attempt was charged to the account
+    assert login("10.0.0.8") == 401
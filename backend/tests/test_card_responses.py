@@ -0,0 +1,99 @@
+import json
+
+from app.context_cache import context_cache
+from app.models.card import Card, CardCategory, CardTranslation, PreferenceType, PreferenceVote
+from app.models.grouping import Grouping
+from app.models.tag import Tag
+from app.models.user import User
+from app.query_stats import collect_queries
+from app.schemas.card import CardListResponse, CardResponse, PartnerVotesResponse
+from app.services.card_service import CARD_FIELDS, CardService
+
+
+def _seed(db_session):
+    user_a, user_b = db_session.query(User).order_by(User.id).all()
+    user_a.partner_id, user_b.partner_id = user_b.id, user_a.id
+    db_session.add(Tag(slug="romance", name="Romance", name_es="Romance ES", tag_type="category"))
+    grouping = Grouping(slug="citas", name="Citas")
+    cards = [
+        Card(
+            title=f"Carta {i} para {{partner}}",
+            description="d",
+            category=CardCategory.ROMANCE,
+            tags=json.dumps({"tags": ["romance"]}),
+            groupings=[grouping],
+            translations=[CardTranslation(locale="en", title=f"Card {i}", description="d")],
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(cards)
+    db_session.flush()
+    db_session.add_all(
+        PreferenceVote(user_id=user.id, card_id=card.id, preference=PreferenceType.LIKE)
+        for card in cards
+        for user in (user_a, user_b)
+    )
+    db_session.commit()
+    return user_a.id, user_b.id
+
+
+def test_card_lists_match_the_validated_schema(client, db_session):
+    user_a, user_b = _seed(db_session)
+
+    for url, schema in [
+        (f"/api/cards?user_id={user_a}&partner_id={user_b}", CardListResponse),
+        ("/api/cards?locale=en", CardListResponse),
+        (f"/api/cards/partner-votes?user_id={user_a}&partner_id={user_b}", PartnerVotesResponse),
+    ]:
+        response = client.get(url)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert schema.model_validate(body).model_dump(mode="json") == body
+        assert response.headers["content-type"] == "application/json"
+
+
+def test_card_fields_match_the_schema():
+    assert set(CARD_FIELDS) == set(CardResponse.model_fields)
+
+
+def test_fields_narrow_card_lists(client, db_session):
+    user_a, user_b = _seed(db_session)
+
+    response = client.get(
+        f"/api/cards?user_id={user_a}&partner_id={user_b}&fields=title,user_preference"
+    )
+    assert response.status_code == 200
+    cards = response.json()["cards"]
+    assert len(cards) == 3
+    assert all(set(card) == {"id", "title", "user_preference"} for card in cards)
+    assert all(card["title"].startswith("Carta") and "{{" not in card["title"] for card in cards)
+
+    grouped = client.get(
+        f"/api/cards/partner-votes?user_id={user_a}&partner_id={user_b}&fields=tags_list"
+    ).json()
+    assert grouped["total_mutual"] == 3
+    assert [set(card) for card in grouped["like"]] == [{"id", "tags_list"}] * 3
+    assert grouped["like"][0]["tags_list"][0]["slug"] == "romance"
+
+
+def test_unknown_fields_are_rejected(client, db_session):
+    response = client.get("/api/cards?fields=id,secret")
+
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+
+
+def test_omitted_fields_skip_their_queries(db_session):
+    user_a, user_b = _seed(db_session)
+    context_cache.clear()
+
+    with collect_queries() as stats:
+        cards, _ = CardService.get_cards_with_preferences(
+            db_session, user_a, user_b, locale="es", fields={"id", "user_preference"}
+        )
+
+    assert [set(card) for card in cards] == [{"id", "user_preference"}] * 3
+    tables = " ".join(stats.shapes)
+    for table in ("tags", "groupings", "card_translations", "users"):
+        assert f"FROM {table}" not in tables
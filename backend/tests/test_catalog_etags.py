@@ -0,0 +1,71 @@
+from app.catalog_version import catalog_version
+from app.models.card import Card, CardCategory
+from app.models.tag import Tag
+from app.query_stats import collect_queries
+from app.services.card_service import CardService
+
+
+def test_catalog_routes_send_etag_and_cache_control(client):
+    for url, cache_control in [
+        ("/api/tags", "public, max-age=60"),
+        ("/api/tags/grouped", "public, max-age=60"),
+        ("/api/groupings", "public, max-age=60"),
+        ("/api/cards", "public, max-age=60"),
+        ("/api/auth/users", "private, no-cache"),
+    ]:
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == catalog_version.etag()
+        assert response.headers["cache-control"] == cache_control
+
+
+def test_matching_if_none_match_is_answered_without_queries(client):
+    etag = client.get("/api/tags").headers["etag"]
+
+    with collect_queries() as stats:
+        response = client.get("/api/tags", headers={"If-None-Match": f'"other", {etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert stats.count == 0
+
+
+def test_catalog_writes_change_the_etag(client, db_session):
+    etag = client.get("/api/cards").headers["etag"]
+
+    db_session.add(Tag(slug="nuevo", name="Nuevo", tag_type="subtag"))
+    db_session.commit()
+
+    response = client.get("/api/cards", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_bulk_toggle_changes_the_etag(db_session):
+    card = Card(title="t", description="d", category=CardCategory.ROMANCE)
+    db_session.add(card)
+    db_session.commit()
+    etag = catalog_version.etag()
+
+    CardService.bulk_toggle_cards(db_session, [card.id], enabled=False)
+
+    assert catalog_version.etag() != etag
+
+
+def test_rolled_back_writes_keep_the_etag(db_session):
+    etag = catalog_version.etag()
+
+    db_session.add(Tag(slug="descartado", name="Descartado", tag_type="subtag"))
+    db_session.flush()
+    db_session.rollback()
+
+    assert catalog_version.etag() == etag
+
+
+def test_couple_card_listing_is_not_conditional(client, db_session):
+    response = client.get("/api/cards?user_id=1&partner_id=2")
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
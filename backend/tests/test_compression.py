@@ -0,0 +1,62 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, choose_encoding
+
+BODY = "carta " * 500
+
+
+@pytest.fixture()
+def compressed_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(iter(["data: 1\n\n", "data: 2\n\n"]), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_choose_encoding_prefers_brotli_and_honours_q():
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip, br;q=0") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("*") == "br"
+
+
+@pytest.mark.parametrize(
+    ("accept", "decode"), [("gzip", gzip.decompress), ("br", brotli.decompress)]
+)
+def test_large_bodies_are_compressed(compressed_client, accept, decode):
+    # Raw stream, so the client does not decode it for us
+    with compressed_client.stream("GET", "/text", headers={"Accept-Encoding": accept}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == accept
+    assert response.headers["content-length"] == str(len(raw))
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert decode(raw).decode() == BODY
+
+
+def test_small_and_streamed_bodies_pass_through(compressed_client):
+    small = compressed_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    events = compressed_client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in small.headers
+    assert small.text == "ok"
+    assert "content-encoding" not in events.headers
+    assert events.text == "data: 1\n\ndata: 2\n\n"
@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.api.admin_access import require_admin_access
+from app.context_cache import context_cache
+from app.models.period import PeriodType
+from app.models.user import User
+from app.services.period_service import PeriodService
+
+
+@contextmanager
+def _count_queries(db_session):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _new_session(db_session):
+    return sessionmaker(bind=db_session.get_bind(), autoflush=False)()
+
+
+def test_active_period_is_cached_across_sessions(db_session):
+    period = PeriodService.create_period(db_session, PeriodType.WEEK, date.today())
+    PeriodService.activate_period(db_session, period.id)
+    assert PeriodService.get_active_period(db_session).id == period.id
+
+    other = _new_session(db_session)
+    try:
+        with _count_queries(db_session) as statements:
+            cached = PeriodService.get_active_period(other)
+            assert (cached.id, cached.status, cached.start_date) == (
+                period.id, period.status, period.start_date,
+            )
+        assert statements == []
+    finally:
+        other.close()
+
+
+def test_cached_period_does_not_overwrite_the_sessions_instance(db_session):
+    period = PeriodService.create_period(db_session, PeriodType.WEEK, date.today())
+    PeriodService.activate_period(db_session, period.id)
+    assert PeriodService.get_active_period(db_session).id == period.id
+
+    other = _new_session(db_session)
+    try:
+        loaded = other.get(type(period), period.id)
+        loaded.end_date = date(2099, 1, 1)
+
+        assert PeriodService.get_active_period(other) is loaded
+        assert loaded.end_date == date(2099, 1, 1)
+        assert loaded in other.dirty
+    finally:
+        other.close()
+
+
+def test_period_transitions_invalidate_active_period(db_session):
+    period = PeriodService.create_period(db_session, PeriodType.WEEK, date.today())
+    assert PeriodService.get_active_period(db_session) is None
+
+    PeriodService.activate_period(db_session, period.id)
+    assert PeriodService.get_active_period(db_session).id == period.id
+
+    PeriodService.complete_period(db_session, period.id)
+    other = _new_session(db_session)
+    try:
+        assert PeriodService.get_active_period(other) is None
+    finally:
+        other.close()
+
+
+def test_admin_check_is_cached_and_invalidated_on_update(db_session):
+    user = User(name="Admin", pin_hash="hash", is_admin=True)
+    db_session.add(user)
+    db_session.commit()
+
+    require_admin_access(db_session, user.id, None)
+    with _count_queries(db_session) as statements:
+        require_admin_access(_new_session(db_session), user.id, None)
+    assert statements == []
+
+    user.is_admin = False
+    db_session.commit()
+    with pytest.raises(HTTPException) as exc_info:
+        require_admin_access(_new_session(db_session), user.id, None)
+    assert exc_info.value.status_code == 403
+
+
+def test_rolled_back_update_keeps_cached_user(db_session):
+    user = User(name="Alex", pin_hash="hash")
+    db_session.add(user)
+    db_session.commit()
+    assert context_cache.get_user(db_session, user.id).name == "Alex"
+
+    user.name = "Sam"
+    db_session.flush()
+    db_session.rollback()
+
+    assert context_cache.get_user(_new_session(db_session), user.id).name == "Alex"
@@ -0,0 +1,99 @@
+from datetime import date
+
+from app.models.card import Card, CardCategory, PreferenceType, PreferenceVote
+from app.models.credit import CreditBalance
+from app.models.grouping import Grouping
+from app.models.period import Period, PeriodStatus, PeriodType
+from app.models.proposal import Proposal, ProposalStatus
+from app.models.user import User
+from app.query_stats import collect_queries
+from app.services.dashboard_service import DashboardService
+
+
+def _seed(db_session):
+    user, partner = db_session.query(User).order_by(User.id).all()
+    user.partner_id, partner.partner_id = partner.id, user.id
+    period = Period(
+        period_type=PeriodType.MONTH,
+        status=PeriodStatus.ACTIVE,
+        start_date=date.today(),
+        end_date=date.today(),
+    )
+    citas, juegos = Grouping(slug="citas", name="Citas"), Grouping(slug="juegos", name="Juegos")
+    cards = [
+        Card(title=f"Carta {i}", description="d", category=CardCategory.ROMANCE)
+        for i in range(4)
+    ]
+    cards[0].groupings = [citas]
+    cards[1].groupings = [citas, juegos]
+    db_session.add_all([period, citas, juegos, *cards, CreditBalance(user_id=user.id, balance=7)])
+    db_session.flush()
+    # Both like card 0; the user also voted on card 1
+    db_session.add_all([
+        PreferenceVote(user_id=user.id, card_id=cards[0].id, preference=PreferenceType.LIKE),
+        PreferenceVote(user_id=partner.id, card_id=cards[0].id, preference=PreferenceType.LIKE),
+        PreferenceVote(user_id=user.id, card_id=cards[1].id, preference=PreferenceType.DISLIKE),
+    ])
+    db_session.add_all([
+        Proposal(period_id=period.id, proposed_by_user_id=user.id,
+                 proposed_to_user_id=partner.id, card_id=cards[0].id),
+        Proposal(period_id=period.id, proposed_by_user_id=partner.id,
+                 proposed_to_user_id=user.id, card_id=cards[2].id),
+        Proposal(period_id=period.id, proposed_by_user_id=partner.id,
+                 proposed_to_user_id=user.id, card_id=cards[3].id,
+                 status=ProposalStatus.ACCEPTED),
+    ])
+    db_session.commit()
+    return user, partner
+
+
+def test_dashboard_gathers_the_home_page(client, db_session):
+    user, partner = _seed(db_session)
+
+    response = client.get(f"/api/dashboard?user_id={user.id}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["partner"]["id"] == partner.id
+    assert body["period"]["status"] == "active"
+    assert body["current_week"] == 1
+    assert body["balance"] == 7
+    assert body["proposals_sent"]["proposed"] == 1
+    assert body["proposals_received"] == {
+        **{status.value: 0 for status in ProposalStatus}, "proposed": 1, "accepted": 1
+    }
+    assert body["unvoted_total"] == 2
+    assert [(g["slug"], g["unvoted"]) for g in body["unvoted_by_grouping"]] == [
+        ("citas", 0), ("juegos", 0)
+    ]
+    assert body["mutual_likes"] == 1
+
+
+def test_dashboard_mutual_likes_skip_disabled_cards(db_session):
+    user, partner = _seed(db_session)
+    disabled = Card(title="Oculta", description="d", category=CardCategory.ROMANCE, is_enabled=False)
+    db_session.add(disabled)
+    db_session.flush()
+    db_session.add_all([
+        PreferenceVote(user_id=user.id, card_id=disabled.id, preference=PreferenceType.LIKE),
+        PreferenceVote(user_id=partner.id, card_id=disabled.id, preference=PreferenceType.LIKE),
+    ])
+    db_session.commit()
+
+    assert DashboardService.get_dashboard(db_session, user.id)["mutual_likes"] == 1
+
+
+def test_dashboard_runs_one_query_per_section(db_session):
+    user, _ = _seed(db_session)
+    DashboardService.get_dashboard(db_session, user.id)
+
+    with collect_queries() as stats:
+        DashboardService.get_dashboard(db_session, user.id)
+
+    # Balance, proposals, unvoted total, unvoted per grouping, mutual likes;
+    # user, partner and period come from the context cache
+    assert stats.count == 5
+
+
+def test_dashboard_for_unknown_user(client):
+    assert client.get("/api/dashboard?user_id=999").status_code == 404
@@ -0,0 +1,151 @@
+import asyncio
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app import events
+from app.api import routes_events
+from app.events import EventBus, publish_after_commit
+from app.main import app
+from app.models.card import Card, CardCategory, PreferenceType
+from app.models.credit import LedgerType
+from app.models.period import Period, PeriodStatus, PeriodType
+from app.models.proposal import ProposalStatus
+from app.models.user import User
+from app.services.card_service import CardService
+from app.services.credit_service import CreditService
+from app.services.proposal_service import ProposalService
+from app.session_tokens import ROLE_USER, create_session_token
+
+
+@pytest.fixture()
+def bus(monkeypatch):
+    bus = EventBus()
+    monkeypatch.setattr(events, "event_bus", bus)
+    monkeypatch.setattr(routes_events, "event_bus", bus)
+    return bus
+
+
+def _replay(bus, user_id: int, last_event_id: int = 0) -> list:
+    async def collect():
+        subscription = bus.subscribe(user_id, last_event_id)
+        bus.unsubscribe(subscription)
+        return subscription.replay
+
+    return asyncio.run(collect())
+
+
+def _create_couple(db_session) -> tuple[User, User]:
+    proposer = User(name="A", pin_hash="hash")
+    recipient = User(name="B", pin_hash="hash")
+    db_session.add_all([proposer, recipient])
+    db_session.flush()
+    proposer.partner_id = recipient.id
+    recipient.partner_id = proposer.id
+    db_session.commit()
+    return proposer, recipient
+
+
+def test_replay_starts_after_last_event_id(bus):
+    bus.publish([1], "vote", {"n": 1})
+    bus.publish([1, 2], "vote", {"n": 2})
+    bus.publish([1], "vote", {"n": 3})
+
+    first, second, third = _replay(bus, 1)
+    assert [item.data["n"] for item in _replay(bus, 1, first.id)] == [2, 3]
+    assert [item.data["n"] for item in _replay(bus, 2)] == [2]
+    assert third.to_sse() == f'id: {third.id}\nevent: vote\ndata: {{"n": 3}}\n\n'
+
+
+def test_events_are_published_only_on_commit(bus, db_session):
+    db_session.query(User).first()
+    publish_after_commit(db_session, [1], "vote", {"n": 1})
+    db_session.rollback()
+    publish_after_commit(db_session, [1], "vote", {"n": 2})
+    assert _replay(bus, 1) == []
+
+    db_session.commit()
+    assert [item.data["n"] for item in _replay(bus, 1)] == [2]
+
+
+def test_services_publish_proposal_vote_and_balance_events(bus, db_session):
+    proposer, recipient = _create_couple(db_session)
+    card = Card(title="Card", description="Sample", category=CardCategory.CALIENTES)
+    period = Period(
+        period_type=PeriodType.WEEK,
+        status=PeriodStatus.ACTIVE,
+        start_date=date.today(),
+        end_date=date.today(),
+    )
+    db_session.add_all([card, period])
+    db_session.commit()
+
+    CardService.vote_on_card(db_session, recipient.id, card.id, PreferenceType.LIKE)
+    CreditService.add_ledger_entry(
+        db=db_session, user_id=proposer.id, ledger_type=LedgerType.INITIAL_GRANT, amount=10
+    )
+    proposal = ProposalService.create_proposal(
+        db=db_session,
+        period_id=period.id,
+        week_index=1,
+        proposed_by_user_id=proposer.id,
+        proposed_to_user_id=recipient.id,
+        card_id=card.id,
+    )
+    ProposalService.respond_to_proposal(
+        db_session, proposal.id, recipient.id, ProposalStatus.ACCEPTED, credit_cost=3
+    )
+
+    received = [(item.type, item.data) for item in _replay(bus, proposer.id)]
+    assert received[0] == (
+        "vote", {"user_id": recipient.id, "card_id": card.id, "preference": "like"}
+    )
+    assert received[1][0] == "balance" and received[1][1]["balance"] == 10
+    assert received[2][0] == "proposal" and received[2][1]["status"] == "proposed"
+    assert received[3][0] == "proposal" and received[3][1]["status"] == "accepted"
+    assert received[3][1]["version"] == 2
+    assert received[4][0] == "balance" and received[4][1]["balance"] == 7
+
+    # The voter doesn't get their own vote back
+    assert [item.type for item in _replay(bus, recipient.id)] == ["proposal", "proposal"]
+
+
+def test_websocket_replays_and_streams_events(bus):
+    bus.publish([1], "vote", {"n": 1})
+    bus.publish([1], "vote", {"n": 2})
+    first = _replay(bus, 1)[0]
+
+    token = create_session_token(ROLE_USER, user_id=1)
+    with TestClient(app).websocket_connect(
+        f"/api/events/ws?user_id=1&last_event_id={first.id}&token={token}"
+    ) as websocket:
+        assert websocket.receive_json()["data"] == {"n": 2}
+        bus.publish([1], "proposal", {"n": 3})
+        message = websocket.receive_json()
+        assert message["type"] == "proposal"
+        assert message["data"] == {"n": 3}
+
+
+def test_websocket_refuses_other_users_sessions(bus):
+    token = create_session_token(ROLE_USER, user_id=2)
+    client = TestClient(app)
+
+    for url in ("/api/events/ws?user_id=1", f"/api/events/ws?user_id=1&token={token}"):
+        with pytest.raises(WebSocketDisconnect) as excinfo:
+            with client.websocket_connect(url):
+                pass
+        assert excinfo.value.code == 1008
+
+
+def test_event_stream_requires_the_users_session(bus):
+    client = TestClient(app)
+    other = create_session_token(ROLE_USER, user_id=2)
+
+    assert client.get("/api/events?user_id=1").status_code == 401
+    assert client.get(
+        "/api/events?user_id=1", headers={"Authorization": f"Bearer {other}"}
+    ).status_code == 403
+    assert client.get(f"/api/events?user_id=1&token={other}").status_code == 403
+    assert client.get("/api/events?user_id=1&token=forged").status_code == 403
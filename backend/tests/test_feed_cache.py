@@ -0,0 +1,98 @@
+from app.feed_cache import FeedCache, feed_cache
+from app.models.card import Card, CardCategory, PreferenceType
+from app.models.tag import Tag
+from app.models.user import User
+from app.query_stats import collect_queries
+from app.services.card_service import CardService
+
+
+def _couple_with_cards(db_session, count=5):
+    user_a, user_b = db_session.query(User).order_by(User.id).all()
+    db_session.add_all(
+        Card(title=f"Carta {i}", description="d", category=CardCategory.ROMANCE)
+        for i in range(count)
+    )
+    db_session.commit()
+    return user_a.id, user_b.id
+
+
+def test_repeated_deck_requests_hit_the_cache(db_session):
+    couple = _couple_with_cards(db_session)
+    first, total = CardService.get_cards_with_preferences(db_session, *couple)
+
+    with collect_queries() as stats:
+        again, again_total = CardService.get_cards_with_preferences(db_session, *couple)
+
+    assert stats.count == 0
+    assert sorted(c["id"] for c in again) == sorted(c["id"] for c in first)
+    assert again_total == total == 5
+    assert feed_cache.stats()["hits"] >= 1
+
+
+def test_seed_gives_a_repeatable_order(db_session):
+    couple = _couple_with_cards(db_session, count=20)
+
+    orders = [
+        [c["id"] for c in CardService.get_cards_with_preferences(db_session, *couple, seed=7)[0]]
+        for _ in range(2)
+    ]
+
+    assert orders[0] == orders[1]
+
+
+def test_votes_invalidate_both_partners_decks(db_session):
+    user_id, partner_id = _couple_with_cards(db_session)
+    deck = CardService.get_cards_with_preferences(db_session, user_id, partner_id)[0]
+    partner_deck = CardService.get_cards_with_preferences(db_session, partner_id, user_id)[0]
+    card_id = deck[0]["id"]
+
+    CardService.vote_on_card(db_session, user_id, card_id, PreferenceType.LIKE)
+
+    deck = CardService.get_cards_with_preferences(db_session, user_id, partner_id)[0]
+    partner_deck = CardService.get_cards_with_preferences(db_session, partner_id, user_id)[0]
+    assert {c["id"]: c["user_preference"] for c in deck}[card_id] == "like"
+    assert {c["id"]: c["partner_preference"] for c in partner_deck}[card_id] == "like"
+
+    CardService.delete_vote(db_session, user_id, card_id)
+
+    deck = CardService.get_cards_with_preferences(db_session, user_id, partner_id)[0]
+    assert {c["id"]: c["user_preference"] for c in deck}[card_id] is None
+
+
+def test_catalog_writes_invalidate_every_deck(db_session):
+    couple = _couple_with_cards(db_session)
+    CardService.get_cards_with_preferences(db_session, *couple)
+
+    db_session.add(Tag(slug="nuevo", name="Nuevo", tag_type="subtag"))
+    db_session.commit()
+
+    misses = feed_cache.misses
+    CardService.get_cards_with_preferences(db_session, *couple)
+    assert feed_cache.misses == misses + 1
+
+
+def test_least_recently_used_pages_are_evicted():
+    cache = FeedCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == (True, 1)
+    assert cache.get("b") == (False, None)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_pages_are_recomputed(monkeypatch):
+    cache = FeedCache(max_entries=10, ttl_seconds=30)
+    cache.set("a", 1)
+
+    monkeypatch.setattr("app.feed_cache.time.monotonic", lambda: float("inf"))
+
+    assert cache.get("a") == (False, None)
+
+
+def test_feed_cache_is_reported_in_metrics(client):
+    response = client.get("/metrics")
+
+    assert 'cache_hits_total{cache="feed"}' in response.text
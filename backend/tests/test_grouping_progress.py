@@ -0,0 +1,73 @@
+from app.models.card import Card, CardCategory, PreferenceType, PreferenceVote
+from app.models.grouping import Grouping
+from app.models.user import User
+from app.query_stats import collect_queries
+from app.services.card_service import CardService
+
+
+def _seed(db_session):
+    user, partner = db_session.query(User).order_by(User.id).all()
+    citas = Grouping(slug="citas", name="Citas", display_order=1)
+    juegos = Grouping(slug="juegos", name="Juegos", display_order=2)
+    vacia = Grouping(slug="vacia", name="Vacía", display_order=3)
+    cards = [
+        Card(title=f"Carta {i}", description="d", category=CardCategory.ROMANCE)
+        for i in range(4)
+    ]
+    for card in cards[:3]:
+        card.groupings = [citas]
+    cards[3].groupings = [citas, juegos]
+    cards[2].is_enabled = False
+    db_session.add_all([vacia, *cards])
+    db_session.flush()
+    votes = [
+        (user, cards[0], PreferenceType.LIKE),
+        (partner, cards[0], PreferenceType.LIKE),
+        (user, cards[1], PreferenceType.LIKE),
+        (partner, cards[1], PreferenceType.DISLIKE),
+        (user, cards[2], PreferenceType.LIKE),
+        (partner, cards[3], PreferenceType.LIKE),
+    ]
+    db_session.add_all(
+        PreferenceVote(user_id=voter.id, card_id=card.id, preference=preference)
+        for voter, card, preference in votes
+    )
+    db_session.commit()
+    return user.id, partner.id
+
+
+def test_progress_per_grouping(client, db_session):
+    user_id, partner_id = _seed(db_session)
+
+    response = client.get(f"/api/groupings/progress?user_id={user_id}&partner_id={partner_id}")
+
+    assert response.status_code == 200
+    progress = {row["slug"]: row for row in response.json()}
+    # The disabled card doesn't count, not even the user's vote on it
+    assert progress["citas"] == {
+        **progress["citas"],
+        "total": 3, "voted_by_me": 2, "voted_by_partner": 3, "mutual_likes": 1,
+    }
+    assert progress["juegos"]["total"] == 1
+    assert progress["juegos"]["voted_by_partner"] == 1
+    assert progress["vacia"]["total"] == 0
+
+
+def test_progress_is_one_query_and_cached_until_a_vote(db_session):
+    user_id, partner_id = _seed(db_session)
+    card_id = db_session.query(Card.id).filter(Card.title == "Carta 3").scalar()
+
+    with collect_queries() as stats:
+        CardService.get_grouping_progress(db_session, user_id, partner_id)
+        CardService.get_grouping_progress(db_session, user_id, partner_id)
+    assert stats.count == 1
+
+    CardService.vote_on_card(db_session, partner_id, card_id, PreferenceType.DISLIKE)
+    CardService.vote_on_card(db_session, user_id, card_id, PreferenceType.LIKE)
+
+    progress = {
+        row["slug"]: row
+        for row in CardService.get_grouping_progress(db_session, user_id, partner_id)
+    }
+    assert progress["juegos"]["voted_by_me"] == 1
+    assert progress["juegos"]["mutual_likes"] == 0
@@ -0,0 +1,167 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.config import config
+from app.models.credit import CreditLedger, LedgerType
+from app.models.idempotency_key import IdempotencyKey
+from app.models.period import Period, PeriodStatus, PeriodType
+from app.models.proposal import Proposal
+from app.models.user import User
+from app.services.credit_service import CreditService
+from app.services.idempotency_service import IdempotencyConflictError, IdempotencyService
+
+
+def _setup(db_session) -> tuple[int, int, int]:
+    proposer = User(name="A", pin_hash="hash")
+    recipient = User(name="B", pin_hash="hash")
+    period = Period(
+        period_type=PeriodType.WEEK,
+        status=PeriodStatus.ACTIVE,
+        start_date=date.today(),
+        end_date=date.today(),
+    )
+    db_session.add_all([proposer, recipient, period])
+    db_session.commit()
+    CreditService.add_ledger_entry(
+        db=db_session, user_id=proposer.id, ledger_type=LedgerType.INITIAL_GRANT, amount=10
+    )
+    return proposer.id, recipient.id, period.id
+
+
+def _create(client, proposer_id, recipient_id, period_id, key, title="Reto"):
+    return client.post(
+        f"/api/proposals?user_id={proposer_id}",
+        json={
+            "period_id": period_id,
+            "week_index": 1,
+            "proposed_to_user_id": recipient_id,
+            "custom_title": title,
+        },
+        headers={"Idempotency-Key": key},
+    )
+
+
+def test_retried_create_returns_stored_response(client, db_session):
+    proposer_id, recipient_id, period_id = _setup(db_session)
+
+    first = _create(client, proposer_id, recipient_id, period_id, "create-1")
+    retry = _create(client, proposer_id, recipient_id, period_id, "create-1")
+
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db_session.query(Proposal).count() == 1
+
+
+def test_retried_accept_charges_once(client, db_session):
+    proposer_id, recipient_id, period_id = _setup(db_session)
+    proposal_id = _create(client, proposer_id, recipient_id, period_id, "create-1").json()["id"]
+
+    url = f"/api/proposals/{proposal_id}/respond?user_id={recipient_id}"
+    body = {"response": "accepted", "credit_cost": 3}
+    responses = [
+        client.patch(url, json=body, headers={"Idempotency-Key": "accept-1"})
+        for _ in range(3)
+    ]
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    db_session.expire_all()
+    assert db_session.query(CreditLedger).filter(
+        CreditLedger.type == LedgerType.PROPOSAL_COST
+    ).count() == 1
+    assert CreditService.get_balance(db_session, proposer_id) == 7
+
+
+def test_key_reused_for_another_request_is_rejected(client, db_session):
+    proposer_id, recipient_id, period_id = _setup(db_session)
+
+    _create(client, proposer_id, recipient_id, period_id, "create-1", title="Uno")
+    response = _create(client, proposer_id, recipient_id, period_id, "create-1", title="Dos")
+
+    assert response.status_code == 422
+    assert db_session.query(Proposal).count() == 1
+
+
+def test_failed_request_releases_key(client, db_session):
+    proposer_id, recipient_id, period_id = _setup(db_session)
+    proposal_id = _create(client, proposer_id, recipient_id, period_id, "create-1").json()["id"]
+
+    # Only the recipient can respond
+    url = f"/api/proposals/{proposal_id}/respond?user_id={proposer_id}"
+    body = {"response": "accepted", "credit_cost": 3}
+    first = client.patch(url, json=body, headers={"Idempotency-Key": "accept-1"})
+    retry = client.patch(url, json=body, headers={"Idempotency-Key": "accept-1"})
+
+    assert first.status_code == 400
+    assert retry.status_code == 400
+    assert "Idempotent-Replayed" not in retry.headers
+    assert db_session.query(IdempotencyKey).filter(IdempotencyKey.key == "accept-1").count() == 0
+
+
+def test_keys_are_scoped_per_user(client, db_session):
+    proposer_id, recipient_id, period_id = _setup(db_session)
+
+    first = _create(client, proposer_id, recipient_id, period_id, "create-1")
+    other = _create(client, recipient_id, proposer_id, period_id, "create-1")
+
+    assert first.status_code == other.status_code == 200
+    assert "Idempotent-Replayed" not in other.headers
+    assert db_session.query(Proposal).count() == 2
+
+
+def test_retried_request_without_user_returns_stored_response(client, db_session):
+    _, recipient_id, period_id = _setup(db_session)
+    url = f"/api/periods/{period_id}/grant-weekly-credits"
+
+    first = client.post(url, json=[recipient_id], headers={"Idempotency-Key": "grant-1"})
+    retry = client.post(url, json=[recipient_id], headers={"Idempotency-Key": "grant-1"})
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    key = db_session.query(IdempotencyKey).filter(IdempotencyKey.key == "grant-1").one()
+    assert key.user_id == IdempotencyService.NO_USER
+    # A clash with a row the lookup can't find is reported, not retried forever
+    with pytest.raises(IdempotencyConflictError):
+        IdempotencyService.reserve(
+            db_session, None, "grant-1", key.fingerprint,
+            config.IDEMPOTENCY_KEY_TTL_HOURS, config.IDEMPOTENCY_LEASE_SECONDS,
+        )
+
+
+def test_abandoned_reservation_is_reclaimed_after_the_lease(client, db_session):
+    proposer_id, recipient_id, period_id = _setup(db_session)
+    # A request that reserved its key and then died before storing a response
+    db_session.add(IdempotencyKey(
+        user_id=proposer_id,
+        key="create-1",
+        fingerprint="f",
+        created_at=datetime.utcnow() - timedelta(seconds=config.IDEMPOTENCY_LEASE_SECONDS + 1),
+    ))
+    db_session.add(IdempotencyKey(user_id=proposer_id, key="create-2", fingerprint="f"))
+    db_session.commit()
+
+    reclaimed = _create(client, proposer_id, recipient_id, period_id, "create-1")
+
+    assert reclaimed.status_code == 200
+    assert db_session.query(Proposal).count() == 1
+    # Still within its lease: the request may yet finish
+    with pytest.raises(IdempotencyConflictError):
+        IdempotencyService.reserve(
+            db_session, proposer_id, "create-2", "f",
+            config.IDEMPOTENCY_KEY_TTL_HOURS, config.IDEMPOTENCY_LEASE_SECONDS,
+        )
+
+
+def test_purge_expired_keys(db_session):
+    old = datetime.utcnow() - timedelta(hours=25)
+    db_session.add_all([
+        IdempotencyKey(key="old", fingerprint="f", status_code=200, response_body="{}", created_at=old),
+        IdempotencyKey(key="new", fingerprint="f", status_code=200, response_body="{}"),
+    ])
+    db_session.commit()
+
+    assert IdempotencyService.purge_expired(db_session, ttl_hours=24) == 1
+    assert [row.key for row in db_session.query(IdempotencyKey)] == ["new"]
@@ -0,0 +1,98 @@
+import threading
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app import database, metrics
+from app.models.card import Card, CardCategory
+from app.models.period import Period, PeriodStatus, PeriodType
+from app.models.proposal import ProposalStatus
+from app.models.user import User
+from app.services.proposal_service import ProposalService
+
+
+def test_histogram_merges_thread_shards():
+    histogram = metrics.Histogram("test_seconds", "Test", ("route",), buckets=(0.1, 1.0))
+
+    histogram.observe(0.05, "/a")
+    worker = threading.Thread(target=lambda: histogram.observe(0.5, "/a"))
+    worker.start()
+    worker.join()
+    histogram.observe(5, "/a")
+
+    assert histogram.collect()[2:] == [
+        'test_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_seconds_bucket{route="/a",le="1.0"} 2',
+        'test_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_seconds_sum{route="/a"} 5.55',
+        'test_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_metrics_endpoint_reports_requests_and_pools(client, monkeypatch):
+    # The in-memory test database uses StaticPool, which has no usage counters
+    pooled = create_engine("sqlite://", poolclass=QueuePool)
+    monkeypatch.setattr(database, "engine", pooled)
+    client.get("/api/proposals", params={"user_id": 1})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/proposals",status="200"}' in body
+    assert 'db_queries_total{route="/api/proposals"}' in body
+    assert 'db_pool_checked_out{engine="primary"}' in body
+    assert 'cache_hit_ratio{cache="context"}' in body
+    pooled.dispose()
+
+
+def test_committed_votes_are_counted(client, db_session):
+    user = db_session.query(User).first()
+    card = Card(title="Card", description="d", category=CardCategory.RISAS)
+    db_session.add(card)
+    db_session.commit()
+    before = metrics.writes_total.value("vote")
+
+    response = client.post(
+        f"/api/cards/{card.id}/vote", params={"user_id": user.id}, json={"preference": "like"}
+    )
+
+    assert response.status_code == 200
+    assert metrics.writes_total.value("vote") == before + 1
+
+
+def test_bulk_proposal_updates_are_counted(db_session):
+    proposer, recipient = db_session.query(User).order_by(User.id).limit(2).all()
+    period = Period(
+        period_type=PeriodType.WEEK,
+        status=PeriodStatus.ACTIVE,
+        start_date=date.today(),
+        end_date=date.today(),
+    )
+    db_session.add(period)
+    db_session.commit()
+    proposals = [
+        ProposalService.create_proposal(
+            db=db_session,
+            period_id=period.id,
+            week_index=1,
+            proposed_by_user_id=proposer.id,
+            proposed_to_user_id=recipient.id,
+            custom_title="Reto",
+        )
+        for _ in range(3)
+    ]
+    before = metrics.writes_total.value("proposal")
+
+    # Transitions and expiry write with UPDATE statements, not the ORM
+    ProposalService.respond_to_proposal(
+        db_session, proposals[0].id, recipient.id, ProposalStatus.REJECTED
+    )
+    assert metrics.writes_total.value("proposal") == before + 1
+
+    period.status = PeriodStatus.DONE
+    db_session.commit()
+    ProposalService.expire_stale_proposals(db_session)
+    assert metrics.writes_total.value("proposal") == before + 3
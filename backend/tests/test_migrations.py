@@ -0,0 +1,15 @@
+from sqlalchemy import inspect
+
+from app.database import Base
+
+
+def test_migrated_schema_has_model_tables_and_indexes(db_session):
+    inspector = inspect(db_session.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        assert table.name in tables
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert {column.name for column in table.columns} <= columns, table.name
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        assert {index.name for index in table.indexes} <= indexes, table.name
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from app import profiling
+from app.config import config
+from app.session_tokens import ROLE_BACKOFFICE, ROLE_USER, create_session_token
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "PROFILE_SAMPLE_INTERVAL_MS", 1)
+    return tmp_path
+
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_collects_busy_thread_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy")
+    worker.start()
+    sampler = profiling.StackSampler(0.001).start()
+    time.sleep(0.05)
+    stacks = sampler.stop()
+    stop.set()
+    worker.join()
+
+    busy = [stack for stack in stacks if stack.startswith("busy;")]
+    assert busy and all("_busy_loop (" in stack for stack in busy)
+    line = profiling.to_collapsed(stacks).splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_backoffice_request_is_profiled(client, profile_dir):
+    token = create_session_token(ROLE_BACKOFFICE, username="ops")
+    headers = {"Authorization": f"Bearer {token}", "X-Profile": "1"}
+
+    response = client.get("/api/cards", headers=headers)
+
+    assert response.status_code == 200
+    filename = response.headers["x-profile-file"]
+    assert (profile_dir / filename).is_file()
+
+    listed = client.get("/api/backoffice/profiles", headers={"Authorization": f"Bearer {token}"})
+    assert listed.json() == [filename]
+    download = client.get(
+        f"/api/backoffice/profiles/{filename}", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert download.status_code == 200
+
+
+def test_profiling_requires_backoffice_token(client, profile_dir):
+    token = create_session_token(ROLE_USER, user_id=1)
+
+    response = client.get(
+        "/api/cards", params={"_profile": 1}, headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert "x-profile-file" not in response.headers
+    assert list(profile_dir.iterdir()) == []
+    assert client.get(
+        "/api/backoffice/profiles", headers={"Authorization": f"Bearer {token}"}
+    ).status_code == 403
+
+
+def test_profile_download_rejects_paths(client):
+    token = create_session_token(ROLE_BACKOFFICE, username="ops")
+    response = client.get(
+        "/api/backoffice/profiles/..%2Fsecret.collapsed",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 404
@@ -0,0 +1,177 @@
+import threading
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.database import get_db
+from app.main import app
+from app.models.credit import CreditLedger, LedgerType
+from app.models.period import Period, PeriodStatus, PeriodType
+from app.models.proposal import ProposalStatus
+from app.models.user import User
+from app.services.credit_service import CreditService
+from app.services.proposal_service import (
+    ProposalService,
+    ProposalError,
+    ProposalConflictError,
+)
+
+
+def _setup_proposal(db_session, balance: int = 10):
+    proposer = User(name="A", pin_hash="hash")
+    recipient = User(name="B", pin_hash="hash")
+    period = Period(
+        period_type=PeriodType.WEEK,
+        status=PeriodStatus.ACTIVE,
+        start_date=date.today(),
+        end_date=date.today(),
+    )
+    db_session.add_all([proposer, recipient, period])
+    db_session.commit()
+    CreditService.add_ledger_entry(
+        db=db_session,
+        user_id=proposer.id,
+        ledger_type=LedgerType.INITIAL_GRANT,
+        amount=balance,
+    )
+    proposal = ProposalService.create_proposal(
+        db=db_session,
+        period_id=period.id,
+        week_index=1,
+        proposed_by_user_id=proposer.id,
+        proposed_to_user_id=recipient.id,
+        custom_title="Reto",
+    )
+    return proposer.id, recipient.id, proposal.id
+
+
+def _ledger_count(db_session, proposal_id: int, ledger_type: LedgerType) -> int:
+    return db_session.query(CreditLedger).filter(
+        CreditLedger.proposal_id == proposal_id,
+        CreditLedger.type == ledger_type,
+    ).count()
+
+
+def _run_in_parallel(db_session, proposal_id: int, func, workers: int = 4) -> list:
+    """
+    Run func(session) on several threads at once, each with its own session
+    that read the proposal before any of them writes. Returns one outcome per
+    worker: "ok", "conflict", "rejected" or "error" (any other exception,
+    e.g. a locked database).
+    """
+    SessionFactory = sessionmaker(bind=db_session.get_bind(), autoflush=False)
+    barrier = threading.Barrier(workers, timeout=10)
+    outcomes = []
+    lock = threading.Lock()
+
+    def worker():
+        session = SessionFactory()
+        try:
+            # Kept referenced: the identity map is weak, and a dropped object
+            # would be read again (possibly already changed) by func
+            preloaded = ProposalService.get_proposal(session, proposal_id)  # noqa: F841
+            barrier.wait()
+            func(session)
+            outcome = "ok"
+        except ProposalConflictError:
+            outcome = "conflict"
+        except ProposalError:
+            outcome = "rejected"
+        except Exception:
+            outcome = "error"
+        finally:
+            session.close()
+        with lock:
+            outcomes.append(outcome)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(outcomes) == workers
+    return outcomes
+
+
+def test_stale_accept_raises_conflict(db_session):
+    proposer_id, recipient_id, proposal_id = _setup_proposal(db_session)
+
+    # A second request read the proposal before the first one committed
+    other = sessionmaker(bind=db_session.get_bind())()
+    try:
+        stale_proposal = ProposalService.get_proposal(other, proposal_id)  # noqa: F841
+        ProposalService.respond_to_proposal(
+            db_session, proposal_id, recipient_id, ProposalStatus.ACCEPTED, credit_cost=3
+        )
+        with pytest.raises(ProposalConflictError):
+            ProposalService.respond_to_proposal(
+                other, proposal_id, recipient_id, ProposalStatus.ACCEPTED, credit_cost=3
+            )
+    finally:
+        other.close()
+
+    db_session.expire_all()
+    assert _ledger_count(db_session, proposal_id, LedgerType.PROPOSAL_COST) == 1
+    assert CreditService.get_balance(db_session, proposer_id) == 7
+
+
+def test_parallel_accepts_charge_once(file_db_session):
+    proposer_id, recipient_id, proposal_id = _setup_proposal(file_db_session)
+
+    outcomes = _run_in_parallel(
+        file_db_session,
+        proposal_id,
+        lambda session: ProposalService.respond_to_proposal(
+            session, proposal_id, recipient_id, ProposalStatus.ACCEPTED, credit_cost=3
+        ),
+    )
+
+    assert outcomes.count("ok") == 1
+    assert set(outcomes) == {"ok", "conflict"}
+    file_db_session.expire_all()
+    assert _ledger_count(file_db_session, proposal_id, LedgerType.PROPOSAL_COST) == 1
+    assert CreditService.get_balance(file_db_session, proposer_id) == 7
+    assert ProposalService.get_proposal(file_db_session, proposal_id).version == 2
+
+
+def test_parallel_confirms_reward_once(file_db_session):
+    proposer_id, recipient_id, proposal_id = _setup_proposal(file_db_session)
+    ProposalService.respond_to_proposal(
+        file_db_session, proposal_id, recipient_id, ProposalStatus.ACCEPTED, credit_cost=3
+    )
+    ProposalService.mark_as_completed(file_db_session, proposal_id, recipient_id)
+
+    outcomes = _run_in_parallel(
+        file_db_session,
+        proposal_id,
+        lambda session: ProposalService.confirm_completion(session, proposal_id, proposer_id),
+    )
+
+    assert outcomes.count("ok") == 1
+    assert set(outcomes) == {"ok", "conflict"}
+    file_db_session.expire_all()
+    assert _ledger_count(file_db_session, proposal_id, LedgerType.COMPLETION_REWARD) == 1
+    assert CreditService.get_balance(file_db_session, recipient_id) == 3
+
+
+def test_lost_race_returns_409(db_session):
+    proposer_id, recipient_id, proposal_id = _setup_proposal(db_session)
+    stale = sessionmaker(bind=db_session.get_bind())()
+    stale_proposal = ProposalService.get_proposal(stale, proposal_id)  # noqa: F841
+    ProposalService.respond_to_proposal(
+        db_session, proposal_id, recipient_id, ProposalStatus.ACCEPTED, credit_cost=3
+    )
+
+    app.dependency_overrides[get_db] = lambda: stale
+    try:
+        response = TestClient(app).patch(
+            f"/api/proposals/{proposal_id}/respond?user_id={recipient_id}",
+            json={"response": "accepted", "credit_cost": 3},
+        )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        stale.close()
+
+    assert response.status_code == 409
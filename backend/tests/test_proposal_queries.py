@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import event
+
+from app.models.card import Card, CardCategory
+from app.models.period import Period, PeriodStatus, PeriodType
+from app.models.proposal import Proposal
+from app.models.user import User
+
+
+@contextmanager
+def _count_queries(*engines):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", _record)
+
+
+def _create_couple(db_session) -> tuple[User, User]:
+    proposer = User(name="A", pin_hash="hash")
+    recipient = User(name="B", pin_hash="hash")
+    db_session.add_all([proposer, recipient])
+    db_session.flush()
+    proposer.partner_id = recipient.id
+    recipient.partner_id = proposer.id
+    db_session.commit()
+    return proposer, recipient
+
+
+def _create_period(db_session) -> Period:
+    period = Period(
+        period_type=PeriodType.WEEK,
+        status=PeriodStatus.ACTIVE,
+        start_date=date.today(),
+        end_date=date.today(),
+    )
+    db_session.add(period)
+    db_session.commit()
+    return period
+
+
+def _create_proposals(
+    db_session, period_id: int, proposer_id: int, recipient_id: int, count: int
+) -> None:
+    for index in range(count):
+        card = Card(
+            title=f"Card {index}",
+            description="Sample description",
+            category=CardCategory.CALIENTES,
+        )
+        db_session.add(card)
+        db_session.flush()
+        db_session.add(
+            Proposal(
+                period_id=period_id,
+                week_index=1,
+                proposed_by_user_id=proposer_id,
+                proposed_to_user_id=recipient_id,
+                card_id=card.id,
+            )
+        )
+    db_session.commit()
+
+
+def _query_count(client, db_session, async_engine, url: str) -> int:
+    # Start from an empty identity map so every relation has to be loaded
+    db_session.expunge_all()
+    with _count_queries(db_session.get_bind(), async_engine.sync_engine) as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_user_proposals_query_count_is_constant(client, db_session, async_engine):
+    proposer, recipient = _create_couple(db_session)
+    ids = (_create_period(db_session).id, proposer.id, recipient.id)
+    url = f"/api/proposals?user_id={recipient.id}"
+
+    _create_proposals(db_session, *ids, count=2)
+    baseline = _query_count(client, db_session, async_engine, url)
+
+    _create_proposals(db_session, *ids, count=20)
+    assert _query_count(client, db_session, async_engine, url) == baseline
+    assert baseline <= 7
+
+
+def test_period_proposals_query_count_is_constant(client, db_session, async_engine):
+    proposer, recipient = _create_couple(db_session)
+    ids = (_create_period(db_session).id, proposer.id, recipient.id)
+    url = f"/api/periods/{ids[0]}/proposals"
+
+    _create_proposals(db_session, *ids, count=2)
+    baseline = _query_count(client, db_session, async_engine, url)
+
+    _create_proposals(db_session, *ids, count=20)
+    assert _query_count(client, db_session, async_engine, url) == baseline
+    assert baseline <= 8
@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, timedelta
 
 import pytest
 
@@ -113,3 +113,77 @@ def test_accept_proposal_deducts_credits(db_session):
     assert accepted.status == ProposalStatus.ACCEPTED
     assert accepted.credit_cost == 3
     assert CreditService.get_balance(db_session, proposer.id) == 2
+
+
+def _create_proposal(db_session, period, proposer, recipient, week_index=1):
+    return ProposalService.create_proposal(
+        db=db_session,
+        period_id=period.id,
+        week_index=week_index,
+        proposed_by_user_id=proposer.id,
+        proposed_to_user_id=recipient.id,
+        custom_title="Reto",
+    )
+
+
+def test_expire_stale_proposals_in_done_period_refunds_accepted(db_session):
+    proposer = _create_user(db_session, "A")
+    recipient = _create_user(db_session, "B")
+    period = _create_period(db_session)
+    CreditService.add_ledger_entry(
+        db=db_session,
+        user_id=proposer.id,
+        ledger_type=LedgerType.INITIAL_GRANT,
+        amount=5,
+    )
+
+    pending = _create_proposal(db_session, period, proposer, recipient)
+    accepted = _create_proposal(db_session, period, proposer, recipient)
+    ProposalService.respond_to_proposal(
+        db_session, accepted.id, recipient.id, ProposalStatus.ACCEPTED, credit_cost=3
+    )
+    completed = _create_proposal(db_session, period, proposer, recipient)
+    ProposalService.respond_to_proposal(
+        db_session, completed.id, recipient.id, ProposalStatus.ACCEPTED, credit_cost=1
+    )
+    ProposalService.mark_as_completed(db_session, completed.id, recipient.id)
+    assert CreditService.get_balance(db_session, proposer.id) == 1
+
+    period.status = PeriodStatus.DONE
+    db_session.commit()
+
+    report = ProposalService.expire_stale_proposals(db_session)
+
+    assert report == {"periods": 1, "expired": 2, "refunded": 1, "refunded_credits": 3}
+    db_session.expire_all()
+    assert ProposalService.get_proposal(db_session, pending.id).status == ProposalStatus.EXPIRED
+    assert ProposalService.get_proposal(db_session, accepted.id).status == ProposalStatus.EXPIRED
+    assert (
+        ProposalService.get_proposal(db_session, completed.id).status
+        == ProposalStatus.COMPLETED_PENDING_CONFIRMATION
+    )
+    assert CreditService.get_balance(db_session, proposer.id) == 4
+    entries, _ = CreditService.get_ledger(db_session, proposer.id)
+    assert [e.type for e in entries].count(LedgerType.PROPOSAL_REFUND) == 1
+
+    # Nothing left to do on a second run
+    again = ProposalService.expire_stale_proposals(db_session)
+    assert again["expired"] == 0
+
+
+def test_expire_stale_proposals_only_past_weeks_of_active_period(db_session):
+    proposer = _create_user(db_session, "A")
+    recipient = _create_user(db_session, "B")
+    period = _create_period(db_session)
+
+    past_week = _create_proposal(db_session, period, proposer, recipient, week_index=1)
+    current_week = _create_proposal(db_session, period, proposer, recipient, week_index=2)
+
+    report = ProposalService.expire_stale_proposals(
+        db_session, today=period.start_date + timedelta(days=8)
+    )
+
+    assert report["expired"] == 1
+    db_session.expire_all()
+    assert ProposalService.get_proposal(db_session, past_week.id).status == ProposalStatus.EXPIRED
+    assert ProposalService.get_proposal(db_session, current_week.id).status == ProposalStatus.PROPOSED
@@ -0,0 +1,147 @@
+import json
+from datetime import date, datetime, timedelta
+
+from app.feed_cache import feed_cache
+from app.models.card import Card, CardCategory, PreferenceType, PreferenceVote
+from app.models.period import Period, PeriodStatus, PeriodType
+from app.models.proposal import Proposal, ProposalStatus
+from app.models.user import User
+from app.query_stats import collect_queries
+from app.schemas.proposal import ProposalSuggestionsResponse
+from app.services.proposal_service import ProposalService
+from app.services import suggestion_service
+from app.services.suggestion_service import SuggestionService
+
+
+def _card(title, tags, credit_value=3):
+    return Card(
+        title=title,
+        description="d",
+        category=CardCategory.ROMANCE,
+        tags=json.dumps({"tags": tags}),
+        credit_value=credit_value,
+    )
+
+
+def _seed(db_session):
+    user, partner = db_session.query(User).order_by(User.id).all()
+    period = Period(
+        period_type=PeriodType.MONTH,
+        status=PeriodStatus.ACTIVE,
+        start_date=date.today(),
+        end_date=date.today(),
+    )
+    cards = {
+        "masaje": _card("Masaje para {{partner}}", ["relax"]),
+        "cena": _card("Cena", ["citas"]),
+        "baile": _card("Baile", ["citas"]),
+        "ya_propuesta": _card("Ya propuesta", ["relax"]),
+        "solo_mia": _card("Solo mía", ["relax"]),
+        "pasada_ok": _card("Pasada aceptada", ["relax"]),
+        "pasada_no": _card("Pasada rechazada", ["citas"]),
+    }
+    db_session.add_all([period, *cards.values()])
+    db_session.flush()
+
+    liked = datetime.utcnow() - timedelta(days=1)
+    for name in ("masaje", "cena", "baile", "ya_propuesta"):
+        for voter in (user, partner):
+            db_session.add(PreferenceVote(
+                user_id=voter.id, card_id=cards[name].id,
+                preference=PreferenceType.LIKE, updated_at=liked,
+            ))
+    db_session.add(PreferenceVote(
+        user_id=user.id, card_id=cards["solo_mia"].id, preference=PreferenceType.LIKE
+    ))
+    # Baile became mutual long ago
+    db_session.query(PreferenceVote).filter(
+        PreferenceVote.card_id == cards["baile"].id
+    ).update({"updated_at": liked - timedelta(days=60)})
+
+    # History: relax proposals get accepted, citas ones rejected
+    for name, status in (("pasada_ok", ProposalStatus.COMPLETED_CONFIRMED),
+                         ("pasada_no", ProposalStatus.REJECTED)):
+        db_session.add(Proposal(
+            period_id=period.id, proposed_by_user_id=partner.id,
+            proposed_to_user_id=user.id, card_id=cards[name].id, status=status,
+        ))
+    db_session.add(Proposal(
+        period_id=period.id, proposed_by_user_id=user.id,
+        proposed_to_user_id=partner.id, card_id=cards["ya_propuesta"].id,
+    ))
+    db_session.commit()
+    return user, partner, period, cards
+
+
+def test_suggestions_rank_mutual_likes_by_history_and_recency(client, db_session):
+    user, partner, _, _ = _seed(db_session)
+
+    response = client.get(
+        f"/api/proposals/suggestions?user_id={user.id}&partner_id={partner.id}"
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    ProposalSuggestionsResponse.model_validate(body)
+    titles = [s["card"]["title"] for s in body["suggestions"]]
+    # Already proposed and one-sided likes are left out; relax was accepted
+    # before, and the older baile like ranks below cena
+    assert titles == [f"Masaje para {partner.name}", "Cena", "Baile"]
+    scores = [s["score"] for s in body["suggestions"]]
+    assert scores == sorted(scores, reverse=True)
+    assert body["suggestions"][0]["tag_acceptance_rate"] > 0.5
+
+
+def test_candidate_cap_keeps_the_most_recent_mutual_likes(db_session, monkeypatch):
+    user, partner = db_session.query(User).order_by(User.id).all()
+    recent, older = _card("Reciente", ["relax"]), _card("Anterior", ["relax"])
+    db_session.add_all([recent, older])
+    db_session.flush()
+    now = datetime.utcnow()
+    # Recent: the partner liked it long ago, but the user just did
+    for voter, card, liked in (
+        (user, recent, now), (partner, recent, now - timedelta(days=90)),
+        (user, older, now - timedelta(days=10)), (partner, older, now - timedelta(days=10)),
+    ):
+        db_session.add(PreferenceVote(
+            user_id=voter.id, card_id=card.id, preference=PreferenceType.LIKE, updated_at=liked,
+        ))
+    db_session.commit()
+    monkeypatch.setattr(suggestion_service, "MAX_CANDIDATES", 1)
+
+    suggestions = SuggestionService.get_suggestions(db_session, user.id, partner.id)
+
+    assert [s["card"]["title"] for s in suggestions] == ["Reciente"]
+
+
+def test_suggestions_are_cached_until_a_proposal_changes(db_session):
+    user, partner, period, cards = _seed(db_session)
+    SuggestionService.get_suggestions(db_session, user.id, partner.id)
+
+    with collect_queries() as stats:
+        SuggestionService.get_suggestions(db_session, user.id, partner.id)
+    assert stats.count == 0
+
+    ProposalService.create_proposal(
+        db_session, period.id, 1, partner.id, user.id, card_id=cards["cena"].id
+    )
+
+    suggestions = SuggestionService.get_suggestions(db_session, user.id, partner.id)
+    assert "Cena" not in [s["card"]["title"] for s in suggestions]
+
+
+def test_proposal_transitions_invalidate_suggestions(db_session):
+    user, partner, _, cards = _seed(db_session)
+    proposal = db_session.query(Proposal).filter(
+        Proposal.card_id == cards["ya_propuesta"].id
+    ).one()
+    SuggestionService.get_suggestions(db_session, user.id, partner.id)
+
+    # A conditional UPDATE, not an ORM flush of the proposal
+    ProposalService.respond_to_proposal(
+        db_session, proposal.id, partner.id, ProposalStatus.REJECTED
+    )
+
+    misses = feed_cache.misses
+    SuggestionService.get_suggestions(db_session, user.id, partner.id)
+    assert feed_cache.misses == misses + 1
@@ -0,0 +1,149 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.context_cache import context_cache
+from app.models.proposal import ProposalStatus
+from app.models.user import User
+from app.services.card_service import CardService
+from app.services.credit_service import CreditService
+from app.services.period_service import PeriodService
+from app.services.proposal_service import ProposalService
+
+
+@contextmanager
+def _capture(db_session):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _plan(db_session, statement, parameters) -> list[dict]:
+    connection = db_session.connection()
+    if connection.dialect.name == "sqlite":
+        result = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    else:
+        result = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return [dict(row._mapping) for row in result]
+
+
+def _assert_uses_index(db_session, run, marker, table, index_name, sorted_by_index=False):
+    """
+    The statement containing `marker` reads `table` through an index
+    (and, with sorted_by_index, returns its ORDER BY from it, without a sort step).
+    """
+    with _capture(db_session) as statements:
+        run()
+    statement, parameters = next((s, p) for s, p in statements if marker in s)
+    plan = _plan(db_session, statement, parameters)
+
+    if db_session.get_bind().dialect.name == "sqlite":
+        details = [row["detail"] for row in plan]
+        assert any(index_name in detail for detail in details), details
+        if sorted_by_index:
+            assert not any("TEMP B-TREE" in detail for detail in details), details
+    else:
+        # MySQL may also pick the implicit foreign key index; either way no full scan
+        rows = [row for row in plan if row["table"] == table]
+        assert rows and all(row["key"] for row in rows), plan
+        assert all(row["type"] != "ALL" for row in rows), plan
+        if sorted_by_index:
+            assert not any("filesort" in (row["Extra"] or "") for row in rows), plan
+
+
+@pytest.fixture()
+def user_id(db_session):
+    return db_session.query(User).first().id
+
+
+@pytest.mark.parametrize(
+    ("as_recipient", "index_name"),
+    [
+        (True, "ix_proposals_to_user_status_created"),
+        (False, "ix_proposals_by_user_status_created"),
+    ],
+)
+def test_proposal_lists_use_user_status_index(db_session, user_id, as_recipient, index_name):
+    _assert_uses_index(
+        db_session,
+        lambda: ProposalService.get_proposals_for_user(
+            db_session, user_id, as_recipient=as_recipient, status=ProposalStatus.PROPOSED
+        ),
+        "ORDER BY proposals.created_at",
+        "proposals",
+        index_name,
+        sorted_by_index=True,
+    )
+
+
+@pytest.mark.parametrize(
+    ("as_recipient", "index_name"),
+    [
+        (True, "ix_proposals_to_user_created"),
+        (False, "ix_proposals_by_user_created"),
+    ],
+)
+def test_unfiltered_proposal_lists_use_user_created_index(
+    db_session, user_id, as_recipient, index_name
+):
+    # The default inbox / outbox: no status filter, newest first
+    _assert_uses_index(
+        db_session,
+        lambda: ProposalService.get_proposals_for_user(
+            db_session, user_id, as_recipient=as_recipient
+        ),
+        "ORDER BY proposals.created_at",
+        "proposals",
+        index_name,
+        sorted_by_index=True,
+    )
+
+
+def test_ledger_uses_user_created_index(db_session, user_id):
+    _assert_uses_index(
+        db_session,
+        lambda: CreditService.get_ledger(db_session, user_id),
+        "ORDER BY credit_ledger.created_at",
+        "credit_ledger",
+        "ix_credit_ledger_user_created",
+    )
+
+
+def test_card_listing_uses_status_enabled_index(db_session):
+    _assert_uses_index(
+        db_session,
+        lambda: CardService.get_cards(db_session),
+        "ORDER BY cards.created_at",
+        "cards",
+        "ix_cards_status_enabled_created",
+    )
+
+
+def test_card_votes_use_card_index(db_session):
+    _assert_uses_index(
+        db_session,
+        lambda: CardService.get_votes_for_card(db_session, 1),
+        "FROM preference_votes",
+        "preference_votes",
+        "ix_preference_votes_card_user",
+    )
+
+
+def test_active_period_lookup_uses_status_index(db_session):
+    context_cache.clear()
+    _assert_uses_index(
+        db_session,
+        lambda: PeriodService.get_active_period(db_session),
+        "FROM periods",
+        "periods",
+        "ix_periods_status",
+    )
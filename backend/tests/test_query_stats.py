@@ -0,0 +1,96 @@
+import json
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.models.card import Card, CardCategory, CardTranslation, PreferenceType, PreferenceVote
+from app.models.tag import Tag
+from app.models.user import User
+from app.query_stats import QueryStatsMiddleware, statement_shape
+
+
+def _seed_voted_cards(db_session, count):
+    user_a, user_b = db_session.query(User).order_by(User.id).all()
+    user_a.partner_id, user_b.partner_id = user_b.id, user_a.id
+    db_session.add_all(
+        [
+            Tag(slug="romance", name="Romance", tag_type="category"),
+            Tag(slug="suave", name="Suave", tag_type="intensity"),
+        ]
+    )
+    cards = [
+        Card(
+            title=f"Card {i}",
+            description="d",
+            category=CardCategory.ROMANCE,
+            tags=json.dumps({"tags": ["romance"], "intensity": "suave"}),
+            translations=[CardTranslation(locale="es", title=f"Carta {i}", description="d")],
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(cards)
+    db_session.flush()
+    db_session.add_all(
+        PreferenceVote(user_id=user.id, card_id=card.id, preference=PreferenceType.LIKE)
+        for card in cards
+        for user in (user_a, user_b)
+    )
+    db_session.commit()
+    return user_a.id, user_b.id
+
+
+def test_statement_shape_ignores_in_list_length():
+    assert statement_shape("SELECT 1 FROM t WHERE id IN (?, ?,\n ?)") == statement_shape(
+        "SELECT 1  FROM t WHERE id IN (?)"
+    )
+    assert statement_shape("WHERE id IN (%s, %s)") == "WHERE id IN (?)"
+
+
+def test_server_timing_reports_query_count(client):
+    response = client.get("/api/proposals", params={"user_id": 1})
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="' in response.headers["server-timing"]
+
+
+def test_repeated_statements_are_logged_as_n_plus_one(db_session, caplog):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=3)
+
+    @app.get("/loop")
+    def loop(db=Depends(lambda: db_session)):
+        for user_id in range(4):
+            db.execute(text("SELECT id FROM users WHERE id = :id"), {"id": user_id})
+        return {}
+
+    with caplog.at_level(logging.INFO, logger="app.query_stats"):
+        response = TestClient(app).get("/loop")
+
+    assert response.headers["server-timing"].endswith('desc="4 queries"')
+    (log,) = [r for r in caplog.records if r.name == "app.query_stats"]
+    record = json.loads(log.getMessage().removeprefix("sql "))
+    assert log.levelno == logging.WARNING
+    assert record["path"] == "/loop"
+    assert record["n_plus_one"][0]["count"] == 4
+
+
+@pytest.mark.parametrize(
+    ("url", "limit"),
+    [
+        ("/api/cards?user_id={a}&partner_id={b}&locale=es", 9),
+        ("/api/cards/partner-votes?user_id={a}&partner_id={b}&locale=es", 8),
+        ("/api/cards/liked/both?user1_id={a}&user2_id={b}&locale=es", 3),
+    ],
+)
+def test_card_lists_do_not_query_per_card(client, db_session, max_queries, url, limit):
+    user_a, user_b = _seed_voted_cards(db_session, 12)
+    db_session.expire_all()
+
+    with max_queries(limit):
+        response = client.get(url.format(a=user_a, b=user_b))
+
+    assert response.status_code == 200
@@ -0,0 +1,67 @@
+import pytest
+from fastapi import Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import read_routing
+from app.api.read_routing import ReadYourWritesMiddleware, get_read_db
+from app.database import ReadSession
+from app.models.tag import Tag
+
+
+@pytest.fixture()
+def replica_engine():
+    # Empty stand-in replica, so reads that reach it see no rows
+    replica = create_engine("sqlite://")
+    Tag.__table__.create(replica)
+    yield replica
+    replica.dispose()
+
+
+def test_read_session_reads_replica_and_flushes_to_primary(db_session, replica_engine):
+    db_session.add(Tag(slug="a", name="A", tag_type="category"))
+    db_session.commit()
+
+    session = ReadSession(primary=db_session.get_bind(), replica=replica_engine)
+    try:
+        assert session.query(Tag).count() == 0
+
+        session.add(Tag(slug="b", name="B", tag_type="category"))
+        session.flush()
+
+        assert session.use_primary
+        assert session.query(Tag).count() == 2
+    finally:
+        session.rollback()
+        session.close()
+
+
+def test_client_reads_stick_to_primary_after_its_write(db_session, replica_engine, monkeypatch):
+    monkeypatch.setattr(
+        read_routing,
+        "ReadSessionLocal",
+        sessionmaker(class_=ReadSession, primary=db_session.get_bind(), replica=replica_engine),
+    )
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=60)
+
+    @app.get("/read")
+    def read(db=Depends(get_read_db)):
+        return {"primary": db.use_primary}
+
+    @app.post("/write")
+    def write(ok: bool = True):
+        return {} if ok else Response(status_code=400)
+
+    client = TestClient(app)
+
+    assert client.get("/read").json() == {"primary": False}
+    assert client.post("/write", params={"ok": False}).status_code == 400
+    assert client.get("/read").json() == {"primary": False}
+
+    client.post("/write")
+    assert client.get("/read").json() == {"primary": True}
+
+    client.cookies.clear()
+    assert client.get("/read").json() == {"primary": False}
@@ -0,0 +1,107 @@
+import time
+
+from app import session_tokens
+from app.auth import hash_pin
+from app.backoffice_auth import hash_password
+from app.models.backoffice_user import BackofficeUser
+from app.models.user import User
+from app.context_cache import context_cache
+from app.session_tokens import (
+    ROLE_ADMIN,
+    ROLE_BACKOFFICE,
+    ROLE_USER,
+    create_session_token,
+    verify_session_token,
+)
+
+
+def test_token_round_trip():
+    token = create_session_token(ROLE_USER, user_id=1, partner_id=2)
+    claims = verify_session_token(token)
+
+    assert (claims.user_id, claims.partner_id, claims.role) == (1, 2, ROLE_USER)
+    assert not claims.is_admin
+
+
+def test_tampered_or_expired_token_is_rejected(monkeypatch):
+    token = create_session_token(ROLE_USER, user_id=1)
+    forged = create_session_token(ROLE_BACKOFFICE, username="x").split(".")[0]
+
+    assert verify_session_token(f"{forged}.{token.split('.')[1]}") is None
+    assert verify_session_token("not-a-token") is None
+    assert verify_session_token("ñ.ñ") is None
+
+    later = time.time() + 10**8
+    monkeypatch.setattr(session_tokens.time, "time", lambda: later)
+    assert verify_session_token(token) is None
+
+
+def test_login_issues_token_with_claims(client, db_session):
+    partner = User(name="B", pin_hash=hash_pin("1234"))
+    db_session.add(partner)
+    db_session.flush()
+    user = User(name="A", pin_hash=hash_pin("1234"), is_admin=True, partner_id=partner.id)
+    db_session.add(user)
+    db_session.commit()
+
+    response = client.post("/api/auth/login", json={"user_id": user.id, "pin": "1234"})
+
+    assert response.status_code == 200
+    claims = verify_session_token(response.json()["token"])
+    assert (claims.user_id, claims.partner_id, claims.is_admin) == (user.id, partner.id, True)
+
+
+def test_backoffice_token_grants_admin_access(client, db_session):
+    db_session.add(BackofficeUser(username="ops", password_hash=hash_password("secret")))
+    db_session.commit()
+
+    login = client.post("/api/backoffice/login", json={"username": "ops", "password": "secret"})
+    token = login.json()["token"]
+    response = client.post(
+        "/api/admin/expire-proposals",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+
+
+def test_user_token_without_admin_role_is_forbidden(client):
+    token = create_session_token(ROLE_USER, user_id=1)
+    response = client.post(
+        "/api/admin/expire-proposals",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
+
+
+def test_invalid_token_is_unauthorized(client):
+    response = client.post(
+        "/api/admin/expire-proposals",
+        headers={"Authorization": "Bearer invalid.token"},
+    )
+    assert response.status_code == 401
+
+
+def test_admin_token_stops_working_once_the_role_is_revoked(client, db_session):
+    admin = User(name="A", pin_hash="hash", is_admin=True)
+    ops = BackofficeUser(username="ops", password_hash=hash_password("secret"))
+    db_session.add_all([admin, ops])
+    db_session.commit()
+    admin_token = create_session_token(ROLE_ADMIN, user_id=admin.id)
+    backoffice_token = create_session_token(ROLE_BACKOFFICE, username="ops")
+
+    def expire(token):
+        return client.post(
+            "/api/admin/expire-proposals", headers={"Authorization": f"Bearer {token}"}
+        ).status_code
+
+    assert expire(admin_token) == 200
+    assert expire(backoffice_token) == 200
+
+    admin.is_admin = False
+    db_session.delete(ops)
+    db_session.commit()
+    context_cache.clear()
+
+    assert expire(admin_token) == 403
+    assert expire(backoffice_token) == 403
@@ -15,7 +15,7 @@ import ReactMarkdown from "react-markdown";
 import remarkGfm from "remark-gfm";
 import type { Card, Grouping, Tag } from "./types";
 
-const STORAGE_KEY = "backoffice_basic_token";
+const STORAGE_KEY = "backoffice_session_token";
 
 const API_BASE_URL = (import.meta.env.VITE_API_BASE_URL as string | undefined)?.replace(
   /\/$/,
@@ -24,11 +24,8 @@ const API_BASE_URL = (import.meta.env.VITE_API_BASE_URL as string | undefined)?.
 
 const CATEGORY_OPTIONS = ["calientes", "romance", "risas", "otras"];
 
-const buildBasicToken = (username: string, password: string) =>
-  btoa(`${username}:${password}`);
-
 const getAuthHeaders = (token: string) => ({
-  Authorization: `Basic ${token}`,
+  Authorization: `Bearer ${token}`,
 });
 
 const parseCardTags = (tagsJson: string | null) => {
@@ -257,7 +254,7 @@ export default function App() {
         throw new Error("Credenciales invalidas");
       }
 
-      const newToken = buildBasicToken(username, password);
+      const { token: newToken } = (await response.json()) as { token: string };
       localStorage.setItem(STORAGE_KEY, newToken);
       setToken(newToken);
       setUsername("");
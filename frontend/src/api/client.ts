@@ -40,6 +40,15 @@ const api = axios.create({
   },
 });
 
+// Session token from login
+api.interceptors.request.use((config) => {
+  const token = localStorage.getItem('token');
+  if (token) {
+    config.headers.Authorization = `Bearer ${token}`;
+  }
+  return config;
+});
+
 // Error handler
 api.interceptors.response.use(
   (response) => response,
@@ -23,7 +23,8 @@ export type LedgerType =
   | 'proposal_cost'
   | 'completion_reward'
   | 'admin_adjustment'
-  | 'initial_grant';
+  | 'initial_grant'
+  | 'proposal_refund';
 
 // User
 export interface User {
@@ -40,6 +41,7 @@ export interface LoginRequest {
 
 export interface LoginResponse {
   user: User;
+  token: string;
   message: string;
 }
 
@@ -96,6 +96,7 @@ export const STRINGS = {
       proposal_cost: 'Costo de propuesta',
       completion_reward: 'Recompensa por completar',
       initial_grant: `${CURRENCY} iniciales`,
+      proposal_refund: 'Reembolso de propuesta expirada',
     },
   },
 
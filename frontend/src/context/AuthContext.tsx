@@ -46,11 +46,13 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     const response = await authApi.login({ user_id: userId, pin });
     setUser(response.user);
     localStorage.setItem('user', JSON.stringify(response.user));
+    localStorage.setItem('token', response.token);
   };
 
   const logout = () => {
     setUser(null);
     localStorage.removeItem('user');
+    localStorage.removeItem('token');
   };
 
   return (
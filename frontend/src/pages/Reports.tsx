@@ -15,6 +15,7 @@ const ledgerTypeLabels: Record<LedgerType, string> = {
   completion_reward: STRINGS.reports.ledgerTypes.completion_reward,
   admin_adjustment: 'Ajuste admin',
   initial_grant: STRINGS.reports.ledgerTypes.initial_grant,
+  proposal_refund: STRINGS.reports.ledgerTypes.proposal_refund,
 };
 
 export default function Reports() {
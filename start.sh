@@ -14,6 +14,11 @@ if ! docker info > /dev/null 2>&1; then
     exit 1
 fi
 
+# Session tokens are signed with SESSION_SECRET; create one on first run
+if ! grep -qs '^SESSION_SECRET=' .env; then
+    echo "SESSION_SECRET=$(openssl rand -hex 32)" >> .env
+fi
+
 # Build and start services
 echo ""
 echo "Building and starting services..."
@@ -48,9 +53,8 @@ echo "Access the app:"
 echo "  - Local:     http://localhost:3000"
 echo "  - LAN:       http://${LOCAL_IP}:3000"
 echo ""
-echo "API Documentation:"
+echo "API Documentation (this machine only):"
 echo "  - Local:     http://localhost:8000/docs"
-echo "  - LAN:       http://${LOCAL_IP}:8000/docs"
 echo ""
 echo "Default login PIN: 1234"
 echo ""